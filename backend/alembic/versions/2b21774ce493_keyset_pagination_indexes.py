@@ -0,0 +1,32 @@
+"""keyset pagination indexes on (created_at, id)
+
+Revision ID: 2b21774ce493
+Revises: 7d26fff6cea6
+Create Date: 2026-10-17 11:03:27.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b21774ce493'
+down_revision: Union[str, None] = '7d26fff6cea6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["students", "teachers", "guardians", "users", "invoices"]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        # Fresh databases get these indexes from the models via create_all
+        if inspector.has_table(table):
+            op.create_index(f"ix_{table}_created_at_id", table, ["created_at", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_created_at_id", table_name=table, if_exists=True)
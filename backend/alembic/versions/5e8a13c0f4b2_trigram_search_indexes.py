@@ -0,0 +1,39 @@
+"""trigram search indexes
+
+Revision ID: 5e8a13c0f4b2
+Revises: 2b21774ce493
+Create Date: 2026-10-17 12:20:05.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a13c0f4b2'
+down_revision: Union[str, None] = '2b21774ce493'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, indexed expression) — expressions must match app.services.search
+INDEXES = [
+    ("ix_users_full_name_trgm", "users", "(first_name || ' ' || last_name) gin_trgm_ops"),
+    ("ix_users_email_trgm", "users", "email gin_trgm_ops"),
+    ("ix_students_admission_no_trgm", "students", "admission_no gin_trgm_ops"),
+    ("ix_teachers_employee_id_trgm", "teachers", "employee_id gin_trgm_ops"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    inspector = sa.inspect(op.get_bind())
+    for name, table, expression in INDEXES:
+        # Fresh databases get these indexes from the models via create_all
+        if inspector.has_table(table):
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expression})")
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,41 @@
+"""unique grade per assignment and student
+
+Revision ID: 7d26fff6cea6
+Revises:
+Create Date: 2026-10-17 09:12:41.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d26fff6cea6'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fresh databases get the constraint from the model via create_all
+    if not sa.inspect(op.get_bind()).has_table("grades"):
+        return
+
+    # Keep only the most recently updated grade for any duplicated (assignment, student)
+    op.execute(
+        """
+        DELETE FROM grades g
+        USING grades newer
+        WHERE g.assignment_id = newer.assignment_id
+          AND g.student_id = newer.student_id
+          AND (g.updated_at, g.id) < (newer.updated_at, newer.id)
+        """
+    )
+    op.create_unique_constraint(
+        "uq_grade_assignment_student", "grades", ["assignment_id", "student_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_grade_assignment_student", "grades", type_="unique")
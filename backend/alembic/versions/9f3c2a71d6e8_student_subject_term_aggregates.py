@@ -0,0 +1,60 @@
+"""materialized student subject term grade aggregates
+
+Revision ID: 9f3c2a71d6e8
+Revises: 5e8a13c0f4b2
+Create Date: 2026-10-17 14:02:18.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3c2a71d6e8'
+down_revision: Union[str, None] = '5e8a13c0f4b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the table from the models via create_all
+    if not inspector.has_table("grades") or inspector.has_table("student_subject_term_aggregates"):
+        return
+
+    op.create_table(
+        "student_subject_term_aggregates",
+        sa.Column("student_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("students.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("term_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("terms.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("subject_teacher_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("subject_teachers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("subject_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("total_score", sa.Numeric(12, 2), nullable=False),
+        sa.Column("total_max", sa.Numeric(12, 2), nullable=False),
+        sa.Column("grade_count", sa.Integer(), nullable=False),
+        sa.Column("last_graded_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_student_subject_term_aggregates_term_id", "student_subject_term_aggregates", ["term_id"])
+    op.create_index("ix_student_subject_term_aggregates_subject_teacher_id", "student_subject_term_aggregates", ["subject_teacher_id"])
+
+    # Backfill from existing grades (same query as app.services.grade_aggregates.rebuild_grade_aggregates)
+    op.execute(
+        """
+        INSERT INTO student_subject_term_aggregates
+            (student_id, term_id, subject_teacher_id, subject_id,
+             total_score, total_max, grade_count, last_graded_at, updated_at)
+        SELECT g.student_id, c.term_id, c.subject_teacher_id, st.subject_id,
+               sum(g.score), sum(a.max_score), count(g.id), max(g.updated_at), now() at time zone 'utc'
+        FROM grades g
+        JOIN assignments a ON g.assignment_id = a.id
+        JOIN assignment_categories c ON a.category_id = c.id
+        JOIN subject_teachers st ON c.subject_teacher_id = st.id
+        GROUP BY g.student_id, c.term_id, c.subject_teacher_id, st.subject_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("student_subject_term_aggregates", if_exists=True)
@@ -0,0 +1,34 @@
+"""attendance updated_at
+
+Revision ID: a3d9f61b7c24
+Revises: e7b5a0c3f912
+Create Date: 2026-10-17 17:02:31.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9f61b7c24'
+down_revision: Union[str, None] = 'e7b5a0c3f912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the column from the models via create_all
+    if not inspector.has_table("attendance"):
+        return
+    if "updated_at" in {column["name"] for column in inspector.get_columns("attendance")}:
+        return
+
+    op.add_column("attendance", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE attendance SET updated_at = created_at")
+    op.alter_column("attendance", "updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("attendance", "updated_at")
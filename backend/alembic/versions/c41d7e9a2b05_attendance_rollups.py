@@ -0,0 +1,67 @@
+"""attendance rollups per student-month and section-day
+
+Revision ID: c41d7e9a2b05
+Revises: 9f3c2a71d6e8
+Create Date: 2026-10-17 15:10:44.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.attendance import Attendance
+from app.services.attendance_rollups import STATUS_COLUMNS, status_counts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a2b05'
+down_revision: Union[str, None] = '9f3c2a71d6e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counts():
+    return [sa.Column(name, sa.Integer(), nullable=False) for name in STATUS_COLUMNS]
+
+
+def _backfill(table: str, key_columns: list[str], *keys) -> None:
+    # Same FILTER aggregates as the service, so the enum comparisons are bound the same way
+    op.execute(
+        sa.insert(sa.table(table, *[sa.column(c) for c in key_columns + STATUS_COLUMNS]))
+        .from_select(
+            key_columns + STATUS_COLUMNS,
+            sa.select(*keys, *status_counts()).group_by(*keys),
+        )
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the tables from the models via create_all
+    if not inspector.has_table("attendance") or inspector.has_table("attendance_student_monthly"):
+        return
+
+    op.create_table(
+        "attendance_student_monthly",
+        sa.Column("student_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("students.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        *_counts(),
+    )
+    op.create_table(
+        "attendance_section_daily",
+        sa.Column("section_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("sections.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("date", sa.Date(), primary_key=True),
+        *_counts(),
+    )
+    op.create_index("ix_attendance_section_daily_date", "attendance_section_daily", ["date"])
+
+    # Backfill (same aggregates as app.services.attendance_rollups.rebuild_attendance_rollups)
+    month = sa.cast(sa.func.date_trunc(sa.literal_column("'month'"), Attendance.date), sa.Date)
+    _backfill("attendance_student_monthly", ["student_id", "month"], Attendance.student_id, month)
+    _backfill("attendance_section_daily", ["section_id", "date"], Attendance.section_id, Attendance.date)
+
+
+def downgrade() -> None:
+    op.drop_table("attendance_section_daily", if_exists=True)
+    op.drop_table("attendance_student_monthly", if_exists=True)
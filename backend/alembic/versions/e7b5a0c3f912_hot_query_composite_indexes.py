@@ -0,0 +1,62 @@
+"""composite indexes for hot query shapes
+
+Revision ID: e7b5a0c3f912
+Revises: c41d7e9a2b05
+Create Date: 2026-10-17 15:48:09.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b5a0c3f912'
+down_revision: Union[str, None] = 'c41d7e9a2b05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, INCLUDE columns)
+INDEXES = [
+    ("ix_attendance_section_id_date", "attendance", ["section_id", "date"], ["status"]),
+    ("ix_attendance_student_id_date_status", "attendance", ["student_id", "date", "status"], None),
+    ("ix_grades_student_id_assignment_id", "grades", ["student_id", "assignment_id"], None),
+    ("ix_messages_receiver_id_created_at", "messages", ["receiver_id", "created_at"], None),
+    ("ix_invoices_status_created_at", "invoices", ["status", "created_at", "id"], ["amount"]),
+    ("ix_students_current_section_id_status", "students", ["current_section_id", "status"], None),
+]
+
+# Single-column indexes that are now leading prefixes of the composites above
+REDUNDANT = [
+    ("ix_attendance_section_id", "attendance", ["section_id"]),
+    ("ix_attendance_student_id", "attendance", ["student_id"]),
+    ("ix_grades_student_id", "grades", ["student_id"]),
+    ("ix_messages_receiver_id", "messages", ["receiver_id"]),
+    ("ix_invoices_status", "invoices", ["status"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Built CONCURRENTLY so marking attendance / entering grades isn't blocked on large tables
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            # Fresh databases get these indexes from the models via create_all
+            if inspector.has_table(table):
+                op.create_index(
+                    name, table, columns,
+                    postgresql_include=include or [],
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        for name, table, _ in REDUNDANT:
+            if inspector.has_table(table):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
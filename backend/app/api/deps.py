@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.database import get_db
 from app.models.user import User, UserRole
+from app.utils.auth_cache import cache_principal, get_cached_principal, principal_generation
 from app.utils.security import decode_token
 
 settings = get_settings()
@@ -26,7 +27,8 @@ async def get_current_user(
 ) -> User:
     """
     Extract and validate JWT from Authorization header.
-    Returns the current authenticated User ORM object.
+    Returns the current authenticated User ORM object, served from the
+    principal cache when the token has been seen recently.
     """
     token = credentials.credentials
     try:
@@ -56,8 +58,15 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    jti = payload.get("jti")
+    user = await get_cached_principal(db, jti) if jti else None
+    if user is None:
+        # Read before the row, so an invalidation racing the load can't be cached past
+        generation = await principal_generation(user_id) if jti else None
+        result = await db.execute(select(User).where(User.id == UUID(user_id)))
+        user = result.scalar_one_or_none()
+        if user and jti:
+            await cache_principal(jti, user, payload["exp"], generation)
 
     if not user:
         raise HTTPException(
@@ -2,15 +2,16 @@
 EduNexus School — Attendance API Routes
 """
 
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select, and_
+from sqlalchemy import select, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.models.student import Student
 from app.models.attendance import Attendance, AttendanceStatus
@@ -18,6 +19,10 @@ from app.schemas.attendance import (
     AttendanceResponse, BulkAttendanceRequest, AttendanceSummary,
 )
 from app.api.deps import get_current_user, require_role
+from app.services.analytics import invalidate_dashboard_analytics
+from app.services.attendance import attendance_percentage, count_attendance_by_student
+from app.services.attendance_rollups import refresh_attendance_rollups
+from app.services.document_cache import invalidate_documents, section_scope
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
@@ -28,36 +33,49 @@ async def mark_bulk_attendance(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
 ):
-    """Mark attendance for an entire section on a given date."""
-    results = []
-    for entry in body.entries:
-        # Upsert: check if record exists
-        existing = await db.execute(
-            select(Attendance).where(
-                and_(Attendance.student_id == entry.student_id, Attendance.date == body.date)
-            )
-        )
-        record = existing.scalar_one_or_none()
-
-        if record:
-            record.status = entry.status
-            record.remarks = entry.remarks
-            record.marked_by = current_user.id
-        else:
-            record = Attendance(
-                student_id=entry.student_id,
-                section_id=body.section_id,
-                date=body.date,
-                status=entry.status,
-                remarks=entry.remarks,
-                marked_by=current_user.id,
-            )
-            db.add(record)
-
-        await db.flush()
-        await db.refresh(record)
-        results.append(AttendanceResponse.model_validate(record))
-
+    """
+    Mark attendance for an entire section on a given date.
+    Upserts every entry in one INSERT ... ON CONFLICT (student_id, date) DO UPDATE ... RETURNING.
+    """
+    if not body.entries:
+        return []
+
+    # ON CONFLICT cannot touch the same row twice in one statement; last entry wins
+    entries = {entry.student_id: entry for entry in body.entries}
+    stmt = pg_insert(Attendance).values([
+        {
+            "student_id": entry.student_id,
+            "section_id": body.section_id,
+            "date": body.date,
+            "status": entry.status,
+            "remarks": entry.remarks,
+            "marked_by": current_user.id,
+        }
+        for entry in entries.values()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_attendance_student_date",
+        set_={
+            "status": stmt.excluded.status,
+            "remarks": stmt.excluded.remarks,
+            "marked_by": stmt.excluded.marked_by,
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(Attendance)
+
+    result = await db.scalars(stmt, execution_options={"populate_existing": True})
+    records = result.all()
+    results = [AttendanceResponse.model_validate(record) for record in records]
+
+    # A conflicting row keeps its own section_id, so a student already marked
+    # elsewhere that day updates that section's counts, not this one's
+    section_ids = {record.section_id for record in records}
+    await refresh_attendance_rollups(db, section_ids, body.date, entries)
+    # Invalidate only once the rows are committed, so no concurrent read can
+    # re-cache the old numbers or pair a new document generation with old rows
+    await db.commit()
+    await invalidate_dashboard_analytics()
+    await invalidate_documents([section_scope(section_id) for section_id in section_ids])
     return results
 
 
@@ -65,7 +83,7 @@ async def mark_bulk_attendance(
 async def get_section_attendance(
     section_id: UUID,
     attendance_date: date = Query(..., alias="date"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
 ):
     """Get attendance records for a section on a specific date."""
@@ -90,33 +108,18 @@ async def get_student_attendance_summary(
     student_id: UUID,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get attendance summary for a specific student."""
-    query = select(Attendance.status, func.count()).where(
-        Attendance.student_id == student_id
-    ).group_by(Attendance.status)
-
-    if start_date:
-        query = query.where(Attendance.date >= start_date)
-    if end_date:
-        query = query.where(Attendance.date <= end_date)
-
-    result = await db.execute(query)
-    counts = {row[0]: row[1] for row in result.all()}
-
-    present = counts.get(AttendanceStatus.PRESENT, 0)
-    absent = counts.get(AttendanceStatus.ABSENT, 0)
-    late = counts.get(AttendanceStatus.LATE, 0)
-    excused = counts.get(AttendanceStatus.EXCUSED, 0)
-    total = present + absent + late + excused
+    counts = (await count_attendance_by_student(db, [student_id], start_date, end_date))[student_id]
+    total = sum(counts.values())
 
     return AttendanceSummary(
         total_days=total,
-        present=present,
-        absent=absent,
-        late=late,
-        excused=excused,
-        attendance_percentage=round((present + late) / total * 100, 2) if total > 0 else 0,
+        present=counts[AttendanceStatus.PRESENT.value],
+        absent=counts[AttendanceStatus.ABSENT.value],
+        late=counts[AttendanceStatus.LATE.value],
+        excused=counts[AttendanceStatus.EXCUSED.value],
+        attendance_percentage=round(attendance_percentage(counts), 2),
     )
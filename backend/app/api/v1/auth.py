@@ -25,9 +25,10 @@ from app.utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
+from app.utils.auth_cache import invalidate_user_principals
 from app.utils.firebase import verify_firebase_token
 from app.config import get_settings
 from app.models.user import UserRole
@@ -46,7 +47,7 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == body.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(body.password, user.password_hash):
+    if not user or not await verify_password_async(body.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -101,7 +102,7 @@ async def register(body: RegisterRequest, db: AsyncSession = Depends(get_db)):
         
     user = User(
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
         role=body.role,
         first_name=body.first_name,
         last_name=body.last_name,
@@ -143,7 +144,7 @@ async def login_firebase(body: FirebaseLoginRequest, db: AsyncSession = Depends(
     If the user does not exist, they are automatically registered.
     """
     try:
-        decoded = verify_firebase_token(body.id_token)
+        decoded = await verify_firebase_token(body.id_token)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -165,7 +166,7 @@ async def login_firebase(body: FirebaseLoginRequest, db: AsyncSession = Depends(
         
         user = User(
             email=email,
-            password_hash=hash_password("oauth_placeholder"),
+            password_hash=await hash_password_async("oauth_placeholder"),
             role=body.role_preference or UserRole.STUDENT,
             first_name=first_name,
             last_name=last_name,
@@ -292,11 +293,14 @@ async def change_password(
     current_user: User = Depends(get_current_user),
 ):
     """Change own password."""
-    if not verify_password(body.current_password, current_user.password_hash):
+    # Cached principals don't carry the hash
+    password_hash = await db.scalar(select(User.password_hash).where(User.id == current_user.id))
+    if not await verify_password_async(body.current_password, password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
-    current_user.password_hash = hash_password(body.new_password)
-    await db.flush()
+    current_user.password_hash = await hash_password_async(body.new_password)
+    await db.commit()
+    await invalidate_user_principals(current_user.id)
     return {"message": "Password changed successfully"}
@@ -4,19 +4,22 @@ EduNexus School — Finance API Routes (Fee Structures, Invoices, Payments)
 
 import uuid as uuid_lib
 from datetime import datetime
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.models.finance import FeeStructure, Invoice, InvoiceStatus, Payment
 from app.models.student import Student
 from app.schemas.finance import *
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
 from app.api.deps import get_current_user, require_role
+from app.services.analytics import invalidate_dashboard_analytics
+from app.utils.pagination import apply_keyset, count_total, split_page
 
 router = APIRouter(prefix="/finance", tags=["Finance"])
 
@@ -67,13 +70,17 @@ async def update_fee_structure(
 
 
 # ──────────────── Invoices ────────────────
-@router.get("/invoices", response_model=PaginatedResponse[InvoiceResponse])
+@router.get("/invoices", response_model=Union[PaginatedResponse[InvoiceResponse], CursorPaginatedResponse[InvoiceResponse]])
 async def list_invoices(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    pagination: str = Query("offset", regex="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    approximate_total: bool = False,
     student_id: UUID = None,
     invoice_status: InvoiceStatus = Query(None, alias="status"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     query = select(Invoice, User.first_name, User.last_name).join(
@@ -89,12 +96,14 @@ async def list_invoices(
         query = query.where(Invoice.status == invoice_status)
         count_query = count_query.where(Invoice.status == invoice_status)
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
-    query = query.order_by(Invoice.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    rows = result.all()
+    if pagination == "cursor":
+        result = await db.execute(apply_keyset(query, Invoice.created_at, Invoice.id, cursor, per_page))
+        rows, next_cursor = split_page(result.all(), per_page, lambda r: (r[0].created_at, r[0].id))
+    else:
+        total = await count_total(db, count_query, approximate_total)
+        query = query.order_by(Invoice.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
+        result = await db.execute(query)
+        rows = result.all()
 
     items = []
     for inv, fn, ln in rows:
@@ -102,6 +111,11 @@ async def list_invoices(
         resp.student_name = f"{fn} {ln}"
         items.append(resp)
 
+    if pagination == "cursor":
+        return CursorPaginatedResponse(
+            items=items, next_cursor=next_cursor, per_page=per_page,
+            total=await count_total(db, count_query, approximate_total) if include_total else None,
+        )
     return PaginatedResponse(
         items=items, total=total, page=page, per_page=per_page,
         pages=(total + per_page - 1) // per_page,
@@ -125,6 +139,8 @@ async def create_invoice(
     db.add(invoice)
     await db.flush()
     await db.refresh(invoice)
+    await db.commit()
+    await invalidate_dashboard_analytics()
     return InvoiceResponse.model_validate(invoice)
 
 
@@ -161,13 +177,15 @@ async def record_payment(
 
     await db.flush()
     await db.refresh(payment)
+    await db.commit()
+    await invalidate_dashboard_analytics()
     return PaymentResponse.model_validate(payment)
 
 
 @router.get("/report")
 async def finance_report(
     year_id: UUID = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_role([UserRole.ADMIN])),
 ):
     """Quick finance summary."""
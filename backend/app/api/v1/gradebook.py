@@ -2,19 +2,21 @@
 EduNexus School — Gradebook API Routes
 """
 
+from datetime import datetime
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
-from app.models.student import Student
 from app.models.gradebook import GradingScale, AssignmentCategory, Assignment, Grade
-from app.models.classroom import SubjectTeacher
-from app.models.academic import Subject, Term
 from app.schemas.gradebook import *
 from app.api.deps import get_current_user, require_role
+from app.services.document_cache import invalidate_documents, student_scope
+from app.services.grade_aggregates import refresh_assignment_aggregates
+from app.services.report_card import build_report_card
 
 router = APIRouter(prefix="/gradebook", tags=["Gradebook"])
 
@@ -85,9 +87,13 @@ async def update_assignment(assignment_id: UUID, body: AssignmentUpdate, db: Asy
     assignment = result.scalar_one_or_none()
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
-    for k, v in body.model_dump(exclude_unset=True).items():
+    updates = body.model_dump(exclude_unset=True)
+    max_score_changed = "max_score" in updates and updates["max_score"] != float(assignment.max_score)
+    for k, v in updates.items():
         setattr(assignment, k, v)
     await db.flush()
+    if max_score_changed:
+        await refresh_assignment_aggregates(db, assignment.id)
     await db.refresh(assignment)
     return AssignmentResponse.model_validate(assignment)
 
@@ -99,40 +105,49 @@ async def bulk_grade_entry(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
 ):
-    """Enter grades for multiple students on an assignment."""
-    results = []
-    for entry in body.entries:
-        # Check existing grade
-        existing = await db.execute(
-            select(Grade).where(Grade.assignment_id == body.assignment_id, Grade.student_id == entry.student_id)
-        )
-        grade = existing.scalar_one_or_none()
-
-        if grade:
-            grade.score = entry.score
-            grade.remarks = entry.remarks
-            grade.graded_by = current_user.id
-        else:
-            grade = Grade(
-                assignment_id=body.assignment_id,
-                student_id=entry.student_id,
-                score=entry.score,
-                remarks=entry.remarks,
-                graded_by=current_user.id,
-            )
-            db.add(grade)
-
-        await db.flush()
-        await db.refresh(grade)
-        results.append(GradeResponse.model_validate(grade))
-
-    return results
+    """
+    Enter grades for multiple students on an assignment.
+    Upserts every entry in one INSERT ... ON CONFLICT (assignment_id, student_id) DO UPDATE ... RETURNING.
+    """
+    if not body.entries:
+        return []
+
+    # ON CONFLICT cannot touch the same row twice in one statement; last entry wins
+    entries = {entry.student_id: entry for entry in body.entries}
+    stmt = pg_insert(Grade).values([
+        {
+            "assignment_id": body.assignment_id,
+            "student_id": entry.student_id,
+            "score": entry.score,
+            "remarks": entry.remarks,
+            "graded_by": current_user.id,
+        }
+        for entry in entries.values()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_grade_assignment_student",
+        set_={
+            "score": stmt.excluded.score,
+            "remarks": stmt.excluded.remarks,
+            "graded_by": stmt.excluded.graded_by,
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(Grade)
+
+    result = await db.scalars(stmt, execution_options={"populate_existing": True})
+    grades = [GradeResponse.model_validate(grade) for grade in result.all()]
+
+    await refresh_assignment_aggregates(db, body.assignment_id, entries)
+    # Bump only once the grades are committed, so no render can pair the new generation with old rows
+    await db.commit()
+    await invalidate_documents(student_scope(student_id) for student_id in entries)
+    return grades
 
 
 @router.get("/grades/student/{student_id}", response_model=list[GradeResponse])
 async def get_student_grades(
     student_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_user),
 ):
     """Get all grades for a student."""
@@ -146,83 +161,22 @@ async def get_student_grades(
 async def get_report_card(
     student_id: UUID,
     term_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_user),
 ):
     """Generate a report card summary for a student in a term."""
-    # Get student info
-    student_result = await db.execute(
-        select(Student, User.first_name, User.last_name)
-        .join(User, Student.user_id == User.id)
-        .where(Student.id == student_id)
-    )
-    student_row = student_result.one_or_none()
-    if not student_row:
-        raise HTTPException(status_code=404, detail="Student not found")
-
-    student, fn, ln = student_row
-
-    # Get term info
-    term_result = await db.execute(select(Term).where(Term.id == term_id))
-    term = term_result.scalar_one_or_none()
-    if not term:
-        raise HTTPException(status_code=404, detail="Term not found")
-
-    from app.models.academic import AcademicYear
-    year_result = await db.execute(select(AcademicYear).where(AcademicYear.id == term.academic_year_id))
-    year = year_result.scalar_one()
-
-    # Get categories for this term in student's section
-    categories_result = await db.execute(
-        select(AssignmentCategory).where(AssignmentCategory.term_id == term_id)
-    )
-    categories = categories_result.scalars().all()
-
-    subjects_data = {}
-    for cat in categories:
-        # Get subject info
-        st_result = await db.execute(select(SubjectTeacher).where(SubjectTeacher.id == cat.subject_teacher_id))
-        st = st_result.scalar_one_or_none()
-        if not st:
-            continue
-
-        subj_result = await db.execute(select(Subject).where(Subject.id == st.subject_id))
-        subj = subj_result.scalar_one()
-
-        if subj.id not in subjects_data:
-            subjects_data[subj.id] = {"name": subj.name, "code": subj.code, "scores": [], "max_scores": []}
-
-        # Get assignments and grades for this category
-        assignments_result = await db.execute(select(Assignment).where(Assignment.category_id == cat.id))
-        for assignment in assignments_result.scalars().all():
-            grade_result = await db.execute(
-                select(Grade).where(Grade.assignment_id == assignment.id, Grade.student_id == student_id)
-            )
-            grade = grade_result.scalar_one_or_none()
-            if grade:
-                subjects_data[subj.id]["scores"].append(float(grade.score))
-                subjects_data[subj.id]["max_scores"].append(float(assignment.max_score))
-
-    subject_summaries = []
-    for subj_id, data in subjects_data.items():
-        if data["max_scores"]:
-            avg = sum(data["scores"]) / sum(data["max_scores"]) * 100
-        else:
-            avg = 0
-        subject_summaries.append(SubjectGradeSummary(
-            subject_name=data["name"],
-            subject_code=data["code"],
-            average_score=round(avg, 2),
-        ))
-
-    overall = sum(s.average_score for s in subject_summaries) / len(subject_summaries) if subject_summaries else 0
+    card = await build_report_card(db, student_id, term_id)
 
     return ReportCardResponse(
-        student_id=student_id,
-        student_name=f"{fn} {ln}",
-        admission_no=student.admission_no,
-        term_name=term.name,
-        academic_year=year.name,
-        subjects=subject_summaries,
-        overall_average=round(overall, 2),
+        student_id=card["student_id"],
+        student_name=card["student_name"],
+        admission_no=card["admission_no"],
+        term_name=card["term_name"],
+        academic_year=card["academic_year"],
+        subjects=[
+            SubjectGradeSummary(**{**s, "average_score": round(s["average_score"], 2)})
+            for s in card["subjects"]
+        ],
+        overall_average=round(card["overall_average"], 2),
+        overall_gpa=card["overall_gpa"],
     )
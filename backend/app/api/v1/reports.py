@@ -2,34 +2,55 @@
 EduNexus School — Reports API Routes (Analytics + PDF/Excel exports)
 """
 
+import io
+import zipfile
 from datetime import date
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
-from sqlalchemy import func, select, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
-from app.models.student import Student, StudentStatus
-from app.models.teacher import Teacher
-from app.models.attendance import Attendance, AttendanceStatus
-from app.models.finance import Invoice, InvoiceStatus, Payment
-from app.models.academic import AcademicYear, Term, Subject
-from app.models.classroom import Section, SubjectTeacher, Class
-from app.models.gradebook import AssignmentCategory, Assignment, Grade
+from app.models.student import StudentStatus
+from app.schemas.report import ReportJobCreate, ReportJobResponse
 from app.api.deps import get_current_user, require_role
+from app.services.analytics import get_dashboard_analytics
+from app.services.attendance import build_attendance_report
+from app.services.document_cache import (
+    attendance_report_key,
+    cached_document_response,
+    report_card_key,
+    store_document_response,
+)
+from app.services.report_jobs import get_report_job, result_path, submit_report_job
+from app.services.student_export import (
+    directory_row,
+    stream_directory_csv,
+    stream_directory_ndjson,
+    student_directory_query,
+)
+from app.services.report_card import (
+    build_report_card,
+    build_section_grades_matrix,
+    build_section_report_cards,
+    render_in_pool,
+    render_report_card_pdfs,
+    report_card_pdf_context,
+)
 from app.utils.pdf_generator import (
     generate_report_card_pdf,
     generate_attendance_report_pdf,
     generate_student_list_pdf,
 )
+from app.utils.metrics import RENDER_DURATION
 from app.utils.excel_generator import (
     generate_attendance_excel,
     generate_student_list_excel,
     generate_grades_excel,
+    iter_spooled_file,
 )
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
@@ -46,74 +67,10 @@ async def dashboard_analytics(
 ):
     """
     Returns comprehensive analytics data for the admin dashboard.
+    Served from Redis for a short TTL; writes that change these numbers invalidate it.
+    Misses are computed on the primary, so a lagging replica can't re-cache old numbers.
     """
-    # Student counts
-    total_students = (await db.execute(select(func.count(Student.id)))).scalar() or 0
-    active_students = (await db.execute(
-        select(func.count(Student.id)).where(Student.status == StudentStatus.ACTIVE)
-    )).scalar() or 0
-
-    # Teacher count
-    total_teachers = (await db.execute(select(func.count(Teacher.id)))).scalar() or 0
-
-    # Attendance today
-    today = date.today()
-    today_present = (await db.execute(
-        select(func.count(Attendance.id)).where(
-            and_(Attendance.date == today, Attendance.status == AttendanceStatus.PRESENT)
-        )
-    )).scalar() or 0
-    today_absent = (await db.execute(
-        select(func.count(Attendance.id)).where(
-            and_(Attendance.date == today, Attendance.status == AttendanceStatus.ABSENT)
-        )
-    )).scalar() or 0
-    today_late = (await db.execute(
-        select(func.count(Attendance.id)).where(
-            and_(Attendance.date == today, Attendance.status == AttendanceStatus.LATE)
-        )
-    )).scalar() or 0
-
-    # Finance
-    total_revenue = float((await db.execute(select(func.sum(Payment.amount)))).scalar() or 0)
-    pending_fees = float((await db.execute(
-        select(func.sum(Invoice.amount)).where(Invoice.status == InvoiceStatus.PENDING)
-    )).scalar() or 0)
-    overdue_count = (await db.execute(
-        select(func.count(Invoice.id)).where(Invoice.status == InvoiceStatus.OVERDUE)
-    )).scalar() or 0
-
-    # Class & section counts
-    total_classes = (await db.execute(select(func.count(Class.id)))).scalar() or 0
-    total_sections = (await db.execute(select(func.count(Section.id)))).scalar() or 0
-
-    # Student status breakdown
-    status_counts = {}
-    for status in StudentStatus:
-        count = (await db.execute(
-            select(func.count(Student.id)).where(Student.status == status)
-        )).scalar() or 0
-        status_counts[status.value] = count
-
-    return {
-        "students": {
-            "total": total_students,
-            "active": active_students,
-            "by_status": status_counts,
-        },
-        "teachers": {"total": total_teachers},
-        "classes": {"total": total_classes, "sections": total_sections},
-        "attendance_today": {
-            "present": today_present,
-            "absent": today_absent,
-            "late": today_late,
-        },
-        "finance": {
-            "total_revenue": total_revenue,
-            "pending_fees": pending_fees,
-            "overdue_invoices": overdue_count,
-        },
-    }
+    return await get_dashboard_analytics(db)
 
 
 # ══════════════════════════════════════════
@@ -123,81 +80,53 @@ async def dashboard_analytics(
 @router.get("/report-card/{student_id}/pdf")
 async def download_report_card_pdf(
     student_id: UUID,
+    request: Request,
     term_id: UUID = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Download a student's report card as PDF."""
-    # Get student
-    result = await db.execute(
-        select(Student, User.first_name, User.last_name)
-        .join(User, Student.user_id == User.id)
-        .where(Student.id == student_id)
+    """Download a student's report card as PDF (cached; supports If-None-Match)."""
+    cache_key = await report_card_key(db, student_id, term_id)
+    cached = await cached_document_response(request, cache_key)
+    if cached is not None:
+        return cached
+
+    card = await build_report_card(db, student_id, term_id)
+    pdf_bytes = await render_in_pool(generate_report_card_pdf, report_card_pdf_context(card))
+
+    return await store_document_response(
+        cache_key, pdf_bytes, "application/pdf",
+        f'report_card_{card["admission_no"]}_{card["term_name"]}.pdf',
     )
-    row = result.one_or_none()
-    if not row:
-        raise HTTPException(status_code=404, detail="Student not found")
-    student, fn, ln = row
-
-    # Get term + year
-    term = (await db.execute(select(Term).where(Term.id == term_id))).scalar_one_or_none()
-    if not term:
-        raise HTTPException(status_code=404, detail="Term not found")
-    year = (await db.execute(select(AcademicYear).where(AcademicYear.id == term.academic_year_id))).scalar_one()
-
-    # Build subject grades
-    categories = (await db.execute(
-        select(AssignmentCategory).where(AssignmentCategory.term_id == term_id)
-    )).scalars().all()
-
-    subjects_data = {}
-    for cat in categories:
-        st = (await db.execute(select(SubjectTeacher).where(SubjectTeacher.id == cat.subject_teacher_id))).scalar_one_or_none()
-        if not st:
-            continue
-        subj = (await db.execute(select(Subject).where(Subject.id == st.subject_id))).scalar_one()
-        if subj.id not in subjects_data:
-            subjects_data[subj.id] = {"subject_name": subj.name, "subject_code": subj.code, "scores": [], "max_scores": []}
-
-        assignments = (await db.execute(select(Assignment).where(Assignment.category_id == cat.id))).scalars().all()
-        for assignment in assignments:
-            grade = (await db.execute(
-                select(Grade).where(and_(Grade.assignment_id == assignment.id, Grade.student_id == student_id))
-            )).scalar_one_or_none()
-            if grade:
-                subjects_data[subj.id]["scores"].append(float(grade.score))
-                subjects_data[subj.id]["max_scores"].append(float(assignment.max_score))
-
-    subjects = []
-    for data in subjects_data.values():
-        avg = (sum(data["scores"]) / sum(data["max_scores"]) * 100) if data["max_scores"] else 0
-        letter = _score_to_letter(avg)
-        gpa = _score_to_gpa(avg)
-        subjects.append({
-            "subject_name": data["subject_name"],
-            "subject_code": data["subject_code"],
-            "average_score": round(avg, 1),
-            "letter_grade": letter,
-            "gpa": gpa,
-        })
 
-    overall = sum(s["average_score"] for s in subjects) / len(subjects) if subjects else 0
-    overall_gpa = round(sum(s["gpa"] for s in subjects if s["gpa"]) / len(subjects), 2) if subjects else None
 
-    pdf_bytes = generate_report_card_pdf({
-        "student_name": f"{fn} {ln}",
-        "admission_no": student.admission_no,
-        "academic_year": year.name,
-        "term_name": term.name,
-        "subjects": subjects,
-        "overall_average": round(overall, 1),
-        "overall_gpa": overall_gpa,
-    })
+@router.get("/report-cards/batch")
+async def download_batch_report_cards(
+    term_id: UUID = Query(...),
+    section_id: Optional[UUID] = None,
+    class_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
+):
+    """Download report cards for every student in a section or class as a ZIP of PDFs."""
+    if not section_id and not class_id:
+        raise HTTPException(status_code=400, detail="Either section_id or class_id is required")
+
+    cards = await build_section_report_cards(db, term_id, section_id=section_id, class_id=class_id)
+    if not cards:
+        raise HTTPException(status_code=404, detail="No students found")
+
+    pdfs = await render_report_card_pdfs(cards)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for card, pdf_bytes in zip(cards, pdfs):
+            archive.writestr(f"report_card_{card['admission_no']}_{card['term_name']}.pdf", pdf_bytes)
 
     return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="report_card_{student.admission_no}_{term.name}.pdf"'},
+        content=buffer.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="report_cards_{cards[0]["term_name"]}.zip"'},
     )
 
 
@@ -207,122 +136,69 @@ async def download_report_card_pdf(
 
 @router.get("/attendance")
 async def download_attendance_report(
+    request: Request,
     section_id: UUID = Query(...),
     start_date: date = Query(...),
     end_date: date = Query(...),
     format: str = Query("pdf", regex="^(pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
 ):
-    """Download attendance report for a section (PDF or Excel)."""
-    # Get section info
-    section = (await db.execute(select(Section).where(Section.id == section_id))).scalar_one_or_none()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-
-    parent_class = (await db.execute(select(Class).where(Class.id == section.class_id))).scalar_one()
-    section_name = f"{parent_class.name} - Section {section.name}"
-
-    # Get students in section
-    students_result = await db.execute(
-        select(Student, User.first_name, User.last_name)
-        .join(User, Student.user_id == User.id)
-        .where(Student.current_section_id == section_id)
-        .order_by(User.last_name)
-    )
-    students = students_result.all()
-
-    rows = []
-    for student, fn, ln in students:
-        # Count attendance statuses
-        counts = {}
-        for status in AttendanceStatus:
-            count = (await db.execute(
-                select(func.count(Attendance.id)).where(
-                    and_(
-                        Attendance.student_id == student.id,
-                        Attendance.date >= start_date,
-                        Attendance.date <= end_date,
-                        Attendance.status == status,
-                    )
-                )
-            )).scalar() or 0
-            counts[status.value] = count
-
-        total = sum(counts.values())
-        pct = ((counts["present"] + counts["late"]) / total * 100) if total > 0 else 0
-
-        rows.append({
-            "student_name": f"{fn} {ln}",
-            "admission_no": student.admission_no,
-            "present": counts["present"],
-            "absent": counts["absent"],
-            "late": counts["late"],
-            "excused": counts["excused"],
-            "total": total,
-            "percentage": round(pct, 1),
-        })
+    """Download attendance report for a section (PDF or Excel; cached, supports If-None-Match)."""
+    cache_key = await attendance_report_key(db, section_id, start_date, end_date, format)
+    cached = await cached_document_response(request, cache_key)
+    if cached is not None:
+        return cached
 
-    report_data = {
-        "title": f"Attendance Report — {section_name}",
-        "section_name": section_name,
-        "start_date": start_date.strftime("%B %d, %Y"),
-        "end_date": end_date.strftime("%B %d, %Y"),
-        "rows": rows,
-    }
+    report_data = await build_attendance_report(db, section_id, start_date, end_date)
+    section_name = report_data["section_name"]
 
     if format == "excel":
-        content = generate_attendance_excel(report_data)
-        return Response(
-            content=content,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f'attachment; filename="attendance_report_{section_name}.xlsx"'},
+        with RENDER_DURATION.time("attendance_excel"):
+            output = generate_attendance_excel(report_data)
+        return await store_document_response(
+            cache_key, output,
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            f"attendance_report_{section_name}.xlsx",
         )
     else:
-        content = generate_attendance_report_pdf(report_data)
-        return Response(
-            content=content,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="attendance_report_{section_name}.pdf"'},
+        content = await render_in_pool(generate_attendance_report_pdf, report_data)
+        return await store_document_response(
+            cache_key, content, "application/pdf", f"attendance_report_{section_name}.pdf",
         )
 
 
 # ══════════════════════════════════════════
-#  STUDENT LIST EXPORT (PDF / Excel)
+#  STUDENT LIST EXPORT (PDF / Excel / CSV / NDJSON)
 # ══════════════════════════════════════════
 
 @router.get("/students")
 async def download_student_list(
     status_filter: Optional[StudentStatus] = Query(None, alias="status"),
     section_id: Optional[UUID] = None,
-    format: str = Query("pdf", regex="^(pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: str = Query("pdf", regex="^(pdf|excel|csv|ndjson)$"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN])),
 ):
-    """Export student list as PDF or Excel."""
-    query = (
-        select(Student, User.first_name, User.last_name, User.email)
-        .join(User, Student.user_id == User.id)
-    )
-    if status_filter:
-        query = query.where(Student.status == status_filter)
-    if section_id:
-        query = query.where(Student.current_section_id == section_id)
-    query = query.order_by(User.last_name)
+    """Export student list as PDF or Excel, or stream it as CSV / NDJSON."""
+    query = student_directory_query(status_filter, section_id)
+
+    # Streamed formats read from a server-side cursor and never hold the full list
+    if format == "csv":
+        return StreamingResponse(
+            stream_directory_csv(query, db.bind),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="student_list.csv"'},
+        )
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_directory_ndjson(query, db.bind),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="student_list.ndjson"'},
+        )
 
     result = await db.execute(query)
-    rows = result.all()
-
-    students_list = []
-    for student, fn, ln, email in rows:
-        students_list.append({
-            "name": f"{fn} {ln}",
-            "admission_no": student.admission_no,
-            "gender": student.gender.value,
-            "status": student.status.value.capitalize(),
-            "email": email,
-            "enrollment_date": student.enrollment_date.strftime("%Y-%m-%d"),
-        })
+    students_list = [directory_row(row) for row in result.all()]
 
     report_data = {
         "title": "Student Directory",
@@ -330,14 +206,15 @@ async def download_student_list(
     }
 
     if format == "excel":
-        content = generate_student_list_excel(report_data)
-        return Response(
-            content=content,
+        with RENDER_DURATION.time("student_list_excel"):
+            output = generate_student_list_excel(report_data)
+        return StreamingResponse(
+            iter_spooled_file(output),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": 'attachment; filename="student_list.xlsx"'},
         )
     else:
-        content = generate_student_list_pdf(report_data)
+        content = await render_in_pool(generate_student_list_pdf, report_data)
         return Response(
             content=content,
             media_type="application/pdf",
@@ -354,108 +231,70 @@ async def download_grades_report(
     section_id: UUID = Query(...),
     term_id: UUID = Query(...),
     format: str = Query("excel", regex="^(excel)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
 ):
     """Export grades for a section in a term as Excel."""
-    # Get term info
-    term = (await db.execute(select(Term).where(Term.id == term_id))).scalar_one_or_none()
-    if not term:
-        raise HTTPException(status_code=404, detail="Term not found")
-
-    # Get students
-    students_result = await db.execute(
-        select(Student, User.first_name, User.last_name)
-        .join(User, Student.user_id == User.id)
-        .where(Student.current_section_id == section_id)
-        .order_by(User.last_name)
-    )
-    students = students_result.all()
-
-    # Get subject-teacher assignments for this section
-    st_result = await db.execute(select(SubjectTeacher).where(SubjectTeacher.section_id == section_id))
-    subject_teachers = st_result.scalars().all()
-
-    subjects = []
-    for st in subject_teachers:
-        subj = (await db.execute(select(Subject).where(Subject.id == st.subject_id))).scalar_one()
-        subjects.append({"id": st.id, "name": subj.name})
-
-    rows = []
-    for student, fn, ln in students:
-        subject_scores = []
-        for subj_info in subjects:
-            # Get categories for this subject-teacher and term
-            cats = (await db.execute(
-                select(AssignmentCategory).where(
-                    and_(AssignmentCategory.subject_teacher_id == subj_info["id"], AssignmentCategory.term_id == term_id)
-                )
-            )).scalars().all()
-
-            total_score = 0
-            total_max = 0
-            for cat in cats:
-                assignments = (await db.execute(select(Assignment).where(Assignment.category_id == cat.id))).scalars().all()
-                for assignment in assignments:
-                    grade = (await db.execute(
-                        select(Grade).where(and_(Grade.assignment_id == assignment.id, Grade.student_id == student.id))
-                    )).scalar_one_or_none()
-                    if grade:
-                        total_score += float(grade.score)
-                        total_max += float(assignment.max_score)
-
-            pct = (total_score / total_max * 100) if total_max > 0 else 0
-            subject_scores.append({"name": subj_info["name"], "score": round(pct, 1)})
-
-        avg = sum(s["score"] for s in subject_scores) / len(subject_scores) if subject_scores else 0
-        rows.append({
-            "student_name": f"{fn} {ln}",
-            "admission_no": student.admission_no,
-            "subjects": subject_scores,
-            "overall_grade": _score_to_letter(avg),
-        })
+    matrix = await build_section_grades_matrix(db, section_id, term_id)
 
-    content = generate_grades_excel({
-        "title": "Grades Report",
-        "term_name": term.name,
-        "rows": rows,
-    })
+    with RENDER_DURATION.time("grades_excel"):
+        output = generate_grades_excel({
+            "title": "Grades Report",
+            "term_name": matrix["term_name"],
+            "rows": matrix["rows"],
+        })
 
-    return Response(
-        content=content,
+    return StreamingResponse(
+        iter_spooled_file(output),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="grades_{term.name}.xlsx"'},
+        headers={"Content-Disposition": f'attachment; filename="grades_{matrix["term_name"]}.xlsx"'},
     )
 
 
 # ══════════════════════════════════════════
-#  HELPER FUNCTIONS
+#  BACKGROUND REPORT JOBS
 # ══════════════════════════════════════════
 
-def _score_to_letter(score: float) -> str:
-    """Convert a percentage score to a letter grade."""
-    if score >= 97: return "A+"
-    elif score >= 93: return "A"
-    elif score >= 90: return "A-"
-    elif score >= 87: return "B+"
-    elif score >= 83: return "B"
-    elif score >= 80: return "B-"
-    elif score >= 77: return "C+"
-    elif score >= 73: return "C"
-    elif score >= 70: return "C-"
-    elif score >= 60: return "D"
-    else: return "F"
-
-
-def _score_to_gpa(score: float) -> float:
-    """Convert a percentage score to GPA."""
-    if score >= 93: return 4.0
-    elif score >= 90: return 3.7
-    elif score >= 87: return 3.3
-    elif score >= 83: return 3.0
-    elif score >= 80: return 2.7
-    elif score >= 77: return 2.3
-    elif score >= 73: return 2.0
-    elif score >= 70: return 1.7
-    elif score >= 60: return 1.0
-    else: return 0.0
+def _job_response(request: Request, job: dict) -> ReportJobResponse:
+    download_url = None
+    if job["status"] == "completed":
+        # Resolved through the app, so the /api/v1 mount (and any root_path) is included
+        download_url = request.url_for("download_report", job_id=job["id"]).path
+    return ReportJobResponse(**{k: v for k, v in job.items() if k in ReportJobResponse.model_fields}, download_url=download_url)
+
+
+@router.post("/jobs", response_model=ReportJobResponse, status_code=202)
+async def submit_report(
+    request: Request,
+    data: ReportJobCreate,
+    current_user: User = Depends(get_current_user),
+):
+    """Queue a report for background generation; poll the job, then download the file."""
+    job = await submit_report_job(data, current_user)
+    return _job_response(request, job)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+async def get_report_status(
+    request: Request,
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Get the status of a report job."""
+    return _job_response(request, await get_report_job(job_id, current_user))
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_report(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Download the file produced by a completed report job."""
+    job = await get_report_job(job_id, current_user)
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Report job is {job['status']}")
+
+    path = result_path(job)
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail="Report file has expired")
+    return FileResponse(path, media_type=job["media_type"], filename=job["filename"])
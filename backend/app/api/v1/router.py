@@ -16,6 +16,7 @@ from app.api.v1.gradebook import router as gradebook_router
 from app.api.v1.communication import router as communication_router
 from app.api.v1.finance import router as finance_router
 from app.api.v1.reports import router as reports_router
+from app.api.v1.search import router as search_router
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -30,3 +31,4 @@ api_router.include_router(gradebook_router)
 api_router.include_router(communication_router)
 api_router.include_router(finance_router)
 api_router.include_router(reports_router)
+api_router.include_router(search_router)
@@ -0,0 +1,30 @@
+"""
+EduNexus School — Search API Routes
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.models.user import User, UserRole
+from app.schemas.search import SearchResult
+from app.api.deps import require_role
+from app.services.search import SEARCH_KINDS, search_people
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=list[SearchResult])
+async def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    kind: Optional[List[str]] = Query(None, description="Restrict to student, teacher and/or guardian"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
+):
+    """Search students, teachers and guardians in one ranked query."""
+    kinds = [k for k in kind if k in SEARCH_KINDS] if kind else SEARCH_KINDS
+    rows = await search_people(db, q.strip(), kinds, limit)
+    return [SearchResult(**row) for row in rows]
@@ -2,38 +2,49 @@
 EduNexus School — Students API Routes
 """
 
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.models.student import Student, StudentGuardian, StudentStatus
 from app.schemas.student import (
     StudentCreateRequest, StudentUpdateRequest, StudentResponse,
     StudentStatusUpdate, GuardianCreateRequest,
 )
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
 from app.api.deps import get_current_user, require_role
-from app.utils.security import hash_password
+from app.services.analytics import invalidate_dashboard_analytics
+from app.services.search import name_search_condition
+from app.utils.pagination import apply_keyset, count_total, split_page
+from app.utils.security import hash_password_async
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
 
-@router.get("", response_model=PaginatedResponse[StudentResponse])
+@router.get("", response_model=Union[PaginatedResponse[StudentResponse], CursorPaginatedResponse[StudentResponse]])
 async def list_students(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    pagination: str = Query("offset", regex="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    approximate_total: bool = False,
     section_id: Optional[UUID] = None,
     student_status: Optional[StudentStatus] = Query(None, alias="status"),
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.TEACHER])),
 ):
-    """List students with filters and pagination."""
+    """
+    List students with filters and pagination.
+    `pagination=cursor` switches to keyset paging on (created_at, id); pass the
+    returned `next_cursor` back as `cursor` for the next page.
+    """
     query = select(Student, User.first_name, User.last_name, User.email).join(User, Student.user_id == User.id)
     count_query = select(func.count(Student.id))
 
@@ -44,21 +55,18 @@ async def list_students(
         query = query.where(Student.status == student_status)
         count_query = count_query.where(Student.status == student_status)
     if search:
-        sf = f"%{search}%"
-        search_cond = (
-            User.first_name.ilike(sf) |
-            User.last_name.ilike(sf) |
-            Student.admission_no.ilike(sf)
-        )
+        search_cond = name_search_condition(search, Student.admission_no)
         query = query.where(search_cond)
         count_query = count_query.join(User, Student.user_id == User.id).where(search_cond)
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
-    query = query.order_by(Student.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    rows = result.all()
+    if pagination == "cursor":
+        result = await db.execute(apply_keyset(query, Student.created_at, Student.id, cursor, per_page))
+        rows, next_cursor = split_page(result.all(), per_page, lambda r: (r[0].created_at, r[0].id))
+    else:
+        total = await count_total(db, count_query, approximate_total)
+        query = query.order_by(Student.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
+        result = await db.execute(query)
+        rows = result.all()
 
     items = []
     for student, first_name, last_name, email in rows:
@@ -68,6 +76,11 @@ async def list_students(
         resp.email = email
         items.append(resp)
 
+    if pagination == "cursor":
+        return CursorPaginatedResponse(
+            items=items, next_cursor=next_cursor, per_page=per_page,
+            total=await count_total(db, count_query, approximate_total) if include_total else None,
+        )
     return PaginatedResponse(
         items=items, total=total, page=page, per_page=per_page,
         pages=(total + per_page - 1) // per_page,
@@ -94,7 +107,7 @@ async def create_student(
     # Create user
     user = User(
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
         role=UserRole.STUDENT,
         first_name=body.first_name,
         last_name=body.last_name,
@@ -123,6 +136,8 @@ async def create_student(
     db.add(student)
     await db.flush()
     await db.refresh(student)
+    await db.commit()
+    await invalidate_dashboard_analytics()
 
     resp = StudentResponse.model_validate(student)
     resp.first_name = user.first_name
@@ -134,7 +149,7 @@ async def create_student(
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student(
     student_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get student by ID."""
@@ -191,5 +206,6 @@ async def update_student_status(
         raise HTTPException(status_code=404, detail="Student not found")
 
     student.status = body.status
-    await db.flush()
+    await db.commit()
+    await invalidate_dashboard_analytics()
     return {"message": f"Student status updated to {body.status.value}"}
@@ -2,49 +2,58 @@
 EduNexus School — Teachers API Routes
 """
 
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.models.teacher import Teacher
 from app.models.classroom import SubjectTeacher, Section
 from app.schemas.academic import TeacherCreate, TeacherUpdate, TeacherResponse
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
 from app.api.deps import get_current_user, require_role
-from app.utils.security import hash_password
+from app.services.search import name_search_condition
+from app.utils.pagination import apply_keyset, count_total, split_page
+from app.utils.security import hash_password_async
 
 router = APIRouter(prefix="/teachers", tags=["Teachers"])
 
 
-@router.get("", response_model=PaginatedResponse[TeacherResponse])
+@router.get("", response_model=Union[PaginatedResponse[TeacherResponse], CursorPaginatedResponse[TeacherResponse]])
 async def list_teachers(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    pagination: str = Query("offset", regex="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    approximate_total: bool = False,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN])),
 ):
-    """List all teachers."""
+    """List all teachers (offset or keyset pagination, see list_students)."""
     query = select(Teacher, User.first_name, User.last_name, User.email).join(
         User, Teacher.user_id == User.id
     )
     count_query = select(func.count(Teacher.id))
 
     if search:
-        sf = f"%{search}%"
-        query = query.where(User.first_name.ilike(sf) | User.last_name.ilike(sf))
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
-    query = query.order_by(Teacher.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    rows = result.all()
+        search_cond = name_search_condition(search, Teacher.employee_id)
+        query = query.where(search_cond)
+        count_query = count_query.join(User, Teacher.user_id == User.id).where(search_cond)
+
+    if pagination == "cursor":
+        result = await db.execute(apply_keyset(query, Teacher.created_at, Teacher.id, cursor, per_page))
+        rows, next_cursor = split_page(result.all(), per_page, lambda r: (r[0].created_at, r[0].id))
+    else:
+        total = await count_total(db, count_query, approximate_total)
+        query = query.order_by(Teacher.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
+        result = await db.execute(query)
+        rows = result.all()
 
     items = []
     for teacher, fn, ln, email in rows:
@@ -54,6 +63,11 @@ async def list_teachers(
         resp.email = email
         items.append(resp)
 
+    if pagination == "cursor":
+        return CursorPaginatedResponse(
+            items=items, next_cursor=next_cursor, per_page=per_page,
+            total=await count_total(db, count_query, approximate_total) if include_total else None,
+        )
     return PaginatedResponse(
         items=items, total=total, page=page, per_page=per_page,
         pages=(total + per_page - 1) // per_page,
@@ -73,7 +87,7 @@ async def create_teacher(
 
     user = User(
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
         role=UserRole.TEACHER,
         first_name=body.first_name,
         last_name=body.last_name,
@@ -105,7 +119,7 @@ async def create_teacher(
 @router.get("/{teacher_id}", response_model=TeacherResponse)
 async def get_teacher(
     teacher_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get teacher details."""
@@ -2,33 +2,40 @@
 EduNexus School — Users API Routes (Admin management)
 """
 
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.schemas.auth import RegisterRequest, UserResponse, UserUpdateRequest
-from app.schemas.common import PaginatedResponse
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
 from app.api.deps import get_current_user, require_role
-from app.utils.security import hash_password
+from app.services.search import name_search_condition
+from app.utils.auth_cache import invalidate_user_principals
+from app.utils.pagination import apply_keyset, count_total, split_page
+from app.utils.security import hash_password_async
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("", response_model=PaginatedResponse[UserResponse])
+@router.get("", response_model=Union[PaginatedResponse[UserResponse], CursorPaginatedResponse[UserResponse]])
 async def list_users(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    pagination: str = Query("offset", regex="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    approximate_total: bool = False,
     role: Optional[UserRole] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN])),
 ):
-    """List all users with pagination and filters (admin only)."""
+    """List all users with offset or keyset pagination and filters (admin only)."""
     query = select(User)
     count_query = select(func.count(User.id))
 
@@ -36,21 +43,22 @@ async def list_users(
         query = query.where(User.role == role)
         count_query = count_query.where(User.role == role)
     if search:
-        search_filter = f"%{search}%"
-        query = query.where(
-            (User.first_name.ilike(search_filter)) |
-            (User.last_name.ilike(search_filter)) |
-            (User.email.ilike(search_filter))
-        )
-        count_query = count_query.where(
-            (User.first_name.ilike(search_filter)) |
-            (User.last_name.ilike(search_filter)) |
-            (User.email.ilike(search_filter))
+        search_cond = name_search_condition(search, User.email)
+        query = query.where(search_cond)
+        count_query = count_query.where(search_cond)
+
+    if pagination == "cursor":
+        result = await db.execute(apply_keyset(query, User.created_at, User.id, cursor, per_page))
+        users, next_cursor = split_page(result.scalars().all(), per_page, lambda u: (u.created_at, u.id))
+        return CursorPaginatedResponse(
+            items=[UserResponse.model_validate(u) for u in users],
+            next_cursor=next_cursor,
+            per_page=per_page,
+            total=await count_total(db, count_query, approximate_total) if include_total else None,
         )
 
     # Get total
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await count_total(db, count_query, approximate_total)
 
     # Paginate
     query = query.order_by(User.created_at.desc())
@@ -84,7 +92,7 @@ async def create_user(
 
     user = User(
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password_async(body.password),
         role=body.role,
         first_name=body.first_name,
         last_name=body.last_name,
@@ -99,7 +107,7 @@ async def create_user(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.ADMIN])),
 ):
     """Get a user by ID (admin only)."""
@@ -129,6 +137,8 @@ async def update_user(
 
     await db.flush()
     await db.refresh(user)
+    await db.commit()
+    await invalidate_user_principals(user.id)
     return UserResponse.model_validate(user)
 
 
@@ -147,5 +157,6 @@ async def delete_user(
         raise HTTPException(status_code=400, detail="Cannot deactivate yourself")
 
     user.is_active = False
-    await db.flush()
+    await db.commit()
+    await invalidate_user_principals(user.id)
     return {"message": f"User {user.email} deactivated"}
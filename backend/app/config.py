@@ -27,13 +27,31 @@ class Settings(BaseSettings):
     # ── Firebase ──
     FIREBASE_PROJECT_ID: str = "ridgewood-educations"
     FIREBASE_CREDENTIALS_BASE64: str = ""
+    FIREBASE_CERTS_URL: str = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+    FIREBASE_KEY_REFRESH_SECONDS: int = 3600
+    FIREBASE_TOKEN_CACHE_SECONDS: int = 300
 
     # ── Database ──
     DATABASE_URL: str = "postgresql+asyncpg://edunexus:edunexus_pass@db:5432/edunexus"
     DATABASE_URL_SYNC: str = "postgresql://edunexus:edunexus_pass@db:5432/edunexus"
+    DB_POOL_SIZE: int = 20  # Connections kept open per process
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: float = 30  # Seconds to wait for a free connection before erroring
+    DB_POOL_RECYCLE: int = -1  # Replace connections older than this many seconds (-1 = never)
+    DB_POOL_PRE_PING: bool = True
+    # "queue" pools connections in-process; "pgbouncer" opens one per checkout (NullPool) and
+    # disables asyncpg's prepared-statement cache for PgBouncer transaction pooling
+    DB_POOL_MODE: str = "queue"
+    # Read replica for reports and list endpoints (empty = read from the primary)
+    DATABASE_READ_URL: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Reads go to the primary while the replica is further behind
+    REPLICA_LAG_CHECK_SECONDS: float = 1.0  # How often each process re-checks replica lag
+    READ_YOUR_WRITES_SECONDS: int = 10  # After a write, that client's reads stay on the primary this long
 
     # ── Redis ──
     REDIS_URL: str = "redis://redis:6379/0"
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    PAGINATION_COUNT_CACHE_SECONDS: int = 30  # Only for list requests with approximate_total=true
 
     # ── JWT ──
     SECRET_KEY: str = "change-me-to-a-random-64-char-string"
@@ -41,6 +59,13 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    PASSWORD_HASH_WORKERS: int = 4  # Threads dedicated to bcrypt hashing/verification
+
+    # Authenticated principal cache (skips the per-request user lookup)
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_REDIS: bool = True  # Share entries/invalidations across workers via Redis (needs REDIS_URL; keep on with several workers)
+
     # ── File Storage ──
     STORAGE_BACKEND: str = "minio"  # "minio" or "gcs"
     GCS_BUCKET: str = "edunexus-files"
@@ -53,6 +78,34 @@ class Settings(BaseSettings):
     MINIO_BUCKET: str = "edunexus-files"
     MINIO_USE_SSL: bool = False
 
+    # ── Reports ──
+    REPORT_RENDER_WORKERS: int = 2  # Processes used for PDF rendering and report jobs
+
+    # Background report jobs
+    REPORT_JOB_BACKEND: str = "redis"  # "redis" or "memory" (single process / local testing)
+    REPORT_JOB_CONCURRENCY: int = 2  # Jobs each API process runs at once
+    REPORT_JOB_STORAGE_DIR: str = "/tmp/edunexus-reports"  # Shared volume when running several replicas
+    REPORT_JOB_TTL_SECONDS: int = 86400  # How long job records and generated files are kept
+    REPORT_JOB_LEASE_SECONDS: int = 60  # A running job whose worker stops renewing its lease this long is requeued
+    REPORT_JOB_MAX_ATTEMPTS: int = 3  # Runs before a repeatedly interrupted job is marked failed
+
+    # Rendered document cache (report cards, attendance reports)
+    DOCUMENT_CACHE_ENABLED: bool = True
+    DOCUMENT_CACHE_DIR: str = "/tmp/edunexus-documents"
+    DOCUMENT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # LRU-evicted beyond this size
+
+    # ── Profiling ──
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing header with db time / query count
+    REQUEST_QUERY_BUDGET: int = 30  # Requests running more queries than this are logged
+    REQUEST_LATENCY_BUDGET_MS: int = 1000  # ...as are requests slower than this
+    SLOW_QUERY_MS: int = 200  # Individual statements slower than this are logged
+
+    # ── Health Checks ──
+    HEALTH_CACHE_SECONDS: float = 1.0  # Readiness results are reused for this long
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0  # Per-dependency probe timeout
+    HEALTH_POOL_SATURATION: float = 0.9  # Not ready once this share of pool capacity is checked out
+    HEALTH_REDIS_REQUIRED: bool = False  # Redis outages only mark the instance "degraded" unless set
+
     @property
     def allowed_origins_list(self) -> List[str]:
         """Parse comma-separated origins into a list."""
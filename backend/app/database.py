@@ -1,9 +1,29 @@
 """
 EduNexus School — Async Database Engine & Session Factory
 Uses SQLAlchemy 2.0 async with asyncpg driver.
+
+Read-heavy GET routes depend on `get_read_db` instead of `get_db`, which
+routes them to the read replica at DATABASE_READ_URL. Without a replica they
+share the request's primary session, so a request that also authenticates
+never holds two pooled connections at once. Reads fall back to
+the primary while the replica lags by more than REPLICA_MAX_LAG_SECONDS, and
+for READ_YOUR_WRITES_SECONDS after a client's own write, so nobody reads
+back stale data straight after saving it.
 """
 
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from fastapi import Depends, Request
+from redis.exceptions import RedisError
+from sqlalchemy import text
+
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -11,17 +31,65 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.utils.cache import get_redis
+from app.utils.metrics import InstrumentedNullPool, InstrumentedQueuePool
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
 
 # ── Async Engine ──
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True,
-)
+def _engine_options() -> Dict[str, Any]:
+    """Pool options for DB_POOL_MODE ("queue" or "pgbouncer")."""
+    if settings.DB_POOL_MODE == "pgbouncer":
+        # PgBouncer (transaction pooling) does the pooling and may hand each transaction
+        # a different server connection, so named prepared statements can't be reused
+        return {
+            "poolclass": InstrumentedNullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    if settings.DB_POOL_MODE != "queue":
+        raise ValueError(f"Unknown DB_POOL_MODE {settings.DB_POOL_MODE!r} (expected 'queue' or 'pgbouncer')")
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    return create_async_engine(url, echo=settings.DEBUG, **_engine_options())
+
+
+engine = create_engine_for(settings.DATABASE_URL)
+
+# Replica reads run in read-only transactions, so a write routed here by mistake fails loudly
+# even when a single instance stands in for both
+read_engine = (
+    create_engine_for(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+).execution_options(postgresql_readonly=True)
+
+
+def pool_stats() -> Dict[str, int]:
+    """Connection pool usage; `capacity` is pool_size + max_overflow (all zero in PgBouncer mode)."""
+    if settings.DB_POOL_MODE == "pgbouncer":
+        return {"size": 0, "capacity": 0, "checked_out": 0, "checked_in": 0, "overflow": 0}
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "capacity": pool.size() + settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+    }
+
 
 # ── Session Factory ──
 async_session_factory = async_sessionmaker(
@@ -30,6 +98,12 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+read_session_factory = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 # ── Declarative Base ──
 class Base(DeclarativeBase):
@@ -37,15 +111,118 @@ class Base(DeclarativeBase):
     pass
 
 
-# ── Dependency ──
-async def get_db() -> AsyncSession:
+# ── Replica Routing ──
+RECENT_WRITE_KEY = "db:recent-write:{client}"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Used when REDIS_URL is not configured (single-process development)
+_local_recent_writes: Dict[str, float] = {}
+
+_replica_lag: Optional[tuple[float, Optional[float]]] = None  # (checked_at, lag seconds or None if down)
+_replica_lag_lock = asyncio.Lock()
+
+# Zero on the primary, or on a replica that has replayed everything it received
+# (replay timestamps stand still while the primary is idle)
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def _client_key(request: Request) -> Optional[str]:
+    """Identify the caller by their bearer token, without keeping the token itself."""
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+async def _mark_recent_write(request: Request) -> None:
+    client = _client_key(request)
+    if client is None:
+        return
+    redis = get_redis()
+    if redis is None:
+        _local_recent_writes[client] = time.monotonic() + settings.READ_YOUR_WRITES_SECONDS
+        return
+    try:
+        await redis.set(RECENT_WRITE_KEY.format(client=client), 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+    except (RedisError, OSError) as e:
+        logger.warning("Could not record recent write: %s", e)
+
+
+async def _wrote_recently(request: Request) -> bool:
+    client = _client_key(request)
+    if client is None:
+        return False
+    redis = get_redis()
+    if redis is None:
+        return _local_recent_writes.get(client, 0) > time.monotonic()
+    try:
+        return bool(await redis.exists(RECENT_WRITE_KEY.format(client=client)))
+    except (RedisError, OSError):
+        return True  # can't tell, so read from the primary
+
+
+async def _query_replica_lag() -> float:
+    async with read_engine.connect() as conn:
+        return float((await conn.execute(_REPLICA_LAG_SQL)).scalar_one())
+
+
+async def replica_lag() -> Optional[float]:
+    """Replica lag in seconds (None if unreachable), re-checked at most every REPLICA_LAG_CHECK_SECONDS."""
+    global _replica_lag
+    if _replica_lag is not None and time.monotonic() - _replica_lag[0] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return _replica_lag[1]
+    async with _replica_lag_lock:
+        if _replica_lag is not None and time.monotonic() - _replica_lag[0] < settings.REPLICA_LAG_CHECK_SECONDS:
+            return _replica_lag[1]
+        try:
+            lag = await asyncio.wait_for(_query_replica_lag(), timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning("Replica lag check failed: %s", e)
+            lag = None
+        _replica_lag = (time.monotonic(), lag)
+        return lag
+
+
+async def get_read_sessionmaker(request: Optional[Request] = None) -> async_sessionmaker:
+    """Session factory for a read: the replica unless it lags or this client just wrote."""
+    if not settings.DATABASE_READ_URL:
+        return read_session_factory
+    if request is not None and await _wrote_recently(request):
+        return async_session_factory
+    lag = await replica_lag()
+    if lag is None or lag > settings.REPLICA_MAX_LAG_SECONDS:
+        return async_session_factory
+    return read_session_factory
+
+
+# ── Dependencies ──
+async def get_db(request: Request) -> AsyncSession:
     """FastAPI dependency that yields an async database session."""
     async with async_session_factory() as session:
         try:
             yield session
             await session.commit()
+            if settings.DATABASE_READ_URL and request.method not in SAFE_METHODS:
+                await _mark_recent_write(request)
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)) -> AsyncSession:
+    """FastAPI dependency for read-only routes; see get_read_sessionmaker for routing."""
+    if not settings.DATABASE_READ_URL:
+        # Same session as get_current_user's, so only one connection is checked out
+        yield db
+        return
+    session_factory = await get_read_sessionmaker(request)
+    async with session_factory() as session:
+        yield session
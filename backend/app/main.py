@@ -2,15 +2,25 @@
 EduNexus School — FastAPI Application Entry Point
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.api.v1.router import api_router
-from app.utils.firebase import init_firebase
+from app.database import engine, read_engine
+from app.services.health import readiness
+from app.services.report_card import shutdown_render_pool
+from app.services.report_jobs import close_job_backend, run_report_worker
+from app.utils.cache import close_redis
+from app.utils.firebase import init_firebase, keep_public_keys_warm
+from app.utils.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.utils.profiling import QueryProfilerMiddleware, install_query_hooks
+from app.utils.security import shutdown_password_executor
 
 settings = get_settings()
 
@@ -21,8 +31,16 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"🚀 {settings.APP_NAME} starting up...")
     init_firebase()
+    key_refresher = asyncio.create_task(keep_public_keys_warm())
+    report_worker = asyncio.create_task(run_report_worker())
     yield
     # Shutdown
+    key_refresher.cancel()
+    report_worker.cancel()
+    await close_job_backend()
+    shutdown_render_pool()
+    await close_redis()
+    shutdown_password_executor()
     print(f"👋 {settings.APP_NAME} shutting down...")
 
 
@@ -42,8 +60,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# ── Query Profiling ──
+install_query_hooks(engine.sync_engine)
+if settings.DATABASE_READ_URL:
+    install_query_hooks(read_engine.sync_engine)
+app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 # ── Mount API Router ──
 app.include_router(api_router)
 
@@ -59,6 +85,25 @@ async def health_check():
     }
 
 
+@app.get("/health/live", tags=["Health"])
+async def liveness():
+    """The process is up and the event loop is responsive; no dependencies are checked."""
+    return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness_check():
+    """503 while the database is unreachable or the connection pool is saturated."""
+    report = await readiness()
+    return JSONResponse(report, status_code=503 if report["status"] == "unavailable" else 200)
+
+
+# ── Metrics (Prometheus text format) ──
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.get("/", tags=["Root"])
 async def root():
     return {
@@ -9,8 +9,8 @@ from app.models.guardian import Guardian
 from app.models.teacher import Teacher
 from app.models.academic import AcademicYear, Term, Subject
 from app.models.classroom import Class, Section, SubjectTeacher, Schedule
-from app.models.attendance import Attendance
-from app.models.gradebook import GradingScale, AssignmentCategory, Assignment, Grade
+from app.models.attendance import Attendance, AttendanceStudentMonthly, AttendanceSectionDaily
+from app.models.gradebook import GradingScale, AssignmentCategory, Assignment, Grade, StudentSubjectTermAggregate
 from app.models.communication import Announcement, Message, Event
 from app.models.finance import FeeStructure, Invoice, Payment
 
@@ -19,8 +19,8 @@ __all__ = [
     "Student", "StudentGuardian", "Guardian", "Teacher",
     "AcademicYear", "Term", "Subject",
     "Class", "Section", "SubjectTeacher", "Schedule",
-    "Attendance",
-    "GradingScale", "AssignmentCategory", "Assignment", "Grade",
+    "Attendance", "AttendanceStudentMonthly", "AttendanceSectionDaily",
+    "GradingScale", "AssignmentCategory", "Assignment", "Grade", "StudentSubjectTermAggregate",
     "Announcement", "Message", "Event",
     "FeeStructure", "Invoice", "Payment",
 ]
@@ -1,12 +1,12 @@
 """
-EduNexus School — Attendance Model
+EduNexus School — Attendance Models (Attendance + pre-aggregated rollups)
 """
 
 import uuid
 from datetime import datetime
 import enum
 
-from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -28,17 +28,20 @@ class Attendance(Base):
     __tablename__ = "attendance"
     __table_args__ = (
         UniqueConstraint("student_id", "date", name="uq_attendance_student_date"),
+        Index("ix_attendance_section_id_date", "section_id", "date", postgresql_include=["status"]),
+        Index("ix_attendance_student_id_date_status", "student_id", "date", "status"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
-    section_id = Column(UUID(as_uuid=True), ForeignKey("sections.id", ondelete="CASCADE"), nullable=False, index=True)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    section_id = Column(UUID(as_uuid=True), ForeignKey("sections.id", ondelete="CASCADE"), nullable=False)
     date = Column(Date, nullable=False, index=True)
     status = Column(SAEnum(AttendanceStatus, name="attendance_status"), nullable=False)
     remarks = Column(String(255), nullable=True)
     marked_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # ── Relationships ──
     student = relationship("Student", back_populates="attendance_records")
@@ -47,3 +50,39 @@ class Attendance(Base):
 
     def __repr__(self) -> str:
         return f"<Attendance {self.student_id} {self.date} {self.status.value}>"
+
+
+class AttendanceStudentMonthly(Base):
+    """
+    Per-student attendance counts for one calendar month (`month` is the 1st).
+    Maintained by app.services.attendance_rollups as attendance is marked.
+    """
+    __tablename__ = "attendance_student_monthly"
+
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<AttendanceStudentMonthly {self.student_id} {self.month}>"
+
+
+class AttendanceSectionDaily(Base):
+    """
+    Per-section attendance counts for one day.
+    Maintained by app.services.attendance_rollups as attendance is marked.
+    """
+    __tablename__ = "attendance_section_daily"
+
+    section_id = Column(UUID(as_uuid=True), ForeignKey("sections.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True, index=True)
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+    excused = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<AttendanceSectionDaily {self.section_id} {self.date}>"
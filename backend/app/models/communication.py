@@ -5,7 +5,7 @@ EduNexus School — Communication Models (Announcement, Message, Event)
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 
@@ -40,10 +40,13 @@ class Announcement(Base):
 class Message(Base):
     """Direct message between two users."""
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_receiver_id_created_at", "receiver_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     sender_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    receiver_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    receiver_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     subject = Column(String(200), nullable=False)
     body = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False, nullable=False)
@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 import enum
 
-from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, ForeignKey, Numeric, String
+from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, ForeignKey, Index, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -45,6 +45,10 @@ class FeeStructure(Base):
 class Invoice(Base):
     """A fee invoice issued to a student."""
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_created_at_id", "created_at", "id"),
+        Index("ix_invoices_status_created_at", "status", "created_at", "id", postgresql_include=["amount"]),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     invoice_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -52,7 +56,7 @@ class Invoice(Base):
     fee_structure_id = Column(UUID(as_uuid=True), ForeignKey("fee_structures.id"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     due_date = Column(Date, nullable=False)
-    status = Column(SAEnum(InvoiceStatus, name="invoice_status"), default=InvoiceStatus.PENDING, nullable=False, index=True)
+    status = Column(SAEnum(InvoiceStatus, name="invoice_status"), default=InvoiceStatus.PENDING, nullable=False)
     paid_at = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,11 +1,12 @@
 """
-EduNexus School — Gradebook Models (GradingScale, AssignmentCategory, Assignment, Grade)
+EduNexus School — Gradebook Models (GradingScale, AssignmentCategory, Assignment, Grade,
+StudentSubjectTermAggregate)
 """
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -80,12 +81,19 @@ class Assignment(Base):
 
 
 class Grade(Base):
-    """A student's score on a specific assignment."""
+    """
+    A student's score on a specific assignment.
+    Enforces one grade per student per assignment.
+    """
     __tablename__ = "grades"
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "student_id", name="uq_grade_assignment_student"),
+        Index("ix_grades_student_id_assignment_id", "student_id", "assignment_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     assignment_id = Column(UUID(as_uuid=True), ForeignKey("assignments.id", ondelete="CASCADE"), nullable=False, index=True)
-    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
     score = Column(Numeric(7, 2), nullable=False)
     remarks = Column(String(255), nullable=True)
     graded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -100,3 +108,27 @@ class Grade(Base):
 
     def __repr__(self) -> str:
         return f"<Grade student={self.student_id} score={self.score}>"
+
+
+class StudentSubjectTermAggregate(Base):
+    """
+    Running grade totals for one student in one subject (teaching assignment)
+    during one term — the materialized form of sum(score) / sum(max_score).
+    Maintained by app.services.grade_aggregates whenever grades or an
+    assignment's max_score change; report reads never touch raw grades.
+    """
+    __tablename__ = "student_subject_term_aggregates"
+
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    term_id = Column(UUID(as_uuid=True), ForeignKey("terms.id", ondelete="CASCADE"), primary_key=True, index=True)
+    subject_teacher_id = Column(UUID(as_uuid=True), ForeignKey("subject_teachers.id", ondelete="CASCADE"), primary_key=True, index=True)
+    subject_id = Column(UUID(as_uuid=True), ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
+    total_score = Column(Numeric(12, 2), nullable=False, default=0)
+    total_max = Column(Numeric(12, 2), nullable=False, default=0)
+    grade_count = Column(Integer, nullable=False, default=0)
+    last_graded_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<StudentSubjectTermAggregate student={self.student_id} {self.total_score}/{self.total_max}>"
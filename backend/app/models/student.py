@@ -7,7 +7,7 @@ from datetime import datetime
 import enum
 
 from sqlalchemy import (
-    Boolean, Column, Date, DateTime, Enum as SAEnum, ForeignKey, String, Text
+    Boolean, Column, Date, DateTime, Enum as SAEnum, ForeignKey, Index, String, Text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -35,6 +35,14 @@ class Student(Base):
     Contains demographic, enrollment, and health information.
     """
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_created_at_id", "created_at", "id"),
+        Index("ix_students_current_section_id_status", "current_section_id", "status"),
+        Index(
+            "ix_students_admission_no_trgm", "admission_no",
+            postgresql_using="gin", postgresql_ops={"admission_no": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
@@ -5,7 +5,7 @@ EduNexus School — Teacher Model
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,13 @@ class Teacher(Base):
     Teachers are assigned to sections via SubjectTeacher.
     """
     __tablename__ = "teachers"
+    __table_args__ = (
+        Index("ix_teachers_created_at_id", "created_at", "id"),
+        Index(
+            "ix_teachers_employee_id_trgm", "employee_id",
+            postgresql_using="gin", postgresql_ops={"employee_id": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
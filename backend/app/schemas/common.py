@@ -20,6 +20,18 @@ class PaginatedResponse(BaseModel, Generic[T]):
     pages: int
 
 
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """
+    Keyset-paginated list response. `next_cursor` is opaque; pass it back as
+    `cursor` to fetch the following page (None means this is the last page).
+    `total` is only filled when requested and may be up to a few seconds stale.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
+    per_page: int
+    total: Optional[int] = None
+
+
 class MessageResponse(BaseModel):
     """Simple message response for operations like delete."""
     message: str
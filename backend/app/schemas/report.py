@@ -0,0 +1,53 @@
+"""
+EduNexus School — Report Job Schemas
+"""
+
+from datetime import date, datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, model_validator
+
+from app.models.student import StudentStatus
+
+ReportKind = Literal["report_card", "report_cards_batch", "attendance", "student_list", "grades"]
+ReportFormat = Literal["pdf", "excel"]
+
+# Format used when a request doesn't name one
+DEFAULT_FORMATS = {"grades": "excel"}
+
+
+class ReportJobCreate(BaseModel):
+    """
+    Request to generate a report in the background. Which parameters are
+    required depends on `kind`, mirroring the matching /reports download route.
+    `format` defaults to the kind's only or usual format (Excel for grades, PDF otherwise).
+    """
+    kind: ReportKind
+    format: Optional[ReportFormat] = None
+    term_id: Optional[UUID] = None
+    student_id: Optional[UUID] = None
+    section_id: Optional[UUID] = None
+    class_id: Optional[UUID] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: Optional[StudentStatus] = None
+
+    @model_validator(mode="after")
+    def default_format(self) -> "ReportJobCreate":
+        if self.format is None:
+            self.format = DEFAULT_FORMATS.get(self.kind, "pdf")
+        return self
+
+
+class ReportJobResponse(BaseModel):
+    id: str
+    kind: ReportKind
+    status: str  # queued | running | completed | failed
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    filename: Optional[str] = None
+    size: Optional[int] = None
+    download_url: Optional[str] = None
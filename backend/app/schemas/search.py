@@ -0,0 +1,19 @@
+"""
+EduNexus School — Search Schemas
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    """A single ranked hit from /search."""
+    kind: str  # "student" | "teacher" | "guardian"
+    id: UUID
+    user_id: UUID
+    name: str
+    email: str
+    code: Optional[str] = None  # admission_no / employee_id
+    score: float
@@ -12,7 +12,7 @@ from pathlib import Path
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from app.database import async_session_factory, engine, Base
 from app.models.user import User, UserRole
 from app.models.student import Student, StudentGuardian
@@ -30,6 +30,7 @@ from app.utils.security import hash_password
 async def seed():
     """Populate the database with demo data."""
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
     async with async_session_factory() as db:
@@ -0,0 +1,3 @@
+"""
+EduNexus School — Services Package (business logic shared across API routes)
+"""
@@ -0,0 +1,102 @@
+"""
+EduNexus School — Dashboard Analytics
+Admin dashboard metrics folded into a few conditional-aggregate queries and
+cached in Redis for a short TTL.
+"""
+
+from datetime import date
+from typing import Any, Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.student import Student, StudentStatus
+from app.models.teacher import Teacher
+from app.models.attendance import AttendanceSectionDaily
+from app.models.finance import Invoice, InvoiceStatus, Payment
+from app.models.classroom import Section, Class
+from app.utils.cache import cache_delete, cache_get_json, cache_set_json
+
+settings = get_settings()
+
+DASHBOARD_CACHE_KEY = "analytics:dashboard"
+
+
+async def compute_dashboard_analytics(db: AsyncSession) -> Dict[str, Any]:
+    """Compute admin dashboard metrics in three round trips."""
+    # Students: total plus one FILTERed count per status
+    student_row = (await db.execute(
+        select(
+            func.count(Student.id),
+            *(func.count(Student.id).filter(Student.status == status) for status in StudentStatus),
+        )
+    )).one()
+    total_students = student_row[0]
+    status_counts = {status.value: student_row[i] for i, status in enumerate(StudentStatus, 1)}
+
+    # Attendance today, from the per-section daily rollup
+    today = date.today()
+    today_present, today_absent, today_late = (await db.execute(
+        select(
+            func.coalesce(func.sum(AttendanceSectionDaily.present), 0),
+            func.coalesce(func.sum(AttendanceSectionDaily.absent), 0),
+            func.coalesce(func.sum(AttendanceSectionDaily.late), 0),
+        ).where(AttendanceSectionDaily.date == today)
+    )).one()
+
+    # Everything else as scalar subqueries of a single SELECT
+    totals = (await db.execute(
+        select(
+            select(func.count(Teacher.id)).scalar_subquery(),
+            select(func.count(Class.id)).scalar_subquery(),
+            select(func.count(Section.id)).scalar_subquery(),
+            select(func.sum(Payment.amount)).scalar_subquery(),
+            select(func.sum(Invoice.amount).filter(Invoice.status == InvoiceStatus.PENDING)).scalar_subquery(),
+            select(func.count(Invoice.id).filter(Invoice.status == InvoiceStatus.OVERDUE)).scalar_subquery(),
+        )
+    )).one()
+    total_teachers, total_classes, total_sections, total_revenue, pending_fees, overdue_count = totals
+
+    return {
+        "students": {
+            "total": total_students,
+            "active": status_counts[StudentStatus.ACTIVE.value],
+            "by_status": status_counts,
+        },
+        "teachers": {"total": total_teachers or 0},
+        "classes": {"total": total_classes or 0, "sections": total_sections or 0},
+        "attendance_today": {
+            "present": today_present,
+            "absent": today_absent,
+            "late": today_late,
+        },
+        "finance": {
+            "total_revenue": float(total_revenue or 0),
+            "pending_fees": float(pending_fees or 0),
+            "overdue_invoices": overdue_count or 0,
+        },
+    }
+
+
+async def get_dashboard_analytics(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Return cached dashboard metrics, computing and caching them on a miss.
+    `db` must be a primary session: numbers read from a lagging replica would
+    outlive the invalidation that followed the write.
+    """
+    cached = await cache_get_json(DASHBOARD_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    data = await compute_dashboard_analytics(db)
+    await cache_set_json(DASHBOARD_CACHE_KEY, data, settings.DASHBOARD_CACHE_TTL_SECONDS)
+    return data
+
+
+async def invalidate_dashboard_analytics() -> None:
+    """
+    Drop cached dashboard metrics after attendance, payment or student changes.
+    Call after the change has committed, or a concurrent load can re-cache the old numbers.
+    """
+    await cache_delete(DASHBOARD_CACHE_KEY)
@@ -0,0 +1,158 @@
+"""
+EduNexus School — Attendance Aggregation
+Per-student status counts for any date range, assembled in a single query
+from whole-month rollup buckets plus raw rows at partial-month edges.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attendance import Attendance, AttendanceStatus, AttendanceStudentMonthly
+from app.services.attendance_rollups import STATUS_COLUMNS, month_start, next_month_start, status_counts
+from app.models.classroom import Class, Section
+from app.models.student import Student
+from app.models.user import User
+
+
+def empty_counts() -> Dict[str, int]:
+    """A zeroed {status: count} mapping covering every AttendanceStatus."""
+    return {status.value: 0 for status in AttendanceStatus}
+
+
+def attendance_percentage(counts: Dict[str, int]) -> float:
+    """Share of recorded days the student was present or late."""
+    total = sum(counts.values())
+    if total == 0:
+        return 0
+    return (counts[AttendanceStatus.PRESENT.value] + counts[AttendanceStatus.LATE.value]) / total * 100
+
+
+async def count_attendance_by_student(
+    db: AsyncSession,
+    student_ids: Iterable[UUID],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[UUID, Dict[str, int]]:
+    """
+    Count attendance records per (student, status) over an optional date range.
+    Every requested student is present in the result, with zeroes where no rows exist.
+    """
+    student_ids = list(student_ids)
+    counts: Dict[UUID, Dict[str, int]] = {student_id: empty_counts() for student_id in student_ids}
+    if not student_ids:
+        return counts
+
+    month_bounds, raw_ranges = _split_range(start_date, end_date)
+    parts = []
+    if month_bounds is not None:
+        first_month, end_month = month_bounds
+        rollup = (
+            select(
+                AttendanceStudentMonthly.student_id,
+                *(getattr(AttendanceStudentMonthly, c).label(c) for c in STATUS_COLUMNS),
+            )
+            .where(AttendanceStudentMonthly.student_id.in_(student_ids))
+        )
+        if first_month:
+            rollup = rollup.where(AttendanceStudentMonthly.month >= first_month)
+        if end_month:
+            rollup = rollup.where(AttendanceStudentMonthly.month < end_month)
+        parts.append(rollup)
+    if raw_ranges:
+        parts.append(
+            select(Attendance.student_id, *status_counts())
+            .where(
+                Attendance.student_id.in_(student_ids),
+                or_(*(and_(Attendance.date >= lo, Attendance.date <= hi) for lo, hi in raw_ranges)),
+            )
+            .group_by(Attendance.student_id)
+        )
+
+    combined = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    result = await db.execute(
+        select(combined.c.student_id, *(func.sum(combined.c[c]) for c in STATUS_COLUMNS))
+        .group_by(combined.c.student_id)
+    )
+    for student_id, *totals in result.all():
+        counts[student_id] = {c: int(total or 0) for c, total in zip(STATUS_COLUMNS, totals)}
+    return counts
+
+
+def _split_range(
+    start_date: Optional[date], end_date: Optional[date]
+) -> Tuple[Optional[Tuple[Optional[date], Optional[date]]], List[Tuple[date, date]]]:
+    """
+    Split an inclusive (open-ended) date range into whole months served by the
+    monthly rollup — as [first_month, end_month) with None meaning unbounded —
+    and the partial-month edges that must be counted from raw rows.
+    """
+    first_month = None
+    if start_date is not None:
+        first_month = start_date if start_date.day == 1 else next_month_start(start_date)
+    end_month = None
+    if end_date is not None:
+        end_month = next_month_start(end_date) if (end_date + timedelta(days=1)).day == 1 else month_start(end_date)
+
+    if first_month and end_month and first_month >= end_month:
+        # No whole month inside the range
+        return None, [(start_date, end_date)]
+
+    raw_ranges = []
+    if start_date is not None and start_date < first_month:
+        raw_ranges.append((start_date, first_month - timedelta(days=1)))
+    if end_date is not None and end_month <= end_date:
+        raw_ranges.append((end_month, end_date))
+    return (first_month, end_month), raw_ranges
+
+
+async def build_attendance_report(
+    db: AsyncSession,
+    section_id: UUID,
+    start_date: date,
+    end_date: date,
+) -> Dict[str, Any]:
+    """Per-student attendance summary for a section, shaped for the PDF/Excel generators."""
+    section = (await db.execute(select(Section).where(Section.id == section_id))).scalar_one_or_none()
+    if not section:
+        raise HTTPException(status_code=404, detail="Section not found")
+
+    parent_class = (await db.execute(select(Class).where(Class.id == section.class_id))).scalar_one()
+    section_name = f"{parent_class.name} - Section {section.name}"
+
+    students = (await db.execute(
+        select(Student.id, Student.admission_no, User.first_name, User.last_name)
+        .join(User, Student.user_id == User.id)
+        .where(Student.current_section_id == section_id)
+        .order_by(User.last_name)
+    )).all()
+
+    counts_by_student = await count_attendance_by_student(
+        db, [student.id for student in students], start_date, end_date
+    )
+
+    rows = []
+    for student in students:
+        counts = counts_by_student[student.id]
+        rows.append({
+            "student_name": f"{student.first_name} {student.last_name}",
+            "admission_no": student.admission_no,
+            "present": counts["present"],
+            "absent": counts["absent"],
+            "late": counts["late"],
+            "excused": counts["excused"],
+            "total": sum(counts.values()),
+            "percentage": round(attendance_percentage(counts), 1),
+        })
+
+    return {
+        "title": f"Attendance Report — {section_name}",
+        "section_name": section_name,
+        "start_date": start_date.strftime("%B %d, %Y"),
+        "end_date": end_date.strftime("%B %d, %Y"),
+        "rows": rows,
+    }
@@ -0,0 +1,146 @@
+"""
+EduNexus School — Attendance Rollups
+Maintains the per-(student, month) and per-(section, date) count tables so
+attendance summaries add up a handful of pre-aggregated buckets instead of
+re-counting raw rows.
+
+Marking attendance refreshes just the buckets it touched. The bucket rows are
+locked (in key order) before they are recomputed from raw rows, so two
+concurrent markings for the same student-month or section-day never
+overwrite each other: whoever waits for the lock recomputes after the other
+has committed and sees both writes.
+
+Rebuild everything (e.g. after bulk imports) with:
+    python -m app.services.attendance_rollups
+"""
+
+import asyncio
+from datetime import date
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session_factory
+from app.models.attendance import (
+    Attendance,
+    AttendanceSectionDaily,
+    AttendanceStatus,
+    AttendanceStudentMonthly,
+)
+
+STATUS_COLUMNS = [status.value for status in AttendanceStatus]
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month_start(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def status_counts():
+    """count(*) FILTER (WHERE status = ...) for every status, in STATUS_COLUMNS order."""
+    return [
+        func.count(Attendance.id).filter(Attendance.status == status).label(status.value)
+        for status in AttendanceStatus
+    ]
+
+
+def _student_month_select():
+    # Unit rendered inline so the SELECT and GROUP BY expressions are identical
+    month = cast(func.date_trunc(literal_column("'month'"), Attendance.date), Date)
+    return (
+        select(Attendance.student_id, month, *status_counts())
+        .group_by(Attendance.student_id, month)
+    )
+
+
+def _section_day_select():
+    return (
+        select(Attendance.section_id, Attendance.date, *status_counts())
+        .group_by(Attendance.section_id, Attendance.date)
+    )
+
+
+def _upsert_from(model, key_columns: list[str], query):
+    stmt = pg_insert(model).from_select(key_columns + STATUS_COLUMNS, query)
+    return stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: getattr(stmt.excluded, column) for column in STATUS_COLUMNS},
+    )
+
+
+async def _lock_buckets(db: AsyncSession, model, key_columns: list[str], keys: list[tuple]) -> None:
+    """Make sure the bucket rows exist, then lock them in key order."""
+    await db.execute(
+        pg_insert(model)
+        .values([{**dict(zip(key_columns, key)), **{c: 0 for c in STATUS_COLUMNS}} for key in keys])
+        .on_conflict_do_nothing(index_elements=key_columns)
+    )
+    columns = [getattr(model, c) for c in key_columns]
+    await db.execute(
+        select(*columns)
+        .where(tuple_(*columns).in_(keys))
+        .order_by(*columns)
+        .with_for_update()
+    )
+
+
+async def refresh_attendance_rollups(
+    db: AsyncSession, section_ids: Iterable[UUID], day: date, student_ids: Iterable[UUID]
+) -> None:
+    """
+    Recompute the buckets touched by marking `student_ids` on `day`. `section_ids`
+    are the sections the marked rows belong to, which can include sections other
+    than the one being marked when a student already had a row for the day.
+    """
+    section_ids = sorted(set(section_ids))
+    student_ids = sorted(set(student_ids))
+    if not student_ids:
+        return
+    month = month_start(day)
+
+    await _lock_buckets(
+        db, AttendanceSectionDaily, ["section_id", "date"],
+        [(section_id, day) for section_id in section_ids],
+    )
+    await db.execute(_upsert_from(
+        AttendanceSectionDaily, ["section_id", "date"],
+        _section_day_select().where(Attendance.section_id.in_(section_ids), Attendance.date == day),
+    ))
+
+    await _lock_buckets(
+        db, AttendanceStudentMonthly, ["student_id", "month"],
+        [(student_id, month) for student_id in student_ids],
+    )
+    await db.execute(_upsert_from(
+        AttendanceStudentMonthly, ["student_id", "month"],
+        _student_month_select().where(
+            Attendance.student_id.in_(student_ids),
+            Attendance.date >= month,
+            Attendance.date < next_month_start(day),
+        ),
+    ))
+
+
+async def rebuild_attendance_rollups(db: AsyncSession) -> None:
+    """Recompute both rollup tables from raw attendance."""
+    await db.execute(delete(AttendanceStudentMonthly))
+    await db.execute(delete(AttendanceSectionDaily))
+    await db.execute(_upsert_from(AttendanceStudentMonthly, ["student_id", "month"], _student_month_select()))
+    await db.execute(_upsert_from(AttendanceSectionDaily, ["section_id", "date"], _section_day_select()))
+
+
+async def _main() -> None:
+    async with async_session_factory() as db:
+        await rebuild_attendance_rollups(db)
+        await db.commit()
+    print("✅ Attendance rollups rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,258 @@
+"""
+EduNexus School — Rendered Document Cache
+Report cards and attendance reports are cached on disk under a
+content-addressed key: a hash of everything that goes into the document
+(kind and parameters, a fingerprint of the underlying rows, the template
+sources and a per-scope generation counter). The key doubles as the ETag,
+so repeat downloads are answered with 304 or streamed from disk without
+re-querying or re-rendering.
+
+Writes bump the generation of the scopes they touch (a student for grades,
+a section for attendance) once they have committed, which moves every
+affected document to a new key. The row fingerprint (latest `updated_at`)
+moves too once a lagging replica catches up, so a render made from
+not-yet-replicated rows is never reused. Stale files are never served again
+and age out through LRU eviction once the cache exceeds
+DOCUMENT_CACHE_MAX_BYTES. Generations live in Redis
+so all workers agree; if Redis is configured but unreachable the cache is
+bypassed rather than risk serving a stale document.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+from uuid import UUID
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.attendance import Attendance
+from app.models.gradebook import Assignment, Grade
+from app.utils.cache import get_redis
+from app.utils.pdf_generator import TEMPLATES
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "doccache:gen:{scope}"
+CACHE_FORMAT = 1  # bump when generated documents change in ways the template hash can't see
+
+# Changing any report template or stylesheet changes every key
+_TEMPLATES_DIGEST = hashlib.sha256(json.dumps(TEMPLATES, sort_keys=True).encode()).hexdigest()
+
+# Used when REDIS_URL is not configured (single-process development)
+_local_generations: Dict[str, int] = {}
+
+
+# ══════════════════════════════════════════
+#  SCOPE GENERATIONS
+# ══════════════════════════════════════════
+
+def student_scope(student_id: UUID) -> str:
+    return f"student:{student_id}"
+
+
+def section_scope(section_id: UUID) -> str:
+    return f"section:{section_id}"
+
+
+async def _scope_generations(scopes: list[str]) -> Optional[list[int]]:
+    """Current generation of each scope, or None when Redis can't be reached."""
+    client = get_redis()
+    if client is None:
+        return [_local_generations.get(scope, 0) for scope in scopes]
+    try:
+        values = await client.mget([GENERATION_KEY.format(scope=scope) for scope in scopes])
+    except (RedisError, OSError) as e:
+        logger.warning("Document cache generations unavailable: %s", e)
+        return None
+    return [int(value or 0) for value in values]
+
+
+async def invalidate_documents(scopes: Iterable[str]) -> None:
+    """Retire every cached document rendered from these scopes."""
+    scopes = list(scopes)
+    if not scopes:
+        return
+    client = get_redis()
+    if client is None:
+        for scope in scopes:
+            _local_generations[scope] = _local_generations.get(scope, 0) + 1
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(GENERATION_KEY.format(scope=scope))
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning("Document cache invalidation failed for %s: %s", scopes, e)
+
+
+# ══════════════════════════════════════════
+#  CACHE KEYS
+# ══════════════════════════════════════════
+
+async def _document_key(kind: str, params: Dict[str, Any], scopes: list[str], fingerprint: Any) -> Optional[str]:
+    if not settings.DOCUMENT_CACHE_ENABLED:
+        return None
+    generations = await _scope_generations(scopes)
+    if generations is None:
+        return None
+    payload = {
+        "format": CACHE_FORMAT,
+        "templates": _TEMPLATES_DIGEST,
+        "kind": kind,
+        "params": params,
+        "generations": generations,
+        "fingerprint": fingerprint,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def report_card_key(db: AsyncSession, student_id: UUID, term_id: UUID) -> Optional[str]:
+    """Key for a student's report card PDF; any grade or assignment change produces a new key."""
+    fingerprint = (await db.execute(
+        select(func.count(Grade.id), func.max(Grade.updated_at), func.max(Assignment.updated_at))
+        .join(Assignment, Grade.assignment_id == Assignment.id)
+        .where(Grade.student_id == student_id)
+    )).one()
+    return await _document_key(
+        "report_card",
+        {"student_id": student_id, "term_id": term_id},
+        [student_scope(student_id)],
+        list(fingerprint),
+    )
+
+
+async def attendance_report_key(
+    db: AsyncSession, section_id: UUID, start_date: date, end_date: date, format: str
+) -> Optional[str]:
+    """Key for a section's attendance report; attendance writes bump the section's generation."""
+    fingerprint = (await db.execute(
+        select(func.count(Attendance.id), func.max(Attendance.updated_at))
+        .where(
+            Attendance.section_id == section_id,
+            Attendance.date >= start_date,
+            Attendance.date <= end_date,
+        )
+    )).one()
+    return await _document_key(
+        "attendance_report",
+        {"section_id": section_id, "start_date": start_date, "end_date": end_date, "format": format},
+        [section_scope(section_id)],
+        list(fingerprint),
+    )
+
+
+# ══════════════════════════════════════════
+#  DISK STORAGE (LRU by size)
+# ══════════════════════════════════════════
+
+def _paths(key: str) -> tuple[Path, Path]:
+    directory = Path(settings.DOCUMENT_CACHE_DIR)
+    return directory / f"{key}.bin", directory / f"{key}.json"
+
+
+def _read_entry(key: str) -> Optional[Dict[str, Any]]:
+    data_path, meta_path = _paths(key)
+    try:
+        meta = json.loads(meta_path.read_text())
+        os.utime(data_path)  # mark as recently used
+    except (OSError, ValueError):
+        return None
+    return {**meta, "path": data_path}
+
+
+def _evict(max_bytes: int) -> None:
+    """Delete least recently used documents until the cache fits in `max_bytes`."""
+    entries = []
+    total = 0
+    for path in Path(settings.DOCUMENT_CACHE_DIR).glob("*.bin"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def _write_entry(key: str, content: bytes, media_type: str, filename: str) -> None:
+    data_path, meta_path = _paths(key)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = data_path.with_suffix(f".{os.getpid()}.partial")
+    partial.write_bytes(content)
+    os.replace(partial, data_path)
+    meta_path.write_text(json.dumps({"media_type": media_type, "filename": filename}))
+    _evict(settings.DOCUMENT_CACHE_MAX_BYTES)
+
+
+# ══════════════════════════════════════════
+#  RESPONSES
+# ══════════════════════════════════════════
+
+def _etag(key: str) -> str:
+    return f'"{key}"'
+
+
+def _not_modified(request: Request, key: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return _etag(key) in [tag.strip() for tag in header.split(",")]
+
+
+def _cache_headers(key: str) -> Dict[str, str]:
+    # Clients must revalidate, which costs only the key lookup
+    return {"ETag": _etag(key), "Cache-Control": "private, no-cache"}
+
+
+async def cached_document_response(request: Request, key: Optional[str]) -> Optional[Response]:
+    """304 or the cached file for `key`, or None if the document has to be rendered."""
+    if key is None:
+        return None
+    if _not_modified(request, key):
+        return Response(status_code=304, headers=_cache_headers(key))
+    entry = await asyncio.to_thread(_read_entry, key)
+    if entry is None:
+        return None
+    # "*" matches any current representation, so it is only honoured when one is cached
+    if request.headers.get("if-none-match", "").strip() == "*":
+        return Response(status_code=304, headers=_cache_headers(key))
+    return FileResponse(
+        entry["path"],
+        media_type=entry["media_type"],
+        filename=entry["filename"],
+        headers=_cache_headers(key),
+    )
+
+
+async def store_document_response(
+    key: Optional[str], content: Union[bytes, Any], media_type: str, filename: str
+) -> Response:
+    """Cache a freshly rendered document (bytes or a readable file) and return it."""
+    if not isinstance(content, bytes):
+        with content:
+            content = content.read()
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if key is not None:
+        try:
+            await asyncio.to_thread(_write_entry, key, content, media_type, filename)
+            headers.update(_cache_headers(key))
+        except OSError as e:
+            logger.warning("Document cache write failed: %s", e)
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -0,0 +1,132 @@
+"""
+EduNexus School — Materialized Grade Aggregates
+Keeps student_subject_term_aggregates in step with grades so report cards
+and grade exports read one row per (student, subject, term) instead of
+scanning every grade and assignment.
+
+Writers refresh only the cells they touch: every grade and assignment write
+belongs to exactly one (subject_teacher, term) pair, so the affected cells
+are recomputed for the affected students under a transaction-scoped
+advisory lock on that pair. The lock serialises concurrent writers, and
+because each recompute runs after the lock is taken it always sees the
+other writer's committed rows.
+
+Rebuild everything (or one term) with:
+    python -m app.services.grade_aggregates [--term TERM_ID]
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session_factory
+from app.models.classroom import SubjectTeacher
+from app.models.gradebook import Assignment, AssignmentCategory, Grade, StudentSubjectTermAggregate
+
+_AGGREGATE_COLUMNS = [
+    "student_id", "term_id", "subject_teacher_id", "subject_id",
+    "total_score", "total_max", "grade_count", "last_graded_at", "updated_at",
+]
+
+
+def _aggregate_select():
+    """Raw (student, term, subject_teacher) totals, in _AGGREGATE_COLUMNS order."""
+    return (
+        select(
+            Grade.student_id,
+            AssignmentCategory.term_id,
+            AssignmentCategory.subject_teacher_id,
+            SubjectTeacher.subject_id,
+            func.sum(Grade.score),
+            func.sum(Assignment.max_score),
+            func.count(Grade.id),
+            func.max(Grade.updated_at),
+            literal(datetime.utcnow()),
+        )
+        .join(Assignment, Grade.assignment_id == Assignment.id)
+        .join(AssignmentCategory, Assignment.category_id == AssignmentCategory.id)
+        .join(SubjectTeacher, AssignmentCategory.subject_teacher_id == SubjectTeacher.id)
+        .group_by(
+            Grade.student_id,
+            AssignmentCategory.term_id,
+            AssignmentCategory.subject_teacher_id,
+            SubjectTeacher.subject_id,
+        )
+    )
+
+
+def _upsert_from(query):
+    stmt = pg_insert(StudentSubjectTermAggregate).from_select(_AGGREGATE_COLUMNS, query)
+    return stmt.on_conflict_do_update(
+        index_elements=["student_id", "term_id", "subject_teacher_id"],
+        set_={column: getattr(stmt.excluded, column) for column in _AGGREGATE_COLUMNS[3:]},
+    )
+
+
+async def refresh_assignment_aggregates(
+    db: AsyncSession,
+    assignment_id: UUID,
+    student_ids: Optional[Iterable[UUID]] = None,
+) -> None:
+    """
+    Recompute the aggregate cells an assignment contributes to, for `student_ids`
+    (after grade entry) or for every graded student (after a max_score change).
+    """
+    scope = (await db.execute(
+        select(AssignmentCategory.subject_teacher_id, AssignmentCategory.term_id)
+        .join(Assignment, Assignment.category_id == AssignmentCategory.id)
+        .where(Assignment.id == assignment_id)
+    )).one_or_none()
+    if scope is None:
+        return
+    subject_teacher_id, term_id = scope
+
+    await db.execute(select(func.pg_advisory_xact_lock(
+        func.hashtextextended(f"grade-aggregates:{subject_teacher_id}:{term_id}", 0)
+    )))
+
+    if student_ids is None:
+        students = select(Grade.student_id).where(Grade.assignment_id == assignment_id).scalar_subquery()
+    else:
+        students = list(student_ids)
+        if not students:
+            return
+
+    await db.execute(_upsert_from(
+        _aggregate_select().where(
+            AssignmentCategory.subject_teacher_id == subject_teacher_id,
+            AssignmentCategory.term_id == term_id,
+            Grade.student_id.in_(students),
+        )
+    ))
+
+
+async def rebuild_grade_aggregates(db: AsyncSession, term_id: Optional[UUID] = None) -> None:
+    """Recompute aggregates from raw grades, for one term or for everything."""
+    clear = delete(StudentSubjectTermAggregate)
+    query = _aggregate_select()
+    if term_id is not None:
+        clear = clear.where(StudentSubjectTermAggregate.term_id == term_id)
+        query = query.where(AssignmentCategory.term_id == term_id)
+    await db.execute(clear)
+    await db.execute(_upsert_from(query))
+
+
+async def _main(term_id: Optional[UUID]) -> None:
+    async with async_session_factory() as db:
+        await rebuild_grade_aggregates(db, term_id)
+        await db.commit()
+    scope = f"term {term_id}" if term_id else "all terms"
+    print(f"✅ Grade aggregates rebuilt for {scope}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild student_subject_term_aggregates from raw grades.")
+    parser.add_argument("--term", type=UUID, default=None, help="Only rebuild this term")
+    asyncio.run(_main(parser.parse_args().term))
@@ -0,0 +1,101 @@
+"""
+EduNexus School — Readiness Checks
+Times a `SELECT 1` through the connection pool, pings Redis, checks read
+replica lag (when one is configured) and compares pool usage against
+HEALTH_POOL_SATURATION, so load balancers stop routing to an instance whose
+database or pool is wedged.
+
+Results are shared for HEALTH_CACHE_SECONDS and concurrent probes wait on a
+single in-flight check, so a probe storm costs at most one round of checks
+per second.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.database import engine, pool_stats, replica_lag
+from app.utils.cache import get_redis
+
+settings = get_settings()
+
+_cached: Optional[tuple[float, Dict[str, Any]]] = None
+_check_lock = asyncio.Lock()
+
+
+async def _timed(probe) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"status": "fail", "error": f"timed out after {settings.HEALTH_CHECK_TIMEOUT_SECONDS}s"}
+    except Exception as e:
+        return {"status": "fail", "error": f"{type(e).__name__}: {e}"}
+    return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+async def check_database() -> Dict[str, Any]:
+    async def probe():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    return await _timed(probe)
+
+
+async def check_redis() -> Dict[str, Any]:
+    client = get_redis()
+    if client is None:
+        return {"status": "skipped"}
+    result = await _timed(client.ping)
+    if result["status"] == "fail" and not settings.HEALTH_REDIS_REQUIRED:
+        result["status"] = "degraded"
+    return result
+
+
+async def check_replica() -> Dict[str, Any]:
+    """A lagging or unreachable replica is "degraded": reads fall back to the primary meanwhile."""
+    if not settings.DATABASE_READ_URL:
+        return {"status": "skipped"}
+    lag = await replica_lag()
+    if lag is None:
+        return {"status": "degraded", "error": "unreachable"}
+    status = "degraded" if lag > settings.REPLICA_MAX_LAG_SECONDS else "ok"
+    return {"status": status, "lag_seconds": round(lag, 2)}
+
+
+def check_pool() -> Dict[str, Any]:
+    stats = pool_stats()
+    saturation = stats["checked_out"] / stats["capacity"] if stats["capacity"] else 0.0
+    status = "fail" if saturation >= settings.HEALTH_POOL_SATURATION else "ok"
+    return {"status": status, "saturation": round(saturation, 2), **stats}
+
+
+async def _run_checks() -> Dict[str, Any]:
+    database, redis, replica = await asyncio.gather(check_database(), check_redis(), check_replica())
+    checks = {"database": database, "redis": redis, "replica": replica, "pool": check_pool()}
+    statuses = {check["status"] for check in checks.values()}
+    if "fail" in statuses:
+        status = "unavailable"
+    elif "degraded" in statuses:
+        status = "degraded"
+    else:
+        status = "ready"
+    return {"status": status, "timestamp": datetime.utcnow().isoformat(), "checks": checks}
+
+
+async def readiness() -> Dict[str, Any]:
+    """Cached readiness report; `status` is "ready", "degraded" (still serving) or "unavailable"."""
+    global _cached
+    if _cached is not None and time.monotonic() - _cached[0] < settings.HEALTH_CACHE_SECONDS:
+        return _cached[1]
+    async with _check_lock:
+        # Another probe may have refreshed the result while we waited
+        if _cached is not None and time.monotonic() - _cached[0] < settings.HEALTH_CACHE_SECONDS:
+            return _cached[1]
+        report = await _run_checks()
+        _cached = (time.monotonic(), report)
+        return report
@@ -0,0 +1,307 @@
+"""
+EduNexus School — Report Card Computation
+Loads a term's gradebook with set-based aggregate queries instead of walking
+categories → assignments → grades one row at a time.
+"""
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.student import Student
+from app.models.academic import AcademicYear, Term, Subject
+from app.models.classroom import Section, SubjectTeacher
+from app.models.gradebook import StudentSubjectTermAggregate
+from app.utils.metrics import RENDER_DURATION
+from app.utils.pdf_generator import generate_report_card_pdf
+
+settings = get_settings()
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def fetch_subject_totals(
+    db: AsyncSession,
+    term_id: UUID,
+    student_ids: Iterable[UUID],
+) -> Dict[UUID, List[Dict[str, Any]]]:
+    """
+    Score and max_score totals per (student, subject) for a term, read from the
+    materialized aggregates (one primary-key range lookup per student).
+    Returns {student_id: [{subject_id, subject_name, subject_code, total_score, total_max}, ...]}.
+    """
+    student_ids = list(student_ids)
+    if not student_ids:
+        return {}
+
+    agg = StudentSubjectTermAggregate
+    result = await db.execute(
+        select(
+            agg.student_id,
+            Subject.id,
+            Subject.name,
+            Subject.code,
+            func.sum(agg.total_score),
+            func.sum(agg.total_max),
+        )
+        .join(Subject, agg.subject_id == Subject.id)
+        .where(agg.student_id.in_(student_ids), agg.term_id == term_id, agg.grade_count > 0)
+        .group_by(agg.student_id, Subject.id, Subject.name, Subject.code)
+        .order_by(Subject.name)
+    )
+
+    totals: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+    for student_id, subject_id, name, code, total_score, total_max in result.all():
+        totals[student_id].append({
+            "subject_id": subject_id,
+            "subject_name": name,
+            "subject_code": code,
+            "total_score": float(total_score or 0),
+            "total_max": float(total_max or 0),
+        })
+    return totals
+
+
+def summarize_subjects(subject_totals: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn per-subject score totals into percentages, letter grades and overall averages."""
+    subjects = []
+    for data in subject_totals:
+        avg = (data["total_score"] / data["total_max"] * 100) if data["total_max"] else 0
+        subjects.append({
+            "subject_name": data["subject_name"],
+            "subject_code": data["subject_code"],
+            "average_score": avg,
+            "letter_grade": score_to_letter(avg),
+            "gpa": score_to_gpa(avg),
+        })
+
+    overall = sum(s["average_score"] for s in subjects) / len(subjects) if subjects else 0
+    overall_gpa = round(sum(s["gpa"] for s in subjects) / len(subjects), 2) if subjects else None
+    return {"subjects": subjects, "overall_average": overall, "overall_gpa": overall_gpa}
+
+
+async def load_term(db: AsyncSession, term_id: UUID) -> tuple[Term, AcademicYear]:
+    """Fetch a term together with its academic year, or raise 404."""
+    row = (await db.execute(
+        select(Term, AcademicYear)
+        .join(AcademicYear, Term.academic_year_id == AcademicYear.id)
+        .where(Term.id == term_id)
+    )).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Term not found")
+    return row[0], row[1]
+
+
+async def build_report_card(db: AsyncSession, student_id: UUID, term_id: UUID) -> Dict[str, Any]:
+    """
+    Compute a single student's report card for a term.
+    Query count is constant regardless of how many subjects or assignments the term has.
+    """
+    row = (await db.execute(
+        select(Student, User.first_name, User.last_name)
+        .join(User, Student.user_id == User.id)
+        .where(Student.id == student_id)
+    )).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Student not found")
+    student, fn, ln = row
+
+    term, year = await load_term(db, term_id)
+    totals = await fetch_subject_totals(db, term_id, [student_id])
+
+    return {
+        "student_id": student.id,
+        "student_name": f"{fn} {ln}",
+        "admission_no": student.admission_no,
+        "academic_year": year.name,
+        "term_name": term.name,
+        **summarize_subjects(totals.get(student_id, [])),
+    }
+
+
+async def build_section_report_cards(
+    db: AsyncSession,
+    term_id: UUID,
+    section_id: Optional[UUID] = None,
+    class_id: Optional[UUID] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compute report cards for every student in a section (or every section of a class).
+    Grades for the whole group are aggregated in a single pass.
+    """
+    term, year = await load_term(db, term_id)
+
+    query = (
+        select(Student, User.first_name, User.last_name)
+        .join(User, Student.user_id == User.id)
+        .order_by(User.last_name, User.first_name)
+    )
+    if section_id:
+        query = query.where(Student.current_section_id == section_id)
+    else:
+        query = query.join(Section, Student.current_section_id == Section.id).where(Section.class_id == class_id)
+    students = (await db.execute(query)).all()
+
+    totals = await fetch_subject_totals(db, term_id, [student.id for student, _, _ in students])
+
+    return [
+        {
+            "student_id": student.id,
+            "student_name": f"{fn} {ln}",
+            "admission_no": student.admission_no,
+            "academic_year": year.name,
+            "term_name": term.name,
+            **summarize_subjects(totals.get(student.id, [])),
+        }
+        for student, fn, ln in students
+    ]
+
+
+async def build_section_grades_matrix(
+    db: AsyncSession,
+    section_id: UUID,
+    term_id: UUID,
+) -> Dict[str, Any]:
+    """
+    Build the student × subject percentage matrix for a section's grades export.
+    Per-(student, subject_teacher) totals come from the materialized aggregates and
+    are pivoted into dense score/max arrays in memory.
+    """
+    term, _ = await load_term(db, term_id)
+
+    students = (await db.execute(
+        select(Student, User.first_name, User.last_name)
+        .join(User, Student.user_id == User.id)
+        .where(Student.current_section_id == section_id)
+        .order_by(User.last_name)
+    )).all()
+
+    subject_teachers = (await db.execute(
+        select(SubjectTeacher.id, Subject.name)
+        .join(Subject, SubjectTeacher.subject_id == Subject.id)
+        .where(SubjectTeacher.section_id == section_id)
+        .order_by(Subject.name)
+    )).all()
+
+    student_index = {student.id: i for i, (student, _, _) in enumerate(students)}
+    subject_index = {st_id: j for j, (st_id, _) in enumerate(subject_teachers)}
+    scores = [[0.0] * len(subject_teachers) for _ in students]
+    maxima = [[0.0] * len(subject_teachers) for _ in students]
+
+    if students and subject_teachers:
+        agg = StudentSubjectTermAggregate
+        result = await db.execute(
+            select(agg.student_id, agg.subject_teacher_id, agg.total_score, agg.total_max)
+            .where(
+                agg.student_id.in_(list(student_index)),
+                agg.term_id == term_id,
+                agg.subject_teacher_id.in_(list(subject_index)),
+            )
+        )
+        for student_id, st_id, total_score, total_max in result.all():
+            i, j = student_index[student_id], subject_index[st_id]
+            scores[i][j] = float(total_score or 0)
+            maxima[i][j] = float(total_max or 0)
+
+    rows = []
+    for (student, fn, ln), score_row, max_row in zip(students, scores, maxima):
+        percentages = [round(sc / mx * 100, 1) if mx > 0 else 0 for sc, mx in zip(score_row, max_row)]
+        avg = sum(percentages) / len(percentages) if percentages else 0
+        rows.append({
+            "student_name": f"{fn} {ln}",
+            "admission_no": student.admission_no,
+            "subjects": [{"name": name, "score": pct} for (_, name), pct in zip(subject_teachers, percentages)],
+            "overall_grade": score_to_letter(avg),
+        })
+
+    return {"term_name": term.name, "rows": rows}
+
+
+# ══════════════════════════════════════════
+#  PDF RENDERING
+# ══════════════════════════════════════════
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool used for PDF rendering and report jobs."""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(max_workers=settings.REPORT_RENDER_WORKERS)
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the rendering pool (called on application shutdown)."""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def report_card_pdf_context(card: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a computed report card into the context expected by the PDF template."""
+    return {
+        "student_name": card["student_name"],
+        "admission_no": card["admission_no"],
+        "academic_year": card["academic_year"],
+        "term_name": card["term_name"],
+        "subjects": [{**s, "average_score": round(s["average_score"], 1)} for s in card["subjects"]],
+        "overall_average": round(card["overall_average"], 1),
+        "overall_gpa": card["overall_gpa"],
+    }
+
+
+async def render_in_pool(fn: Callable[..., Any], *args: Any, renderer: Optional[str] = None) -> Any:
+    """
+    Run a CPU-heavy render function in the process pool, keeping the event loop free.
+    Timed under `renderer` (default: the function name without "generate_").
+    """
+    with RENDER_DURATION.time(renderer or fn.__name__.removeprefix("generate_")):
+        return await asyncio.get_running_loop().run_in_executor(get_render_pool(), fn, *args)
+
+
+async def render_report_card_pdfs(cards: List[Dict[str, Any]]) -> List[bytes]:
+    """Render many report cards in parallel worker processes, preserving input order."""
+    return await asyncio.gather(*(
+        render_in_pool(generate_report_card_pdf, report_card_pdf_context(card))
+        for card in cards
+    ))
+
+
+# ══════════════════════════════════════════
+#  GRADE CONVERSIONS
+# ══════════════════════════════════════════
+
+def score_to_letter(score: float) -> str:
+    """Convert a percentage score to a letter grade."""
+    if score >= 97: return "A+"
+    elif score >= 93: return "A"
+    elif score >= 90: return "A-"
+    elif score >= 87: return "B+"
+    elif score >= 83: return "B"
+    elif score >= 80: return "B-"
+    elif score >= 77: return "C+"
+    elif score >= 73: return "C"
+    elif score >= 70: return "C-"
+    elif score >= 60: return "D"
+    else: return "F"
+
+
+def score_to_gpa(score: float) -> float:
+    """Convert a percentage score to GPA."""
+    if score >= 93: return 4.0
+    elif score >= 90: return 3.7
+    elif score >= 87: return 3.3
+    elif score >= 83: return 3.0
+    elif score >= 80: return 2.7
+    elif score >= 77: return 2.3
+    elif score >= 73: return 2.0
+    elif score >= 70: return 1.7
+    elif score >= 60: return 1.0
+    else: return 0.0
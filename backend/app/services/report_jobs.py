@@ -0,0 +1,493 @@
+"""
+EduNexus School — Background Report Jobs
+Report generation requests are queued, picked up by a worker task running in
+every API process, rendered in the shared process pool and written to disk,
+so neither data gathering nor WeasyPrint ever runs inside a request.
+
+Job records and the queue live in Redis (REPORT_JOB_BACKEND="redis") so any
+replica can accept, run or report on a job; the "memory" backend keeps both
+in-process for single-worker deployments and local testing. Generated files
+go to REPORT_JOB_STORAGE_DIR, which must be a shared volume when several
+replicas serve downloads.
+
+Claiming a job moves it onto a processing list under a lease that the
+running worker renews. A job whose lease lapses (its process died or hung)
+is put back on the queue and retried, up to REPORT_JOB_MAX_ATTEMPTS runs, so
+jobs are neither lost nor left "running" forever.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_read_sessionmaker
+from app.models.user import User, UserRole
+from app.schemas.report import ReportJobCreate
+from app.services.attendance import build_attendance_report
+from app.services.report_card import (
+    build_report_card,
+    build_section_grades_matrix,
+    build_section_report_cards,
+    render_in_pool,
+    report_card_pdf_context,
+)
+from app.services.student_export import directory_row, student_directory_query
+from app.utils.excel_generator import (
+    generate_attendance_excel,
+    generate_grades_excel,
+    generate_student_list_excel,
+)
+from app.utils.pdf_generator import (
+    generate_attendance_report_pdf,
+    generate_report_card_pdf,
+    generate_student_list_pdf,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+JOB_KEY = "report-jobs:job:{job_id}"
+QUEUE_KEY = "report-jobs:queue"
+PROCESSING_KEY = "report-jobs:processing"
+LEASE_KEY = "report-jobs:lease:{job_id}"
+
+# Moves a job whose lease has lapsed back to the queue; atomic, so concurrent sweeps requeue it once
+_REQUEUE_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 0 and redis.call('LREM', KEYS[1], 1, ARGV[1]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+PDF_MEDIA_TYPE = "application/pdf"
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MEDIA_TYPE = "application/zip"
+
+# Roles allowed to request each kind (None = any authenticated user), matching the download routes
+KIND_ROLES = {
+    "report_card": None,
+    "report_cards_batch": {UserRole.ADMIN, UserRole.TEACHER},
+    "attendance": {UserRole.ADMIN, UserRole.TEACHER},
+    "grades": {UserRole.ADMIN, UserRole.TEACHER},
+    "student_list": {UserRole.ADMIN},
+}
+REQUIRED_PARAMS = {
+    "report_card": ("student_id", "term_id"),
+    "report_cards_batch": ("term_id",),
+    "attendance": ("section_id", "start_date", "end_date"),
+    "grades": ("section_id", "term_id"),
+    "student_list": (),
+}
+
+
+# ══════════════════════════════════════════
+#  JOB BACKENDS
+# ══════════════════════════════════════════
+
+class MemoryJobBackend:
+    """In-process job records, queue and leases (one API worker, or tests)."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._leases: Dict[str, float] = {}  # claimed job id -> lease expiry (monotonic)
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["id"]] = dict(job)
+        cutoff = time.time() - settings.REPORT_JOB_TTL_SECONDS
+        for job_id in [j for j, data in self._jobs.items() if data["created_ts"] < cutoff]:
+            del self._jobs[job_id]
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def push(self, job_id: str) -> None:
+        self._queue.put_nowait(job_id)
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        """Claim the next job under a lease, or return None after `timeout` seconds."""
+        try:
+            job_id = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._leases[job_id] = time.monotonic() + settings.REPORT_JOB_LEASE_SECONDS
+        return job_id
+
+    async def extend(self, job_id: str) -> None:
+        if job_id in self._leases:
+            self._leases[job_id] = time.monotonic() + settings.REPORT_JOB_LEASE_SECONDS
+
+    async def ack(self, job_id: str) -> None:
+        self._leases.pop(job_id, None)
+
+    async def requeue_expired(self) -> List[str]:
+        """Put claimed jobs whose lease has lapsed back on the queue."""
+        now = time.monotonic()
+        expired = [job_id for job_id, expires in self._leases.items() if expires <= now]
+        for job_id in expired:
+            del self._leases[job_id]
+            self._queue.put_nowait(job_id)
+        return expired
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobBackend:
+    """Job records as expiring JSON keys, Redis lists as the queue and processing list, leases as expiring keys."""
+
+    def __init__(self, url: str):
+        # A dedicated client without a read timeout, since BLMOVE blocks
+        self._client = aioredis.from_url(url, socket_connect_timeout=0.5)
+        self._unleased: set = set()
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        await self._client.set(
+            JOB_KEY.format(job_id=job["id"]), json.dumps(job), ex=settings.REPORT_JOB_TTL_SECONDS
+        )
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(JOB_KEY.format(job_id=job_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def push(self, job_id: str) -> None:
+        await self._client.rpush(QUEUE_KEY, job_id)
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        """Claim the next job under a lease, or return None after `timeout` seconds."""
+        item = await self._client.blmove(QUEUE_KEY, PROCESSING_KEY, int(timeout), "LEFT", "RIGHT")
+        if item is None:
+            return None
+        job_id = item.decode()
+        await self.extend(job_id)
+        return job_id
+
+    async def extend(self, job_id: str) -> None:
+        await self._client.set(LEASE_KEY.format(job_id=job_id), 1, ex=settings.REPORT_JOB_LEASE_SECONDS)
+
+    async def ack(self, job_id: str) -> None:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.lrem(PROCESSING_KEY, 1, job_id)
+            pipe.delete(LEASE_KEY.format(job_id=job_id))
+            await pipe.execute()
+
+    async def requeue_expired(self) -> List[str]:
+        """Put claimed jobs whose lease has lapsed back on the queue."""
+        job_ids = [item.decode() for item in await self._client.lrange(PROCESSING_KEY, 0, -1)]
+        async with self._client.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.exists(LEASE_KEY.format(job_id=job_id))
+            leased = await pipe.execute()
+        unleased = {job_id for job_id, exists in zip(job_ids, leased) if not exists}
+        # A job has no lease for a moment between BLMOVE and the lease SET, so only
+        # one that was also unleased on the previous sweep counts as abandoned
+        abandoned, self._unleased = unleased & self._unleased, unleased
+        requeued = []
+        for job_id in abandoned:
+            keys = [PROCESSING_KEY, QUEUE_KEY, LEASE_KEY.format(job_id=job_id)]
+            if await self._client.eval(_REQUEUE_SCRIPT, len(keys), *keys, job_id):
+                requeued.append(job_id)
+        self._unleased -= abandoned
+        return requeued
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_backend = None
+
+
+def get_job_backend():
+    """Return the configured job backend, falling back to memory when Redis isn't configured."""
+    global _backend
+    if _backend is None:
+        if settings.REPORT_JOB_BACKEND == "redis" and settings.REDIS_URL:
+            _backend = RedisJobBackend(settings.REDIS_URL)
+        else:
+            _backend = MemoryJobBackend()
+    return _backend
+
+
+async def close_job_backend() -> None:
+    """Close the job backend's connections (called on application shutdown)."""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+# ══════════════════════════════════════════
+#  RESULT STORAGE
+# ══════════════════════════════════════════
+
+def result_path(job: Dict[str, Any]) -> Path:
+    """Where a job's generated file lives on disk."""
+    extension = Path(job["filename"]).suffix
+    return Path(settings.REPORT_JOB_STORAGE_DIR) / f"{job['id']}{extension}"
+
+
+def purge_expired_results() -> None:
+    """Delete generated files older than the job TTL."""
+    directory = Path(settings.REPORT_JOB_STORAGE_DIR)
+    if not directory.is_dir():
+        return
+    cutoff = time.time() - settings.REPORT_JOB_TTL_SECONDS
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+# ══════════════════════════════════════════
+#  RENDERING (runs in worker processes)
+# ══════════════════════════════════════════
+
+def _render_report_card_zip(contexts: List[Tuple[str, Dict[str, Any]]]) -> SpooledTemporaryFile:
+    """Render a batch of report cards into a single ZIP, one PDF per student."""
+    output = SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, context in contexts:
+            archive.writestr(name, generate_report_card_pdf(context))
+    output.seek(0)
+    return output
+
+
+_RENDERERS = {
+    "report_card_pdf": generate_report_card_pdf,
+    "report_card_zip": _render_report_card_zip,
+    "attendance_pdf": generate_attendance_report_pdf,
+    "attendance_excel": generate_attendance_excel,
+    "student_list_pdf": generate_student_list_pdf,
+    "student_list_excel": generate_student_list_excel,
+    "grades_excel": generate_grades_excel,
+}
+
+
+def render_to_file(renderer: str, context: Any, path: str) -> int:
+    """Render a document straight to `path` (atomically) and return its size in bytes."""
+    output = _RENDERERS[renderer](context)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        if isinstance(output, bytes):
+            f.write(output)
+        else:
+            with output:
+                shutil.copyfileobj(output, f)
+    os.replace(partial, path)
+    return os.path.getsize(path)
+
+
+# ══════════════════════════════════════════
+#  JOB LIFECYCLE
+# ══════════════════════════════════════════
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def validate_job_request(request: ReportJobCreate, user: User) -> None:
+    """Reject requests the caller may not make or that lack required parameters."""
+    roles = KIND_ROLES[request.kind]
+    if roles is not None and user.role not in roles:
+        raise HTTPException(status_code=403, detail="Insufficient permissions for this report")
+
+    missing = [name for name in REQUIRED_PARAMS[request.kind] if getattr(request, name) is None]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing parameters for {request.kind}: {', '.join(missing)}")
+    if request.kind == "report_cards_batch" and not request.section_id and not request.class_id:
+        raise HTTPException(status_code=400, detail="Either section_id or class_id is required")
+    if request.kind in ("report_card", "report_cards_batch") and request.format != "pdf":
+        raise HTTPException(status_code=400, detail="Report cards are only available as PDF")
+    if request.kind == "grades" and request.format != "excel":
+        raise HTTPException(status_code=400, detail="Grades reports are only available as Excel")
+
+
+async def submit_report_job(request: ReportJobCreate, user: User) -> Dict[str, Any]:
+    """Validate, record and enqueue a report job."""
+    validate_job_request(request, user)
+    job = {
+        "id": uuid.uuid4().hex,
+        "kind": request.kind,
+        "params": request.model_dump(mode="json"),
+        "owner_id": str(user.id),
+        "status": "queued",
+        "attempts": 0,
+        "created_at": _now(),
+        "created_ts": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+        "filename": None,
+        "media_type": None,
+        "size": None,
+    }
+    backend = get_job_backend()
+    try:
+        await backend.save(job)
+        await backend.push(job["id"])
+    except (RedisError, OSError) as e:
+        logger.warning("Report job submission failed: %s", e)
+        raise HTTPException(status_code=503, detail="Report queue is unavailable, try again shortly")
+    return job
+
+
+async def get_report_job(job_id: str, user: User) -> Dict[str, Any]:
+    """Load a job visible to `user` (its owner, or any admin)."""
+    try:
+        job = await get_job_backend().load(job_id)
+    except (RedisError, OSError) as e:
+        logger.warning("Report job lookup failed: %s", e)
+        raise HTTPException(status_code=503, detail="Report queue is unavailable, try again shortly")
+    if job is None or (job["owner_id"] != str(user.id) and user.role != UserRole.ADMIN):
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+async def _prepare_job(db: AsyncSession, request: ReportJobCreate) -> Tuple[str, Any, str, str]:
+    """Gather a job's data; returns (renderer, context, filename, media_type)."""
+    if request.kind == "report_card":
+        card = await build_report_card(db, request.student_id, request.term_id)
+        filename = f"report_card_{card['admission_no']}_{card['term_name']}.pdf"
+        return "report_card_pdf", report_card_pdf_context(card), filename, PDF_MEDIA_TYPE
+
+    if request.kind == "report_cards_batch":
+        cards = await build_section_report_cards(
+            db, request.term_id, section_id=request.section_id, class_id=request.class_id
+        )
+        if not cards:
+            raise HTTPException(status_code=404, detail="No students found")
+        contexts = [
+            (f"report_card_{card['admission_no']}_{card['term_name']}.pdf", report_card_pdf_context(card))
+            for card in cards
+        ]
+        return "report_card_zip", contexts, f"report_cards_{cards[0]['term_name']}.zip", ZIP_MEDIA_TYPE
+
+    if request.kind == "attendance":
+        data = await build_attendance_report(db, request.section_id, request.start_date, request.end_date)
+        if request.format == "excel":
+            return "attendance_excel", data, f"attendance_report_{data['section_name']}.xlsx", EXCEL_MEDIA_TYPE
+        return "attendance_pdf", data, f"attendance_report_{data['section_name']}.pdf", PDF_MEDIA_TYPE
+
+    if request.kind == "student_list":
+        result = await db.execute(student_directory_query(request.status, request.section_id))
+        data = {"title": "Student Directory", "students": [directory_row(row) for row in result.all()]}
+        if request.format == "excel":
+            return "student_list_excel", data, "student_list.xlsx", EXCEL_MEDIA_TYPE
+        return "student_list_pdf", data, "student_list.pdf", PDF_MEDIA_TYPE
+
+    matrix = await build_section_grades_matrix(db, request.section_id, request.term_id)
+    data = {"title": "Grades Report", "term_name": matrix["term_name"], "rows": matrix["rows"]}
+    return "grades_excel", data, f"grades_{matrix['term_name']}.xlsx", EXCEL_MEDIA_TYPE
+
+
+async def _renew_lease(backend, job_id: str) -> None:
+    """Keep a running job's lease alive; cancelled when the job finishes."""
+    while True:
+        await asyncio.sleep(settings.REPORT_JOB_LEASE_SECONDS / 3)
+        try:
+            await backend.extend(job_id)
+        except (RedisError, OSError) as e:
+            logger.warning("Report job %s lease renewal failed: %s", job_id, e)
+
+
+async def _run_job(job_id: str) -> None:
+    backend = get_job_backend()
+    job = await backend.load(job_id)
+    # "running" here means an earlier run was abandoned and the job was requeued
+    if job is None or job["status"] not in ("queued", "running"):
+        await backend.ack(job_id)
+        return
+
+    attempts = job.get("attempts", 0) + 1
+    if attempts > settings.REPORT_JOB_MAX_ATTEMPTS:
+        job.update(status="failed", finished_at=_now(), error="Report generation was interrupted too many times")
+        await backend.save(job)
+        await backend.ack(job_id)
+        return
+
+    job.update(status="running", started_at=_now(), attempts=attempts)
+    await backend.save(job)
+    heartbeat = asyncio.create_task(_renew_lease(backend, job_id))
+    try:
+        session_factory = await get_read_sessionmaker()
+        async with session_factory() as db:
+            renderer, context, filename, media_type = await _prepare_job(db, ReportJobCreate(**job["params"]))
+        job.update(filename=filename, media_type=media_type)
+        job["size"] = await render_in_pool(
+            render_to_file, renderer, context, str(result_path(job)), renderer=renderer,
+        )
+        job.update(status="completed", finished_at=_now())
+    except HTTPException as e:
+        job.update(status="failed", finished_at=_now(), error=str(e.detail))
+    except Exception:
+        logger.exception("Report job %s failed", job_id)
+        job.update(status="failed", finished_at=_now(), error="Report generation failed")
+    finally:
+        heartbeat.cancel()
+    # Acknowledged only once the outcome is recorded; if this process dies first, the lease lapses and it reruns
+    await backend.save(job)
+    await backend.ack(job_id)
+
+
+async def run_report_worker() -> None:
+    """Background task: pull queued jobs and run up to REPORT_JOB_CONCURRENCY at a time."""
+    backend = get_job_backend()
+    slots = asyncio.Semaphore(settings.REPORT_JOB_CONCURRENCY)
+    running: set = set()
+    last_purge = last_sweep = 0.0
+
+    def finished(task: asyncio.Task) -> None:
+        running.discard(task)
+        slots.release()
+
+    while True:
+        if time.time() - last_purge > 600:
+            await asyncio.to_thread(purge_expired_results)
+            last_purge = time.time()
+        if time.time() - last_sweep > settings.REPORT_JOB_LEASE_SECONDS:
+            try:
+                for job_id in await backend.requeue_expired():
+                    logger.warning("Report job %s lost its worker; requeued", job_id)
+            except (RedisError, OSError) as e:
+                logger.warning("Report job lease sweep failed: %s", e)
+            last_sweep = time.time()
+
+        # Only take a job off the queue when there is a free slot, leaving the rest for other replicas
+        await slots.acquire()
+        try:
+            job_id = await backend.pop(timeout=5)
+        except (RedisError, OSError) as e:
+            slots.release()
+            logger.warning("Report queue unavailable: %s", e)
+            await asyncio.sleep(5)
+            continue
+        except BaseException:
+            slots.release()
+            raise
+        if job_id is None:
+            slots.release()
+            continue
+
+        task = asyncio.create_task(_run_job(job_id))
+        running.add(task)
+        task.add_done_callback(finished)
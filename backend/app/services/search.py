@@ -0,0 +1,83 @@
+"""
+EduNexus School — People Search
+Trigram-ranked search across students, teachers and guardians in one query.
+Expressions here must match the pg_trgm GIN indexes declared on the models.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import String, cast, func, literal, literal_column, null, or_, select, union, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.student import Student
+from app.models.teacher import Teacher
+from app.models.guardian import Guardian
+
+SEARCH_KINDS = ("student", "teacher", "guardian")
+
+
+def full_name_expr():
+    """`first_name || ' ' || last_name`, rendered literally so it matches ix_users_full_name_trgm."""
+    return User.first_name.concat(literal_column("' '")).concat(User.last_name)
+
+
+def name_search_condition(term: str, *extra_columns: Any):
+    """Substring match on full name (and any extra columns) that the trigram indexes can serve."""
+    pattern = f"%{term}%"
+    return or_(full_name_expr().ilike(pattern), *(col.ilike(pattern) for col in extra_columns))
+
+
+def _people_query(kind: str, model: Any, code_col: Optional[Any], term: str):
+    name = full_name_expr()
+    pattern = f"%{term}%"
+
+    scores = [func.similarity(name, term), func.similarity(User.email, term)]
+    # `%` binds tighter than `||`, so the concatenation needs its own parentheses
+    candidates = (
+        select(model.id)
+        .join(User, model.user_id == User.id)
+        .where(or_(name.ilike(pattern), name.self_group().op("%")(term), User.email.ilike(pattern)))
+    )
+    if code_col is not None:
+        scores.append(func.similarity(code_col, term))
+        # A separate branch rather than one OR across both tables, so each side can use its own index
+        candidates = union(candidates, select(model.id).where(or_(code_col.ilike(pattern), code_col.op("%")(term))))
+
+    return (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            User.id.label("user_id"),
+            name.label("name"),
+            User.email.label("email"),
+            (code_col if code_col is not None else cast(null(), String)).label("code"),
+            func.greatest(*scores).label("score"),
+        )
+        .join(User, model.user_id == User.id)
+        .where(model.id.in_(candidates))
+    )
+
+
+async def search_people(
+    db: AsyncSession,
+    term: str,
+    kinds: Sequence[str] = SEARCH_KINDS,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """Search students, teachers and guardians by name, email or code, best matches first."""
+    queries = []
+    if "student" in kinds:
+        queries.append(_people_query("student", Student, Student.admission_no, term))
+    if "teacher" in kinds:
+        queries.append(_people_query("teacher", Teacher, Teacher.employee_id, term))
+    if "guardian" in kinds:
+        queries.append(_people_query("guardian", Guardian, None, term))
+    if not queries:
+        return []
+
+    combined = union_all(*queries).subquery()
+    result = await db.execute(
+        select(combined).order_by(combined.c.score.desc(), combined.c.name).limit(limit)
+    )
+    return [dict(row._mapping) for row in result.all()]
@@ -0,0 +1,241 @@
+"""
+EduNexus School — Authenticated Principal Cache
+Caches the user row behind an access token (keyed by the token's `jti`) so
+authenticated requests can skip the per-request user lookup.
+
+Tier 1 is an in-process TTL/LRU map; tier 2 lives in Redis and is on
+whenever REDIS_URL is set (AUTH_CACHE_REDIS). With tier 2, invalidations
+reach every worker: each user has a generation counter in Redis, entries
+remember the generation they were cached under and local hits are checked
+against it. Without it, an invalidation only clears the worker that made the
+change, so only turn it off for single-process deployments.
+
+Entries are stored as plain column values, minus the password hash, and
+turned back into a session-attached User on every hit, so ORM instances are
+never shared between requests. Code that needs the hash loads it itself.
+"""
+
+import enum
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import DateTime, Enum as SAEnum
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import get_settings
+from app.models.user import User
+from app.utils.cache import get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_KEY = "auth:principal:{jti}"
+USER_TOKENS_KEY = "auth:user-tokens:{user_id}"
+USER_GENERATION_KEY = "auth:user-gen:{user_id}"
+
+# Never written to Redis; left unloaded on cached principals
+_UNCACHED_COLUMNS = {"password_hash"}
+
+
+class PrincipalCache:
+    """Bounded in-process LRU of {jti: (expires_at, user_id, data)}."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+
+    def get(self, jti: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(jti)
+        if entry is None:
+            return None
+        expires_at, _, data = entry
+        if expires_at <= time.monotonic():
+            self._remove(jti)
+            return None
+        self._entries.move_to_end(jti)
+        return data
+
+    def set(self, jti: str, user_id: str, data: Dict[str, Any], ttl_seconds: float) -> None:
+        self._remove(jti)
+        self._entries[jti] = (time.monotonic() + ttl_seconds, user_id, data)
+        self._by_user.setdefault(user_id, set()).add(jti)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str) -> None:
+        for jti in list(self._by_user.get(user_id, ())):
+            self._remove(jti)
+
+    def _remove(self, jti: str) -> None:
+        entry = self._entries.pop(jti, None)
+        if entry is None:
+            return
+        tokens = self._by_user.get(entry[1])
+        if tokens is not None:
+            tokens.discard(jti)
+            if not tokens:
+                del self._by_user[entry[1]]
+
+
+_local_cache = PrincipalCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+# ── Serialization ──
+def _serialize_user(user: User) -> Dict[str, Any]:
+    """Snapshot the cacheable columns of a User as JSON-safe values."""
+    data = {}
+    for column in User.__table__.columns:
+        if column.key in _UNCACHED_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        if isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.value
+        data[column.key] = value
+    return data
+
+
+def _deserialize_user(data: Dict[str, Any]) -> User:
+    """Rebuild a transient User from a column snapshot."""
+    values = {}
+    for column in User.__table__.columns:
+        if column.key in _UNCACHED_COLUMNS:
+            continue
+        value = data.get(column.key)
+        if value is not None:
+            if isinstance(column.type, PGUUID):
+                value = UUID(value)
+            elif isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, SAEnum):
+                value = column.type.enum_class(value)
+        values[column.key] = value
+    return User(**values)
+
+
+# ── Generations ──
+async def _user_generation(client, user_id: str) -> int:
+    return int(await client.get(USER_GENERATION_KEY.format(user_id=user_id)) or 0)
+
+
+def _redis_tier():
+    """The Redis client when the shared tier is enabled, else None."""
+    return get_redis() if settings.AUTH_CACHE_REDIS else None
+
+
+# ── Public API ──
+async def principal_generation(user_id: str) -> Optional[int]:
+    """
+    The user's current generation, to be read *before* loading the user row
+    and passed to cache_principal. None when the Redis tier is off or can't be read.
+    """
+    client = _redis_tier()
+    if client is None:
+        return None
+    try:
+        return await _user_generation(client, user_id)
+    except (RedisError, OSError) as e:
+        logger.warning("Principal generation read failed: %s", e)
+        return None
+
+
+async def get_cached_principal(db: AsyncSession, jti: str) -> Optional[User]:
+    """
+    Return the cached User for a token, attached to `db` as a persistent
+    instance (no query is issued), or None on a miss.
+    """
+    data = _local_cache.get(jti)
+    client = _redis_tier()
+
+    if client is not None:
+        try:
+            if data is None:
+                raw = await client.get(PRINCIPAL_KEY.format(jti=jti))
+                if raw is not None:
+                    data = json.loads(raw)
+                    ttl = await client.ttl(PRINCIPAL_KEY.format(jti=jti))
+                    _local_cache.set(jti, data["id"], data, min(max(ttl, 1), settings.AUTH_CACHE_TTL_SECONDS))
+            # Local entries may predate an invalidation made on another worker
+            if data is not None and await _user_generation(client, data["id"]) != data.get("_generation", 0):
+                _local_cache.invalidate_user(data["id"])
+                data = None
+        except (RedisError, OSError) as e:
+            logger.warning("Principal cache read failed: %s", e)
+            data = None  # can't confirm the entry is current; load the user instead
+
+    if data is None:
+        return None
+
+    user = _deserialize_user(data)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+async def cache_principal(jti: str, user: User, token_exp: float, generation: Optional[int]) -> None:
+    """
+    Cache a freshly loaded user for the remaining lifetime of the token (capped by the TTL).
+    `generation` comes from principal_generation() before the load, so a row read just
+    before an invalidation is never stored under the generation that follows it.
+    """
+    ttl = min(settings.AUTH_CACHE_TTL_SECONDS, token_exp - time.time())
+    if ttl <= 0:
+        return
+
+    data = _serialize_user(user)
+    client = _redis_tier()
+    if client is None:
+        _local_cache.set(jti, data["id"], data, ttl)
+        return
+
+    if generation is None:
+        return  # Redis was unreachable before the load; nothing safe to cache under
+
+    user_tokens = USER_TOKENS_KEY.format(user_id=data["id"])
+    data["_generation"] = generation
+    try:
+        _local_cache.set(jti, data["id"], data, ttl)
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(PRINCIPAL_KEY.format(jti=jti), json.dumps(data), ex=int(ttl) or 1)
+            pipe.sadd(user_tokens, jti)
+            pipe.expire(user_tokens, settings.AUTH_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning("Principal cache write failed: %s", e)
+
+
+async def invalidate_user_principals(user_id: UUID) -> None:
+    """
+    Drop every cached principal for a user (profile, status or password changed).
+    Call after the change has committed, or a concurrent request can re-cache the old row.
+    """
+    _local_cache.invalidate_user(str(user_id))
+
+    client = _redis_tier()
+    if client is None:
+        return
+    user_tokens = USER_TOKENS_KEY.format(user_id=user_id)
+    generation = USER_GENERATION_KEY.format(user_id=user_id)
+    try:
+        jtis = await client.smembers(user_tokens)
+        keys = [PRINCIPAL_KEY.format(jti=j.decode() if isinstance(j, bytes) else j) for j in jtis]
+        async with client.pipeline(transaction=False) as pipe:
+            # Outlives every entry cached under the old generation
+            pipe.incr(generation)
+            pipe.expire(generation, settings.AUTH_CACHE_TTL_SECONDS * 2)
+            pipe.delete(user_tokens, *keys)
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning("Principal cache invalidation failed: %s", e)
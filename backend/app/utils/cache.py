@@ -0,0 +1,74 @@
+"""
+EduNexus School — Redis Cache Helpers
+Thin JSON get/set/delete wrappers around the Redis instance at settings.REDIS_URL.
+Cache failures are logged and treated as misses so Redis is never a hard dependency.
+"""
+
+import json
+import logging
+from typing import Any, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """Return the shared async Redis client, or None when REDIS_URL is not configured."""
+    global _client
+    if _client is None and settings.REDIS_URL:
+        _client = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis connection pool (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Fetch and decode a JSON value, returning None on a miss or Redis error."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = await client.get(key)
+    except (RedisError, OSError) as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def cache_set_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """Store a JSON-serialisable value with an expiry."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, json.dumps(value, default=str), ex=ttl_seconds)
+    except (RedisError, OSError) as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete one or more keys."""
+    client = get_redis()
+    if client is None or not keys:
+        return
+    try:
+        await client.delete(*keys)
+    except (RedisError, OSError) as e:
+        logger.warning("Cache delete failed for %s: %s", keys, e)
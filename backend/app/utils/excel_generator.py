@@ -1,16 +1,21 @@
 """
 EduNexus School — Excel Report Generator
-Uses openpyxl to generate styled .xlsx exports.
+Uses openpyxl in write-only mode to generate styled .xlsx exports.
+
+Rows are streamed straight into the worksheet XML with a small set of
+workbook-level named styles, column widths are estimated from a sample of
+the first rows, and the finished file is spooled to disk once it grows past
+a few megabytes — so memory and CPU stay roughly linear in row count.
 """
 
-import io
+import itertools
 from datetime import datetime
-from typing import Any, Dict, List
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from openpyxl import Workbook
-from openpyxl.styles import (
-    Alignment, Border, Font, PatternFill, Side, numbers
-)
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
 from openpyxl.utils import get_column_letter
 
 
@@ -21,58 +26,162 @@ DARK_BG = "1A1A2E"
 LIGHT_BG = "F8F9FA"
 WHITE = "FFFFFF"
 
+# ── Output tuning ──
+WIDTH_SAMPLE_ROWS = 200  # rows inspected to size columns
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # keep smaller files in memory, spill larger ones to disk
+TITLE_SPAN = 8  # title / subtitle merge across A:H
+
+Cells = List[Tuple[Any, str]]
+
+
+# ── Named styles ──
+def _font(bold: bool = False, size: int = 10, color: Optional[str] = None, italic: bool = False) -> Font:
+    return Font(name="Segoe UI", bold=bold, size=size, color=color, italic=italic)
+
+
+_CENTER = Alignment(horizontal="center")
+
+# Data styles get an "_alt" twin with the zebra-stripe fill of the report
+_DATA_STYLES: Dict[str, Dict[str, Any]] = {
+    "data": {"font": _font()},
+    "data_bold": {"font": _font(bold=True)},
+    "data_center": {"font": _font(), "alignment": _CENTER},
+    "data_center_bold": {"font": _font(bold=True), "alignment": _CENTER},
+    "present": {"font": _font(color="2E7D32"), "alignment": _CENTER},
+    "absent": {"font": _font(color="C62828"), "alignment": _CENTER},
+    "late": {"font": _font(color="E65100"), "alignment": _CENTER},
+    "excused": {"font": _font(color="1565C0"), "alignment": _CENTER},
+    "percent": {"font": _font(bold=True), "alignment": _CENTER, "number_format": "0.0%"},
+}
+
+
+def _register_styles(wb: Workbook, header_color: str, alt_color: Optional[str]) -> None:
+    """Register every style used by a report once, so cells only carry a style name."""
+    header_border = Border(bottom=Side(style="thin", color="CCCCCC"))
+    styles = [
+        NamedStyle(
+            name="title",
+            font=Font(name="Segoe UI", bold=True, size=16, color=PURPLE),
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        NamedStyle(
+            name="subtitle",
+            font=_font(color="666666"),
+            alignment=Alignment(horizontal="center"),
+        ),
+        NamedStyle(
+            name="header",
+            font=Font(name="Segoe UI", bold=True, color=WHITE, size=10),
+            fill=PatternFill(start_color=header_color, end_color=header_color, fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=header_border,
+        ),
+        NamedStyle(name="footer", font=_font(size=8, color="999999", italic=True)),
+    ]
+    alt = {"fill": PatternFill(start_color=alt_color, end_color=alt_color, fill_type="solid")} if alt_color else {}
+    for name, spec in _DATA_STYLES.items():
+        styles.append(NamedStyle(name=name, **spec))
+        styles.append(NamedStyle(name=f"{name}_alt", **spec, **alt))
+    for style in styles:
+        wb.add_named_style(style)
+
+
+# ── Sheet writing ──
+def _cell(ws, value: Any, style: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def _column_widths(rows: Sequence[Sequence[Any]], min_width: int = 10, max_width: int = 40) -> List[int]:
+    """Estimate column widths from the header plus a sample of data rows."""
+    widths: List[int] = []
+    for values in rows:
+        for col, value in enumerate(values):
+            length = len(str(value if value is not None else ""))
+            if col == len(widths):
+                widths.append(length)
+            elif length > widths[col]:
+                widths[col] = length
+    return [min(max(w + 2, min_width), max_width) for w in widths]
+
+
+def _write_report(
+    sheet_title: str,
+    title: str,
+    subtitle: str,
+    headers: List[str],
+    rows: Iterable[Any],
+    row_cells: Callable[[int, Any], Cells],
+    header_color: str = PURPLE,
+    alt_color: Optional[str] = None,
+    footer: Optional[str] = None,
+) -> SpooledTemporaryFile:
+    """
+    Stream a titled, styled table into a write-only workbook.
 
-def _style_header_row(ws, row: int, col_count: int, color: str = PURPLE):
-    """Apply branded header styling to a row."""
-    header_fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-    header_font = Font(name="Segoe UI", bold=True, color=WHITE, size=10)
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    thin_border = Border(
-        bottom=Side(style="thin", color="CCCCCC"),
-    )
+    `row_cells(idx, row)` maps each input row to [(value, style_name), ...];
+    on even rows the "_alt" variant of each style is used.
+    """
+    wb = Workbook(write_only=True)
+    _register_styles(wb, header_color, alt_color)
+    ws = wb.create_sheet(sheet_title)
 
-    for col in range(1, col_count + 1):
-        cell = ws.cell(row=row, column=col)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = thin_border
-
-
-def _add_title_block(ws, title: str, subtitle: str = ""):
-    """Add a title block at the top of the worksheet."""
-    ws.merge_cells("A1:H1")
-    title_cell = ws["A1"]
-    title_cell.value = f"🏫 EduNexus School — {title}"
-    title_cell.font = Font(name="Segoe UI", bold=True, size=16, color=PURPLE)
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
+    def styled(idx: int, row: Any) -> Cells:
+        cells = row_cells(idx, row)
+        if idx % 2 == 0:
+            cells = [(value, f"{style}_alt") for value, style in cells]
+        return cells
+
+    # Column widths must be set before the first row is written, so size them from a sample
+    numbered = enumerate(rows, 1)
+    sample = [(idx, styled(idx, row)) for idx, row in itertools.islice(numbered, WIDTH_SAMPLE_ROWS)]
+    widths = _column_widths([headers] + [[value for value, _ in cells] for _, cells in sample])
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    # Title block
+    title_span = f"A1:{get_column_letter(TITLE_SPAN)}1"
+    ws.merged_cells.add(title_span)
     ws.row_dimensions[1].height = 35
-
+    ws.append([_cell(ws, f"🏫 EduNexus School — {title}", "title")])
     if subtitle:
-        ws.merge_cells("A2:H2")
-        sub_cell = ws["A2"]
-        sub_cell.value = subtitle
-        sub_cell.font = Font(name="Segoe UI", size=10, color="666666")
-        sub_cell.alignment = Alignment(horizontal="center")
+        ws.merged_cells.add(f"A2:{get_column_letter(TITLE_SPAN)}2")
         ws.row_dimensions[2].height = 20
-        return 4  # Data starts at row 4
-    return 3  # Data starts at row 3
+        ws.append([_cell(ws, subtitle, "subtitle")])
+    ws.append([])
 
+    ws.append([_cell(ws, header, "header") for header in headers])
 
-def _auto_width(ws, min_width: int = 10, max_width: int = 40):
-    """Auto-fit column widths based on content."""
-    for col_cells in ws.columns:
-        max_len = max(len(str(cell.value or "")) for cell in col_cells)
-        adjusted = min(max(max_len + 2, min_width), max_width)
-        col_letter = get_column_letter(col_cells[0].column)
-        ws.column_dimensions[col_letter].width = adjusted
+    last_idx = 0
+    remaining = ((idx, styled(idx, row)) for idx, row in numbered)
+    for last_idx, cells in itertools.chain(sample, remaining):
+        ws.append([_cell(ws, value, style) for value, style in cells])
+
+    if footer:
+        ws.append([])
+        ws.append([_cell(ws, footer, "footer")])
+
+    output = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+def iter_spooled_file(output: SpooledTemporaryFile, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield a generated file in chunks (for StreamingResponse), closing it when done."""
+    try:
+        while chunk := output.read(chunk_size):
+            yield chunk
+    finally:
+        output.close()
 
 
 # ══════════════════════════════════════════════════════════
 #  ATTENDANCE REPORT EXCEL
 # ══════════════════════════════════════════════════════════
 
-def generate_attendance_excel(data: Dict[str, Any]) -> bytes:
+def generate_attendance_excel(data: Dict[str, Any]) -> SpooledTemporaryFile:
     """
     Generate an attendance report Excel file.
     
@@ -81,165 +190,102 @@ def generate_attendance_excel(data: Dict[str, Any]) -> bytes:
       - start_date: str
       - end_date: str
       - section_name: str
-      - rows: list of dicts with student_name, admission_no, present, absent, late, excused, total, percentage
+      - rows: iterable of dicts with student_name, admission_no, present, absent, late, excused, total, percentage
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Attendance Report"
-
-    subtitle = f"Period: {data.get('start_date', '')} to {data.get('end_date', '')} | Section: {data.get('section_name', '')}"
-    start_row = _add_title_block(ws, data.get("title", "Attendance Report"), subtitle)
-
-    # Headers
-    headers = ["#", "Student Name", "Admission No", "Present", "Absent", "Late", "Excused", "Total", "Attendance %"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=start_row, column=col, value=header)
-    _style_header_row(ws, start_row, len(headers), TEAL)
-
-    # Data rows
-    data_font = Font(name="Segoe UI", size=10)
-    alt_fill = PatternFill(start_color="F0FFF0", end_color="F0FFF0", fill_type="solid")
-    center_align = Alignment(horizontal="center")
-
-    for idx, row in enumerate(data.get("rows", []), 1):
-        r = start_row + idx
-        ws.cell(row=r, column=1, value=idx).font = data_font
-        ws.cell(row=r, column=2, value=row["student_name"]).font = Font(name="Segoe UI", bold=True, size=10)
-        ws.cell(row=r, column=3, value=row["admission_no"]).font = data_font
-        ws.cell(row=r, column=4, value=row["present"]).font = Font(name="Segoe UI", size=10, color="2E7D32")
-        ws.cell(row=r, column=5, value=row["absent"]).font = Font(name="Segoe UI", size=10, color="C62828")
-        ws.cell(row=r, column=6, value=row["late"]).font = Font(name="Segoe UI", size=10, color="E65100")
-        ws.cell(row=r, column=7, value=row["excused"]).font = Font(name="Segoe UI", size=10, color="1565C0")
-        ws.cell(row=r, column=8, value=row["total"]).font = data_font
-        pct_cell = ws.cell(row=r, column=9, value=row["percentage"] / 100)
-        pct_cell.number_format = "0.0%"
-        pct_cell.font = Font(name="Segoe UI", bold=True, size=10)
-
-        for col in range(1, 10):
-            ws.cell(row=r, column=col).alignment = center_align
-            if idx % 2 == 0:
-                ws.cell(row=r, column=col).fill = alt_fill
-
-    # Footer
-    footer_row = start_row + len(data.get("rows", [])) + 2
-    ws.cell(row=footer_row, column=1, value=f"Generated: {datetime.utcnow().strftime('%B %d, %Y')}").font = Font(
-        name="Segoe UI", size=8, color="999999", italic=True
+    def row_cells(idx: int, row: Dict[str, Any]) -> Cells:
+        return [
+            (idx, "data_center"),
+            (row["student_name"], "data_center_bold"),
+            (row["admission_no"], "data_center"),
+            (row["present"], "present"),
+            (row["absent"], "absent"),
+            (row["late"], "late"),
+            (row["excused"], "excused"),
+            (row["total"], "data_center"),
+            (row["percentage"] / 100, "percent"),
+        ]
+
+    return _write_report(
+        sheet_title="Attendance Report",
+        title=data.get("title", "Attendance Report"),
+        subtitle=f"Period: {data.get('start_date', '')} to {data.get('end_date', '')} | Section: {data.get('section_name', '')}",
+        headers=["#", "Student Name", "Admission No", "Present", "Absent", "Late", "Excused", "Total", "Attendance %"],
+        rows=data.get("rows", []),
+        row_cells=row_cells,
+        header_color=TEAL,
+        alt_color="F0FFF0",
+        footer=f"Generated: {datetime.utcnow().strftime('%B %d, %Y')}",
     )
 
-    _auto_width(ws)
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
-
 
 # ══════════════════════════════════════════════════════════
 #  STUDENT LIST EXCEL
 # ══════════════════════════════════════════════════════════
 
-def generate_student_list_excel(data: Dict[str, Any]) -> bytes:
+def generate_student_list_excel(data: Dict[str, Any]) -> SpooledTemporaryFile:
     """
     Generate a student list Excel file.
     
     data expects:
       - title: str
-      - students: list of dicts with name, admission_no, gender, status, email, enrollment_date
+      - students: iterable of dicts with name, admission_no, gender, status, email, enrollment_date
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Student List"
-
-    start_row = _add_title_block(ws, data.get("title", "Student List"))
-
-    headers = ["#", "Full Name", "Admission No", "Gender", "Status", "Email", "Enrollment Date"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=start_row, column=col, value=header)
-    _style_header_row(ws, start_row, len(headers))
-
-    data_font = Font(name="Segoe UI", size=10)
-    alt_fill = PatternFill(start_color=LIGHT_BG, end_color=LIGHT_BG, fill_type="solid")
-
-    for idx, student in enumerate(data.get("students", []), 1):
-        r = start_row + idx
-        ws.cell(row=r, column=1, value=idx).font = data_font
-        ws.cell(row=r, column=2, value=student["name"]).font = Font(name="Segoe UI", bold=True, size=10)
-        ws.cell(row=r, column=3, value=student["admission_no"]).font = data_font
-        ws.cell(row=r, column=4, value=student["gender"]).font = data_font
-        ws.cell(row=r, column=5, value=student["status"]).font = data_font
-        ws.cell(row=r, column=6, value=student["email"]).font = data_font
-        ws.cell(row=r, column=7, value=student["enrollment_date"]).font = data_font
-
-        if idx % 2 == 0:
-            for col in range(1, 8):
-                ws.cell(row=r, column=col).fill = alt_fill
-
-    _auto_width(ws)
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
+    def row_cells(idx: int, student: Dict[str, Any]) -> Cells:
+        return [
+            (idx, "data"),
+            (student["name"], "data_bold"),
+            (student["admission_no"], "data"),
+            (student["gender"], "data"),
+            (student["status"], "data"),
+            (student["email"], "data"),
+            (student["enrollment_date"], "data"),
+        ]
+
+    return _write_report(
+        sheet_title="Student List",
+        title=data.get("title", "Student List"),
+        subtitle="",
+        headers=["#", "Full Name", "Admission No", "Gender", "Status", "Email", "Enrollment Date"],
+        rows=data.get("students", []),
+        row_cells=row_cells,
+        alt_color=LIGHT_BG,
+    )
 
 
 # ══════════════════════════════════════════════════════════
 #  GRADES REPORT EXCEL
 # ══════════════════════════════════════════════════════════
 
-def generate_grades_excel(data: Dict[str, Any]) -> bytes:
+def generate_grades_excel(data: Dict[str, Any]) -> SpooledTemporaryFile:
     """
     Generate a grades report Excel file.
     
     data expects:
       - title: str
       - term_name: str
-      - rows: list of dicts with student_name, admission_no, subjects (list of {name, score, grade})
+      - rows: iterable of dicts with student_name, admission_no, subjects (list of {name, score, grade})
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Grades Report"
-
-    subtitle = f"Term: {data.get('term_name', '')}"
-    start_row = _add_title_block(ws, data.get("title", "Grades Report"), subtitle)
-
-    # Determine subject columns from first row
-    subject_names = []
-    if data.get("rows"):
-        subject_names = [s["name"] for s in data["rows"][0].get("subjects", [])]
-
-    headers = ["#", "Student Name", "Admission No"] + subject_names + ["Average", "Grade"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=start_row, column=col, value=header)
-    _style_header_row(ws, start_row, len(headers))
-
-    data_font = Font(name="Segoe UI", size=10)
-    center_align = Alignment(horizontal="center")
-
-    for idx, row in enumerate(data.get("rows", []), 1):
-        r = start_row + idx
-        ws.cell(row=r, column=1, value=idx).font = data_font
-        ws.cell(row=r, column=2, value=row["student_name"]).font = Font(name="Segoe UI", bold=True, size=10)
-        ws.cell(row=r, column=3, value=row["admission_no"]).font = data_font
-
-        scores = []
-        for s_idx, subj in enumerate(row.get("subjects", []), 4):
-            score = subj.get("score", 0)
-            cell = ws.cell(row=r, column=s_idx, value=score)
-            cell.font = data_font
-            cell.alignment = center_align
-            scores.append(score)
-
-        base_col = 4 + len(subject_names)
+    # Subject columns come from the first row
+    rows = iter(data.get("rows", []))
+    first = next(rows, None)
+    subject_names = [s["name"] for s in first.get("subjects", [])] if first else []
+    if first is not None:
+        rows = itertools.chain([first], rows)
+
+    def row_cells(idx: int, row: Dict[str, Any]) -> Cells:
+        scores = [subj.get("score", 0) for subj in row.get("subjects", [])]
         avg = sum(scores) / len(scores) if scores else 0
-        ws.cell(row=r, column=base_col, value=round(avg, 1)).font = Font(name="Segoe UI", bold=True, size=10)
-        ws.cell(row=r, column=base_col, value=round(avg, 1)).alignment = center_align
-
-        grade = row.get("overall_grade", "")
-        ws.cell(row=r, column=base_col + 1, value=grade).font = Font(name="Segoe UI", bold=True, size=10)
-
-    _auto_width(ws)
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
+        return (
+            [(idx, "data"), (row["student_name"], "data_bold"), (row["admission_no"], "data")]
+            + [(score, "data_center") for score in scores]
+            + [(round(avg, 1), "data_center_bold"), (row.get("overall_grade", ""), "data_bold")]
+        )
+
+    return _write_report(
+        sheet_title="Grades Report",
+        title=data.get("title", "Grades Report"),
+        subtitle=f"Term: {data.get('term_name', '')}",
+        headers=["#", "Student Name", "Admission No"] + subject_names + ["Average", "Grade"],
+        rows=rows,
+        row_cells=row_cells,
+    )
@@ -1,13 +1,39 @@
 """
 EduNexus School — Firebase Admin SDK Initialization and Token Verification.
+
+ID tokens are verified against Google's published signing certificates,
+which are fetched asynchronously and kept warm by a background task, so a
+login never blocks the event loop on a certificate download. Decoded
+tokens are cached briefly by token hash.
 """
+import asyncio
 import base64
+import hashlib
 import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
 import firebase_admin
-from firebase_admin import credentials, auth
+import httpx
+import jwt
+from cryptography.x509 import load_pem_x509_certificate
+from firebase_admin import credentials
 from app.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_public_keys: Dict[str, Any] = {}
+_keys_expire_at: float = 0.0
+_keys_fetched_at: float = 0.0
+_UNKNOWN_KID_REFRESH_INTERVAL = 60.0
+_keys_lock = asyncio.Lock()
+_token_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+_TOKEN_CACHE_MAX_ENTRIES = 10000
+
 
 def init_firebase():
     """Initialize Firebase Admin SDK."""
@@ -23,9 +49,102 @@ def init_firebase():
         else:
             firebase_admin.initialize_app(options={"projectId": settings.FIREBASE_PROJECT_ID})
 
-def verify_firebase_token(id_token: str) -> dict:
+
+# ── Signing keys ──
+async def refresh_public_keys() -> float:
+    """
+    Download the current signing certificates from FIREBASE_CERTS_URL.
+    Returns the number of seconds they may be cached for (from Cache-Control).
+    """
+    global _public_keys, _keys_expire_at, _keys_fetched_at
+    async with httpx.AsyncClient(timeout=10) as client:
+        response = await client.get(settings.FIREBASE_CERTS_URL)
+        response.raise_for_status()
+
+    keys = {
+        kid: load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+        for kid, pem in response.json().items()
+    }
+    match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+    max_age = float(match.group(1)) if match else float(settings.FIREBASE_KEY_REFRESH_SECONDS)
+
+    _public_keys = keys
+    _keys_fetched_at = time.monotonic()
+    _keys_expire_at = _keys_fetched_at + max_age
+    return max_age
+
+
+def _keys_need_refresh(kid: str) -> bool:
+    now = time.monotonic()
+    if now >= _keys_expire_at:
+        return True
+    # Unknown kids trigger at most one refetch per interval so forged headers can't hammer Google
+    return kid not in _public_keys and now - _keys_fetched_at >= _UNKNOWN_KID_REFRESH_INTERVAL
+
+
+async def _get_public_key(kid: str) -> Any:
+    """Return the public key for `kid`, refreshing the key set if it is stale or unknown."""
+    if _keys_need_refresh(kid):
+        async with _keys_lock:
+            if _keys_need_refresh(kid):
+                await refresh_public_keys()
+    key = _public_keys.get(kid)
+    if key is None:
+        raise ValueError(f"Unknown signing key id: {kid}")
+    return key
+
+
+async def keep_public_keys_warm() -> None:
+    """Background task: refresh signing keys shortly before they expire."""
+    while True:
+        try:
+            async with _keys_lock:
+                max_age = await refresh_public_keys()
+            delay = max(60.0, min(max_age * 0.9, float(settings.FIREBASE_KEY_REFRESH_SECONDS)))
+        except Exception as e:
+            logger.warning("Failed to refresh Firebase signing keys: %s", e)
+            delay = 30.0
+        await asyncio.sleep(delay)
+
+
+# ── Token verification ──
+def _decode_id_token(id_token: str, key: Any) -> dict:
+    project_id = settings.FIREBASE_PROJECT_ID
+    decoded = jwt.decode(
+        id_token,
+        key,
+        algorithms=["RS256"],
+        audience=project_id,
+        issuer=f"https://securetoken.google.com/{project_id}",
+        options={"require": ["exp", "iat", "sub"]},
+    )
+    sub = decoded.get("sub")
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+        raise ValueError("Token has an invalid subject")
+    decoded["uid"] = sub
+    return decoded
+
+
+async def verify_firebase_token(id_token: str) -> dict:
     """Verify a Firebase ID Token and return the decoded payload."""
+    cache_key = hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        expires_at, decoded = cached
+        if expires_at > time.time():
+            return dict(decoded)
+        _token_cache.pop(cache_key, None)
+
     try:
-        return auth.verify_id_token(id_token)
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        if not kid:
+            raise ValueError("Token has no key id")
+        key = await _get_public_key(kid)
+        decoded = await asyncio.to_thread(_decode_id_token, id_token, key)
     except Exception as e:
         raise ValueError(f"Invalid Firebase token: {str(e)}")
+
+    _token_cache[cache_key] = (min(decoded["exp"], time.time() + settings.FIREBASE_TOKEN_CACHE_SECONDS), decoded)
+    while len(_token_cache) > _TOKEN_CACHE_MAX_ENTRIES:
+        _token_cache.popitem(last=False)
+    return dict(decoded)
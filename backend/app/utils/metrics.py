@@ -0,0 +1,258 @@
+"""
+EduNexus School — Runtime Metrics
+A small in-process registry rendered in the Prometheus text format at
+/metrics, so load tests and scrapers can see where the service saturates
+without pulling in a client library: per-route latency histograms, requests
+in flight, connection-pool usage and checkout waits, report render times
+and the bcrypt queue.
+
+Values are per process; with several workers each one is scraped (or
+sampled) separately.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ══════════════════════════════════════════
+#  METRIC TYPES
+# ══════════════════════════════════════════
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Gauge(_Metric):
+    """A value that goes up and down; optionally read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def samples(self) -> List[str]:
+        values = self._callback() if self._callback else dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with _bucket, _sum and _count series per label set."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        lines = []
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+_registry: List[_Metric] = []
+
+
+def register(metric: _Metric) -> _Metric:
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.header())
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# ══════════════════════════════════════════
+#  APPLICATION METRICS
+# ══════════════════════════════════════════
+
+REQUEST_DURATION = register(Histogram(
+    "edunexus_http_request_duration_seconds",
+    "HTTP request latency by route template, until the response body has been sent.",
+    labels=("method", "route", "status"),
+))
+
+REQUESTS_IN_FLIGHT = register(Gauge(
+    "edunexus_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    labels=("method",),
+))
+
+RENDER_DURATION = register(Histogram(
+    "edunexus_report_render_seconds",
+    "Time to render a PDF or Excel document, including any wait for a render worker.",
+    labels=("renderer",),
+    buckets=RENDER_BUCKETS,
+))
+
+POOL_CHECKOUT_WAIT = register(Histogram(
+    "edunexus_db_pool_checkout_seconds",
+    "Time spent obtaining a database connection from the pool (waiting or connecting).",
+    buckets=POOL_WAIT_BUCKETS,
+))
+
+
+def _pool_stats() -> Dict[LabelValues, float]:
+    from app.database import pool_stats
+
+    return {(state,): value for state, value in pool_stats().items()}
+
+
+def _bcrypt_stats() -> Dict[LabelValues, float]:
+    from app.utils.security import password_executor_stats
+
+    return {(state,): value for state, value in password_executor_stats().items()}
+
+
+register(Gauge(
+    "edunexus_db_pool_connections",
+    "Database connection pool usage (size, capacity, checked_out, checked_in, overflow).",
+    labels=("state",),
+    callback=_pool_stats,
+))
+
+register(Gauge(
+    "edunexus_bcrypt_executor",
+    "bcrypt thread pool: workers, operations in flight and operations queued for a worker.",
+    labels=("state",),
+    callback=_bcrypt_stats,
+))
+
+
+class _TimedCheckout:
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """The default async pool, timing every connection checkout."""
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    """NullPool (PgBouncer mode), timing every connection open."""
+
+
+# ── Middleware ──
+class MetricsMiddleware:
+    """Records request latency per route template and the in-flight gauge."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = "500"
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method)
+            # Templates, not raw paths, so IDs don't create a series each
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.observe(time.perf_counter() - started, method, route, status)
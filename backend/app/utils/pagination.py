@@ -0,0 +1,78 @@
+"""
+EduNexus School — Pagination Helpers
+Keyset (cursor) pagination on (created_at, id) and list totals (optionally cached).
+"""
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.utils.cache import cache_get_json, cache_set_json
+
+settings = get_settings()
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor, or raise 400."""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query: Select, created_col: Any, id_col: Any, cursor: Optional[str], per_page: int) -> Select:
+    """
+    Order newest-first by (created_at, id) and seek past `cursor`.
+    Fetches one extra row so the caller can tell whether another page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return query.order_by(created_col.desc(), id_col.desc()).limit(per_page + 1)
+
+
+def split_page(rows: Sequence[Any], per_page: int, key: Callable[[Any], Tuple[datetime, UUID]]) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row and build the next cursor from the last row kept."""
+    page = list(rows[:per_page])
+    next_cursor = encode_cursor(*key(page[-1])) if len(rows) > per_page else None
+    return page, next_cursor
+
+
+async def count_total(db: AsyncSession, count_query: Select, approximate: bool = False) -> int:
+    """
+    Exact COUNT by default. With `approximate` (the `approximate_total` query
+    parameter) the count is reused for PAGINATION_COUNT_CACHE_SECONDS per
+    statement and parameter set, so paging through a large list doesn't
+    re-count, at the price of a total that can lag recent creates/deletes.
+    """
+    if not approximate:
+        return (await db.execute(count_query)).scalar() or 0
+
+    compiled = count_query.compile()
+    fingerprint = hashlib.sha1(
+        (str(compiled) + repr(sorted((k, str(v)) for k, v in compiled.params.items()))).encode("utf-8")
+    ).hexdigest()
+    cache_key = f"pagination:count:{fingerprint}"
+
+    cached = await cache_get_json(cache_key)
+    if cached is not None:
+        return cached
+
+    total = (await db.execute(count_query)).scalar() or 0
+    await cache_set_json(cache_key, total, settings.PAGINATION_COUNT_CACHE_SECONDS)
+    return total
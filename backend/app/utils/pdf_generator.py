@@ -1,30 +1,31 @@
 """
 EduNexus School — PDF Report Generator
 Uses Jinja2 templates + WeasyPrint to generate PDF documents.
+
+Templates are compiled once per process from a module-level registry (with
+a shared on-disk bytecode cache, so fresh render-pool workers skip
+compilation too), and each document's CSS is parsed once into a WeasyPrint
+stylesheet that is reused, along with a single FontConfiguration.
 """
 
-import io
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
-from jinja2 import Environment, BaseLoader
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
 
 
-def get_jinja_env() -> Environment:
-    """Return a Jinja2 environment for rendering HTML templates."""
-    return Environment(loader=BaseLoader(), autoescape=True)
+# Rules shared by every document
+BASE_CSS = """
+  * { margin: 0; padding: 0; box-sizing: border-box; }
+"""
 
 
 # ══════════════════════════════════════════════════════════
 #  REPORT CARD HTML TEMPLATE
 # ══════════════════════════════════════════════════════════
-REPORT_CARD_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-<style>
+REPORT_CARD_CSS = """
   @page { size: A4; margin: 1.5cm; }
-  * { margin: 0; padding: 0; box-sizing: border-box; }
   body {
     font-family: 'Segoe UI', 'Helvetica Neue', Arial, sans-serif;
     color: #1a1a2e;
@@ -152,7 +153,13 @@ REPORT_CARD_TEMPLATE = """
     font-size: 9pt;
     color: #666;
   }
-</style>
+"""
+
+REPORT_CARD_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
 </head>
 <body>
   <div class="header">
@@ -249,13 +256,8 @@ REPORT_CARD_TEMPLATE = """
 # ══════════════════════════════════════════════════════════
 #  ATTENDANCE REPORT HTML TEMPLATE
 # ══════════════════════════════════════════════════════════
-ATTENDANCE_REPORT_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-<style>
+ATTENDANCE_REPORT_CSS = """
   @page { size: A4 landscape; margin: 1.5cm; }
-  * { margin: 0; padding: 0; box-sizing: border-box; }
   body { font-family: 'Segoe UI', Arial, sans-serif; color: #1a1a2e; font-size: 10pt; }
   .header { text-align: center; padding: 15px 0; border-bottom: 3px solid #00BFA5; margin-bottom: 15px; }
   .header h1 { font-size: 18pt; color: #00BFA5; }
@@ -272,7 +274,13 @@ ATTENDANCE_REPORT_TEMPLATE = """
   .status-excused { color: #1565c0; font-weight: 600; }
   .summary-row { background: #e0f2f1 !important; font-weight: 700; }
   .footer { margin-top: 15px; text-align: center; font-size: 8pt; color: #999; }
-</style>
+"""
+
+ATTENDANCE_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
 </head>
 <body>
   <div class="header">
@@ -324,13 +332,8 @@ ATTENDANCE_REPORT_TEMPLATE = """
 # ══════════════════════════════════════════════════════════
 #  STUDENT LIST HTML TEMPLATE
 # ══════════════════════════════════════════════════════════
-STUDENT_LIST_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-<style>
+STUDENT_LIST_CSS = """
   @page { size: A4; margin: 1.5cm; }
-  * { margin: 0; padding: 0; box-sizing: border-box; }
   body { font-family: 'Segoe UI', Arial, sans-serif; color: #1a1a2e; font-size: 10pt; }
   .header { text-align: center; padding: 15px 0; border-bottom: 3px solid #7C4DFF; margin-bottom: 15px; }
   .header h1 { font-size: 18pt; color: #7C4DFF; }
@@ -341,7 +344,13 @@ STUDENT_LIST_TEMPLATE = """
   td { padding: 7px 10px; border-bottom: 1px solid #eee; font-size: 9pt; }
   tr:nth-child(even) { background: #fafafa; }
   .footer { margin-top: 15px; text-align: center; font-size: 8pt; color: #999; }
-</style>
+"""
+
+STUDENT_LIST_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
 </head>
 <body>
   <div class="header"><h1>🏫 EduNexus School</h1></div>
@@ -379,40 +388,87 @@ STUDENT_LIST_TEMPLATE = """
 """
 
 
-def render_html(template_str: str, context: Dict[str, Any]) -> str:
-    """Render an HTML template with Jinja2."""
-    env = get_jinja_env()
-    template = env.from_string(template_str)
-    return template.render(**context)
+# ══════════════════════════════════════════════════════════
+#  TEMPLATE REGISTRY
+# ══════════════════════════════════════════════════════════
+# name -> (Jinja template source, document CSS)
+TEMPLATES: Dict[str, tuple[str, str]] = {
+    "report_card": (REPORT_CARD_TEMPLATE, REPORT_CARD_CSS),
+    "attendance_report": (ATTENDANCE_REPORT_TEMPLATE, ATTENDANCE_REPORT_CSS),
+    "student_list": (STUDENT_LIST_TEMPLATE, STUDENT_LIST_CSS),
+}
+
+
+@lru_cache()
+def get_jinja_env() -> Environment:
+    """Return the shared Jinja2 environment holding the registered report templates."""
+    return Environment(
+        loader=DictLoader({name: source for name, (source, _) in TEMPLATES.items()}),
+        autoescape=True,
+        bytecode_cache=FileSystemBytecodeCache(pattern="edunexus-%s.cache"),
+        auto_reload=False,
+    )
+
+
+def render_html(template_name: str, context: Dict[str, Any]) -> str:
+    """Render a registered template with Jinja2 (compiled on first use, then cached)."""
+    return get_jinja_env().get_template(template_name).render(**context)
 
 
-def generate_pdf_bytes(html_content: str) -> bytes:
-    """Convert HTML to PDF bytes using WeasyPrint."""
+@lru_cache()
+def _weasyprint() -> Optional[Dict[str, Any]]:
+    """
+    Import WeasyPrint once and build its reusable state: one FontConfiguration
+    and a parsed stylesheet per registered template. None if it's unavailable.
+    """
     try:
-        from weasyprint import HTML
-        pdf = HTML(string=html_content).write_pdf()
-        return pdf
-    except ImportError:
-        # Fallback: return HTML as bytes if WeasyPrint not available
-        return html_content.encode("utf-8")
+        from weasyprint import CSS, HTML
+        from weasyprint.text.fonts import FontConfiguration
+    except (ImportError, OSError):
+        return None
+
+    font_config = FontConfiguration()
+    base = CSS(string=BASE_CSS, font_config=font_config)
+    return {
+        "HTML": HTML,
+        "font_config": font_config,
+        "stylesheets": {
+            name: [base, CSS(string=css, font_config=font_config)]
+            for name, (_, css) in TEMPLATES.items()
+        },
+    }
+
+
+def generate_pdf_bytes(template_name: str, html_content: str) -> bytes:
+    """Convert rendered HTML to PDF bytes using WeasyPrint and the template's cached stylesheets."""
+    weasy = _weasyprint()
+    if weasy is None:
+        # Fallback: return HTML (with its styles inlined) as bytes if WeasyPrint not available
+        css = BASE_CSS + TEMPLATES[template_name][1]
+        return f"<style>{css}</style>\n{html_content}".encode("utf-8")
+
+    return weasy["HTML"](string=html_content).write_pdf(
+        stylesheets=weasy["stylesheets"][template_name],
+        font_config=weasy["font_config"],
+    )
 
 
 def generate_report_card_pdf(data: Dict[str, Any]) -> bytes:
     """Generate a report card PDF for a student."""
     data["generated_at"] = datetime.utcnow().strftime("%B %d, %Y at %I:%M %p")
-    html = render_html(REPORT_CARD_TEMPLATE, data)
-    return generate_pdf_bytes(html)
+    html = render_html("report_card", data)
+    return generate_pdf_bytes("report_card", html)
 
 
 def generate_attendance_report_pdf(data: Dict[str, Any]) -> bytes:
     """Generate an attendance report PDF."""
     data["generated_at"] = datetime.utcnow().strftime("%B %d, %Y")
-    html = render_html(ATTENDANCE_REPORT_TEMPLATE, data)
-    return generate_pdf_bytes(html)
+    html = render_html("attendance_report", data)
+    return generate_pdf_bytes("attendance_report", html)
 
 
 def generate_student_list_pdf(data: Dict[str, Any]) -> bytes:
     """Generate a student list PDF."""
     data["generated_at"] = datetime.utcnow().strftime("%B %d, %Y")
-    html = render_html(STUDENT_LIST_TEMPLATE, data)
-    return generate_pdf_bytes(html)
+    html = render_html("student_list", data)
+    return generate_pdf_bytes("student_list", html)
@@ -0,0 +1,122 @@
+"""
+EduNexus School — Query Counting & Request Profiling
+Counts SQL statements and database time per request by hooking the engine's
+cursor events, reports them in a `Server-Timing` header and logs requests
+that blow through the configured query-count or latency budgets, along with
+individual slow statements.
+
+Tests can assert query budgets with `track_queries()`:
+
+    with track_queries() as stats:
+        await client.get("/api/v1/reports/grades/export", params=...)
+    assert stats.count <= 6
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements executed and time spent in the database within one scope."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.db_time = 0.0  # seconds
+
+    def record(self, elapsed: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.db_time += elapsed
+            stats = stats.parent
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect query stats for everything executed inside the block (nested scopes roll up)."""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# ── Engine hooks ──
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(elapsed)
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split())[:1000])
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Attach the counting hooks to a (sync) engine; call once at startup."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ── Middleware ──
+class QueryProfilerMiddleware:
+    """
+    Pure ASGI middleware (so streamed bodies are included in the totals).
+    Adds `Server-Timing: db;dur=…;desc="N queries", app;dur=…` when the
+    response starts and logs requests over budget once it has finished.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.count} queries", '
+                        f"app;dur={elapsed_ms:.1f}"
+                    )
+                    message.setdefault("headers", []).append((b"server-timing", timing.encode("latin-1")))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if stats.count > settings.REQUEST_QUERY_BUDGET or elapsed_ms > settings.REQUEST_LATENCY_BUDGET_MS:
+                    logger.warning(
+                        "Request over budget: %s %s — %d queries (budget %d), %.0f ms total (budget %d), %.0f ms in db",
+                        scope["method"], scope["path"],
+                        stats.count, settings.REQUEST_QUERY_BUDGET,
+                        elapsed_ms, settings.REQUEST_LATENCY_BUDGET_MS,
+                        stats.db_time * 1000,
+                    )
@@ -2,8 +2,10 @@
 EduNexus School — Security Utilities (password hashing, JWT creation/verification)
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 import uuid
 
 import jwt
@@ -27,6 +29,48 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# bcrypt is deliberately slow (~250 ms); run it on a bounded pool so it never blocks the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+_password_in_flight = 0
+
+
+async def _run_password_op(func: Callable[..., Any], *args: Any) -> Any:
+    global _password_in_flight
+    _password_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt thread pool."""
+    return await _run_password_op(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt thread pool."""
+    return await _run_password_op(verify_password, plain_password, hashed_password)
+
+
+def password_executor_stats() -> Dict[str, int]:
+    """In-flight and queued bcrypt operations (queued = waiting for a free worker)."""
+    workers = settings.PASSWORD_HASH_WORKERS
+    return {
+        "workers": workers,
+        "in_flight": _password_in_flight,
+        "queued": max(0, _password_in_flight - workers),
+    }
+
+
+def shutdown_password_executor() -> None:
+    """Stop the bcrypt pool (called on application shutdown)."""
+    _password_executor.shutdown(wait=False, cancel_futures=True)
+
+
 # ── JWT Tokens ──
 def create_access_token(
     data: Dict[str, Any],
@@ -0,0 +1,12 @@
+"""
+EduNexus School — Benchmarks & Load Tests
+Standalone scripts that drive the real application in-process (through the
+ASGI app and its connection pool) against a scratch Postgres database. Run
+them from backend/; BENCH_DATABASE_URL is required and its tables are
+dropped and recreated:
+
+    BENCH_DATABASE_URL=postgresql+asyncpg://postgres@localhost/edunexus_bench \\
+        python -m benchmarks.attendance_load --teachers 200
+
+Each script prints its own `--help`.
+"""
@@ -0,0 +1,112 @@
+"""
+EduNexus School — 8 AM Attendance Load Test
+Every teacher marks their section at once: N concurrent POST
+/api/v1/attendance/bulk requests (one per section) against the configured
+connection pool (DB_POOL_SIZE + DB_MAX_OVERFLOW, 20 + 10 by default).
+Reports latency percentiles, statements per request, pool checkout waits and
+failures (pool timeouts surface as 500s).
+
+    python -m benchmarks.attendance_load --teachers 200 --class-size 35
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import date
+
+from benchmarks.common import (
+    Stopwatch,
+    async_session_factory,
+    auth_headers,
+    bulk_insert,
+    client,
+    latency_summary,
+    print_table,
+    reset_schema,
+    seed_sections,
+    seed_students,
+    user_row,
+)
+from sqlalchemy import func, select
+
+from app.config import get_settings
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.utils.metrics import POOL_CHECKOUT_WAIT
+from app.utils.profiling import track_queries
+
+settings = get_settings()
+
+
+async def seed(teachers: int, class_size: int):
+    rng = random.Random(6)
+    async with async_session_factory() as db:
+        section_ids = await seed_sections(db, teachers)
+        await seed_students(db, section_ids, class_size, rng)
+        teacher_rows = [user_row(UserRole.TEACHER, rng) for _ in range(teachers)]
+        await bulk_insert(db, User, teacher_rows)
+        await db.commit()
+        rosters = {section_id: [] for section_id in section_ids}
+        for student_id, section_id in await db.execute(select(Student.id, Student.current_section_id)):
+            rosters[section_id].append(student_id)
+    return [(row["id"], section_id, rosters[section_id]) for row, section_id in zip(teacher_rows, section_ids)]
+
+
+async def mark(http, teacher_id: uuid.UUID, section_id: uuid.UUID, roster, day: date, rng: random.Random):
+    body = {
+        "section_id": str(section_id),
+        "date": day.isoformat(),
+        "entries": [
+            {"student_id": str(student_id), "status": rng.choice(list(AttendanceStatus)).value}
+            for student_id in roster
+        ],
+    }
+    with track_queries() as stats, Stopwatch() as watch:
+        response = await http.post("/api/v1/attendance/bulk", json=body, headers=auth_headers(teacher_id, UserRole.TEACHER))
+    return response.status_code, watch.elapsed, stats.count
+
+
+async def run_wave(http, teachers, day: date, label: str) -> None:
+    rng = random.Random(day.toordinal())
+    waits_before = POOL_CHECKOUT_WAIT._series.get((), [[], 0.0])[1]
+    with Stopwatch() as wall:
+        results = await asyncio.gather(*(
+            mark(http, teacher_id, section_id, roster, day, rng) for teacher_id, section_id, roster in teachers
+        ))
+    waits_after = POOL_CHECKOUT_WAIT._series.get((), [[], 0.0])[1]
+
+    ok = [r for r in results if r[0] == 200]
+    latency = latency_summary([r[1] for r in ok])
+    print(f"\n{label}: {len(results)} submissions in {wall.elapsed:.2f}s "
+          f"({len(results) / wall.elapsed:.1f}/s), {len(results) - len(ok)} failed")
+    print_table(
+        ["p50 ms", "p95 ms", "p99 ms", "max ms", "queries/request", "pool wait s (total)"],
+        [[latency["p50"], latency["p95"], latency["p99"], latency["max"],
+          max((r[2] for r in ok), default=0), waits_after - waits_before]],
+    )
+
+
+async def main(args) -> None:
+    print(f"Pool: {settings.DB_POOL_MODE}, size {settings.DB_POOL_SIZE} + overflow {settings.DB_MAX_OVERFLOW}, "
+          f"timeout {settings.DB_POOL_TIMEOUT}s")
+    await reset_schema()
+    teachers = await seed(args.teachers, args.class_size)
+    print(f"Seeded {args.teachers} sections x {args.class_size} students")
+
+    async with client() as http:
+        day = date(2025, 9, 1)
+        await run_wave(http, teachers, day, "First submission (inserts)")
+        await run_wave(http, teachers, day, "Resubmission (conflict updates)")
+
+    async with async_session_factory() as db:
+        rows = await db.scalar(select(func.count(Attendance.id)))
+    print(f"\nAttendance rows: {rows:,} (expected {args.teachers * args.class_size:,})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teachers", type=int, default=200, help="concurrent submissions (one section each)")
+    parser.add_argument("--class-size", type=int, default=35)
+    asyncio.run(main(parser.parse_args()))
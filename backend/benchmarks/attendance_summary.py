@@ -0,0 +1,136 @@
+"""
+EduNexus School — Attendance Summary Benchmark
+Seeds YEARS school years of weekday attendance for STUDENTS students
+(5 years x 10k students, about 13M rows, by default), builds the rollups and
+compares count_attendance_by_student (monthly buckets plus raw rows at
+partial-month edges) with aggregating the raw rows, for one student and for
+a 40-student section over several ranges. Both must return the same counts.
+
+    python -m benchmarks.attendance_summary --students 10000 --years 5
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from benchmarks.common import (
+    Stopwatch,
+    analyze,
+    async_session_factory,
+    bulk_insert,
+    latency_summary,
+    print_table,
+    reset_schema,
+    seed_sections,
+    seed_students,
+    user_row,
+)
+from sqlalchemy import select, text
+
+from app.models.attendance import Attendance
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.services.attendance import count_attendance_by_student, empty_counts
+from app.services.attendance_rollups import STATUS_COLUMNS, rebuild_attendance_rollups, status_counts
+
+SECTION_SIZE = 40
+FIRST_YEAR = 2021
+
+# Server-side, so 13M rows don't round-trip through Python; weights ≈ 90/5/3/2%
+_SEED_ATTENDANCE = text("""
+    INSERT INTO attendance (id, student_id, section_id, date, status, marked_by, created_at, updated_at)
+    SELECT gen_random_uuid(), s.id, s.current_section_id, d::date,
+           (CASE WHEN r < 0.90 THEN 'PRESENT' WHEN r < 0.95 THEN 'ABSENT'
+                 WHEN r < 0.98 THEN 'LATE' ELSE 'EXCUSED' END)::attendance_status,
+           :marked_by, now(), now()
+    FROM students s
+    CROSS JOIN generate_series(CAST(:start AS date), CAST(:end AS date), interval '1 day') AS d
+    -- Referencing d makes the roll per row rather than once per query
+    CROSS JOIN LATERAL (SELECT random() + 0 * extract(epoch FROM d) AS r) AS roll
+    WHERE extract(isodow FROM d) < 6 AND s.current_section_id = ANY(:sections)
+""")
+
+
+async def seed(students: int, years: int) -> List[UUID]:
+    rng = random.Random(19)
+    async with async_session_factory() as db:
+        section_ids = await seed_sections(db, (students + SECTION_SIZE - 1) // SECTION_SIZE)
+        await seed_students(db, section_ids, SECTION_SIZE, rng)
+        staff = user_row(UserRole.TEACHER, rng)
+        await bulk_insert(db, User, [staff])
+        await db.commit()
+
+    start, end = date(FIRST_YEAR, 1, 1), date(FIRST_YEAR + years - 1, 12, 31)
+    for i in range(0, len(section_ids), 25):  # a transaction per batch of sections
+        async with async_session_factory() as db:
+            await db.execute(_SEED_ATTENDANCE, {
+                "marked_by": staff["id"], "start": start, "end": end, "sections": section_ids[i:i + 25],
+            })
+            await db.commit()
+    return section_ids
+
+
+async def raw_counts(db, student_ids: Sequence[UUID], start: Optional[date], end: Optional[date]):
+    """The pre-rollup approach: aggregate every raw row in the range."""
+    query = select(Attendance.student_id, *status_counts()).where(Attendance.student_id.in_(student_ids))
+    if start:
+        query = query.where(Attendance.date >= start)
+    if end:
+        query = query.where(Attendance.date <= end)
+    counts: Dict[UUID, Dict[str, int]] = {student_id: empty_counts() for student_id in student_ids}
+    for student_id, *totals in (await db.execute(query.group_by(Attendance.student_id))).all():
+        counts[student_id] = dict(zip(STATUS_COLUMNS, totals))
+    return counts
+
+
+async def time_case(fn: Callable, student_ids, start, end, repeats: int):
+    timings, result = [], None
+    for _ in range(repeats):
+        async with async_session_factory() as db:
+            with Stopwatch() as watch:
+                result = await fn(db, student_ids, start, end)
+        timings.append(watch.elapsed)
+    return latency_summary(timings)["p50"], result
+
+
+async def main(args) -> None:
+    await reset_schema()
+    with Stopwatch() as seeding:
+        section_ids = await seed(args.students, args.years)
+        async with async_session_factory() as db:
+            await rebuild_attendance_rollups(db)
+            await db.commit()
+        await analyze()
+    async with async_session_factory() as db:
+        rows = (await db.execute(text("SELECT count(*) FROM attendance"))).scalar_one()
+        section = list((await db.scalars(select(Student.id).where(Student.current_section_id == section_ids[0]))).all())
+    print(f"Seeded {rows:,} attendance rows and built rollups in {seeding.elapsed:.1f}s")
+
+    last_year = FIRST_YEAR + args.years - 1
+    ranges = {
+        "all time": (None, None),
+        f"{args.years} full years": (date(FIRST_YEAR, 1, 1), date(last_year, 12, 31)),
+        "school year, mid-month edges": (date(last_year - 1, 6, 15), date(last_year, 3, 20)),
+        "one month": (date(last_year, 2, 1), date(last_year, 2, 28)),
+        "two weeks": (date(last_year, 5, 4), date(last_year, 5, 17)),
+    }
+    table = []
+    for scope, student_ids in (("1 student", section[:1]), (f"{len(section)} students", section)):
+        for label, (start, end) in ranges.items():
+            rollup_ms, rollup = await time_case(count_attendance_by_student, student_ids, start, end, args.repeats)
+            raw_ms, raw = await time_case(raw_counts, student_ids, start, end, args.repeats)
+            assert rollup == raw, f"counts differ for {scope}, {label}"
+            table.append([scope, label, raw_ms, rollup_ms, f"{raw_ms / rollup_ms:.1f}x" if rollup_ms else "-"])
+    print()
+    print_table(["students", "range", "raw rows p50 ms", "rollups p50 ms", "speed-up"], table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,174 @@
+"""
+EduNexus School — Benchmark Helpers
+Points the settings at BENCH_DATABASE_URL (import this module before any
+`app` module), then provides schema setup, bulk seeding, an in-process HTTP
+client and latency summaries.
+"""
+
+import os
+import sys
+
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL", "")
+if not BENCH_DATABASE_URL:
+    sys.exit("BENCH_DATABASE_URL is not set (a scratch database; its tables are dropped)")
+
+os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+os.environ["DATABASE_READ_URL"] = ""
+os.environ.setdefault("REDIS_URL", "")
+os.environ["REPORT_JOB_BACKEND"] = "memory"
+os.environ["DEBUG"] = "false"  # SQL echo would dominate the timings
+
+import logging  # noqa: E402
+import random  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+import uuid  # noqa: E402
+from datetime import date  # noqa: E402
+from typing import Any, Dict, Iterable, List, Optional, Sequence  # noqa: E402
+
+import httpx  # noqa: E402
+from faker.providers.person.en_US import Provider as PersonProvider  # noqa: E402
+from sqlalchemy import insert, text  # noqa: E402
+
+from app.database import Base, async_session_factory, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.academic import AcademicYear  # noqa: E402
+from app.models.classroom import Class, Section  # noqa: E402
+from app.models.student import Gender, Student  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.utils.security import create_access_token  # noqa: E402
+
+CHUNK = 5000  # rows per INSERT
+
+# Over-budget warnings are expected under load; the scripts report their own numbers
+logging.getLogger("app.utils.profiling").setLevel(logging.ERROR)
+
+
+# ── Schema & seeding ──
+async def reset_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def bulk_insert(db, model, rows: Iterable[Dict[str, Any]]) -> None:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK:
+            await db.execute(insert(model), batch)
+            batch = []
+    if batch:
+        await db.execute(insert(model), batch)
+
+
+def user_row(role: UserRole, rng: random.Random, password_hash: str = "not-a-real-hash") -> Dict[str, Any]:
+    user_id = uuid.uuid4()
+    first_name, last_name = _names(rng)
+    return {
+        "id": user_id,
+        "email": f"{first_name}.{last_name}.{user_id.hex[:6]}@example.com".lower(),
+        "password_hash": password_hash,
+        "role": role,
+        "first_name": first_name,
+        "last_name": last_name,
+    }
+
+
+FIRST_NAMES = list(PersonProvider.first_names)
+LAST_NAMES = list(PersonProvider.last_names)
+
+
+def _names(rng: random.Random) -> tuple[str, str]:
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+async def seed_sections(db, count: int) -> List[uuid.UUID]:
+    """`count` sections, ten to a class, in one current academic year."""
+    year = AcademicYear(name="2025-2026", start_date=date(2025, 6, 1), end_date=date(2026, 3, 31), is_current=True)
+    db.add(year)
+    await db.flush()
+    classes = [{"id": uuid.uuid4(), "name": f"Grade {i + 1}", "grade_level": i % 12 + 1, "academic_year_id": year.id}
+               for i in range((count + 9) // 10)]
+    sections = [{"id": uuid.uuid4(), "class_id": classes[i // 10]["id"], "name": f"S{i}"} for i in range(count)]
+    await bulk_insert(db, Class, classes)
+    await bulk_insert(db, Section, sections)
+    return [s["id"] for s in sections]
+
+
+async def seed_students(db, section_ids: Sequence[Optional[uuid.UUID]], per_section: int,
+                        rng: random.Random) -> List[uuid.UUID]:
+    """`per_section` students (and their users) in each section; returns student ids."""
+    users, students = [], []
+    for section_id in section_ids:
+        for _ in range(per_section):
+            user = user_row(UserRole.STUDENT, rng)
+            users.append(user)
+            students.append({
+                "id": uuid.uuid4(),
+                "user_id": user["id"],
+                "admission_no": f"ADM-{len(students):07d}",
+                "date_of_birth": date(2015, 1, 1),
+                "gender": rng.choice(list(Gender)),
+                "enrollment_date": date(2025, 6, 1),
+                "current_section_id": section_id,
+            })
+    await bulk_insert(db, User, users)
+    await bulk_insert(db, Student, students)
+    return [s["id"] for s in students]
+
+
+async def analyze() -> None:
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
+
+
+# ── HTTP ──
+def client() -> httpx.AsyncClient:
+    """An in-process client for the ASGI app (no network, same pool and event loop)."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+
+def auth_headers(user_id: uuid.UUID, role: UserRole) -> Dict[str, str]:
+    token = create_access_token({"sub": str(user_id), "role": role.value, "email": "bench@edunexus.example"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ── Reporting ──
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """p50 / p95 / p99 / max in milliseconds."""
+    ms = [s * 1000 for s in seconds]
+    return {
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99),
+        "max": max(ms, default=0.0),
+        "mean": statistics.fmean(ms) if ms else 0.0,
+    }
+
+
+def print_table(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    rows = [[f"{v:,.1f}" if isinstance(v, float) else str(v) for v in row] for row in rows]
+    widths = [max(len(h), *(len(r[i]) for r in rows)) if rows else len(h) for i, h in enumerate(headers)]
+    print("  ".join(h.rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(v.rjust(w) for v, w in zip(row, widths)))
+
+
+class Stopwatch:
+    def __enter__(self) -> "Stopwatch":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
@@ -0,0 +1,133 @@
+"""
+EduNexus School — Excel Export Benchmark
+Compares the write-only streaming attendance export with the in-memory
+generator it replaced (a full Workbook with per-cell styles and a width pass
+over every cell, reproduced below) at 1k, 10k and 100k rows. Each run gets
+a fresh process so peak RSS is its own. Needs no database.
+
+    python -m benchmarks.excel_export --rows 1000 10000 100000
+"""
+
+import argparse
+import io
+import multiprocessing
+import random
+import resource
+import time
+from typing import Any, Dict, Iterator
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from app.utils.excel_generator import generate_attendance_excel
+
+
+def attendance_rows(count: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(14)
+    for i in range(count):
+        present, absent, late, excused = rng.randint(150, 180), rng.randint(0, 15), rng.randint(0, 8), rng.randint(0, 5)
+        total = present + absent + late + excused
+        yield {
+            "student_name": f"Student {i:06d}",
+            "admission_no": f"ADM-{i:07d}",
+            "present": present, "absent": absent, "late": late, "excused": excused,
+            "total": total, "percentage": (present + late) / total * 100,
+        }
+
+
+def legacy_attendance_excel(data: Dict[str, Any]) -> bytes:
+    """The pre-streaming generator: every cell styled individually, widths from every cell."""
+    wb = Workbook()
+    ws = wb.active
+    ws.merge_cells("A1:H1")
+    ws["A1"].value = data["title"]
+    ws["A1"].font = Font(name="Segoe UI", bold=True, size=16, color="7C4DFF")
+    start_row = 3
+    headers = ["#", "Student Name", "Admission No", "Present", "Absent", "Late", "Excused", "Total", "Attendance %"]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=start_row, column=col, value=header)
+        cell.font = Font(name="Segoe UI", bold=True, color="FFFFFF", size=10)
+        cell.fill = PatternFill(start_color="00BFA5", end_color="00BFA5", fill_type="solid")
+
+    data_font = Font(name="Segoe UI", size=10)
+    alt_fill = PatternFill(start_color="F0FFF0", end_color="F0FFF0", fill_type="solid")
+    center_align = Alignment(horizontal="center")
+    for idx, row in enumerate(data["rows"], 1):
+        r = start_row + idx
+        ws.cell(row=r, column=1, value=idx).font = data_font
+        ws.cell(row=r, column=2, value=row["student_name"]).font = Font(name="Segoe UI", bold=True, size=10)
+        ws.cell(row=r, column=3, value=row["admission_no"]).font = data_font
+        ws.cell(row=r, column=4, value=row["present"]).font = Font(name="Segoe UI", size=10, color="2E7D32")
+        ws.cell(row=r, column=5, value=row["absent"]).font = Font(name="Segoe UI", size=10, color="C62828")
+        ws.cell(row=r, column=6, value=row["late"]).font = Font(name="Segoe UI", size=10, color="E65100")
+        ws.cell(row=r, column=7, value=row["excused"]).font = Font(name="Segoe UI", size=10, color="1565C0")
+        ws.cell(row=r, column=8, value=row["total"]).font = data_font
+        pct_cell = ws.cell(row=r, column=9, value=row["percentage"] / 100)
+        pct_cell.number_format = "0.0%"
+        pct_cell.font = Font(name="Segoe UI", bold=True, size=10)
+        for col in range(1, 10):
+            ws.cell(row=r, column=col).alignment = center_align
+            if idx % 2 == 0:
+                ws.cell(row=r, column=col).fill = alt_fill
+
+    for col_cells in ws.columns:
+        max_len = max(len(str(cell.value or "")) for cell in col_cells)
+        ws.column_dimensions[get_column_letter(col_cells[0].column)].width = min(max(max_len + 2, 10), 40)
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _streaming(data: Dict[str, Any]) -> int:
+    output = generate_attendance_excel(data)
+    output.seek(0, io.SEEK_END)
+    size = output.tell()
+    output.close()
+    return size
+
+
+def _legacy(data: Dict[str, Any]) -> int:
+    return len(legacy_attendance_excel(data))
+
+
+GENERATORS = {"streaming": _streaming, "in-memory": _legacy}
+
+
+def _run(generator: str, rows: int, results) -> None:
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    data = {"title": "Attendance Report", "start_date": "2025-06-01", "end_date": "2026-03-31",
+            "section_name": "Grade 5 - A", "rows": attendance_rows(rows)}
+    if generator == "in-memory":
+        data["rows"] = list(data["rows"])  # the old generator needed a list
+    started = time.perf_counter()
+    size = GENERATORS[generator](data)
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, peak_kb / 1024, (peak_kb - baseline_kb) / 1024, size / 1024 / 1024))
+
+
+def measure(generator: str, rows: int):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_run, args=(generator, rows, results))
+    process.start()
+    outcome = results.get()
+    process.join()
+    return outcome
+
+
+def main(args) -> None:
+    # Growth is over the process's peak before generating (interpreter + imports)
+    print(f"{'rows':>8}  {'generator':>10}  {'wall s':>8}  {'peak RSS MB':>11}  {'growth MB':>9}  {'file MB':>8}")
+    for rows in args.rows:
+        for generator in GENERATORS:
+            elapsed, peak_mb, growth_mb, file_mb = measure(generator, rows)
+            print(f"{rows:>8,}  {generator:>10}  {elapsed:>8.2f}  {peak_mb:>11.1f}  {growth_mb:>9.1f}  {file_mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+"""
+EduNexus School — Login Burst Benchmark
+Report-card day: a burst of parents log in at once while other traffic keeps
+flowing. Fires LOGINS concurrent POST /api/v1/auth/login requests and, at
+the same time, probes an unrelated endpoint (GET /health/live) every few
+milliseconds. Reports login throughput and latency, and the probe's latency
+before and during the burst, along with the deepest bcrypt queue seen.
+
+`--inline-bcrypt` verifies passwords on the event loop instead of the bcrypt
+pool, to show what the pool protects the other requests from.
+
+    python -m benchmarks.login_burst --logins 200
+"""
+
+import argparse
+import asyncio
+import random
+from unittest import mock
+
+from benchmarks.common import (
+    Stopwatch,
+    async_session_factory,
+    bulk_insert,
+    client,
+    latency_summary,
+    print_table,
+    reset_schema,
+    user_row,
+)
+
+from app.api.v1 import auth as auth_routes
+from app.config import get_settings
+from app.models.user import User, UserRole
+from app.utils.security import hash_password, password_executor_stats, verify_password
+
+settings = get_settings()
+PASSWORD = "report-card-day"
+
+
+async def probe(http, stop: asyncio.Event, interval: float):
+    latencies = []
+    while not stop.is_set():
+        with Stopwatch() as watch:
+            await http.get("/health/live")
+        latencies.append(watch.elapsed)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login(http, email: str):
+    with Stopwatch() as watch:
+        response = await http.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    return response.status_code, watch.elapsed
+
+
+async def watch_queue(stop: asyncio.Event, peak: dict):
+    while not stop.is_set():
+        peak["queued"] = max(peak["queued"], password_executor_stats()["queued"])
+        await asyncio.sleep(0.005)
+
+
+async def main(args) -> None:
+    await reset_schema()
+    rng = random.Random(9)
+    password_hash = hash_password(PASSWORD)
+    users = [user_row(UserRole.PARENT, rng, password_hash) for _ in range(args.logins)]
+    async with async_session_factory() as db:
+        await bulk_insert(db, User, users)
+        await db.commit()
+    mode = "inline on the event loop" if args.inline_bcrypt else f"{settings.PASSWORD_HASH_WORKERS} bcrypt workers"
+    print(f"{args.logins} concurrent logins, bcrypt {mode}")
+
+    async with client() as http:
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(http, stop, args.probe_interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        peak = {"queued": 0}
+        probe_task = asyncio.create_task(probe(http, stop, args.probe_interval))
+        queue_task = asyncio.create_task(watch_queue(stop, peak))
+        with Stopwatch() as wall:
+            results = await asyncio.gather(*(login(http, user["email"]) for user in users))
+        stop.set()
+        during = await probe_task
+        await queue_task
+
+    ok = [elapsed for status, elapsed in results if status == 200]
+    logins = latency_summary(ok)
+    print(f"\nLogins: {len(ok)}/{len(results)} succeeded in {wall.elapsed:.2f}s "
+          f"({len(ok) / wall.elapsed:.1f}/s), peak bcrypt queue {peak['queued']}")
+    # A stalled event loop shows up as missing probes as much as slow ones
+    print_table(
+        ["", "p50 ms", "p95 ms", "p99 ms", "max ms", "requests/s"],
+        [
+            ["login", logins["p50"], logins["p95"], logins["p99"], logins["max"], len(ok) / wall.elapsed],
+            *(
+                [label, s["p50"], s["p95"], s["p99"], s["max"], len(samples) / seconds]
+                for label, samples, seconds in (
+                    ("/health/live idle", baseline, args.baseline_seconds),
+                    ("/health/live during burst", during, wall.elapsed),
+                )
+                for s in [latency_summary(samples)]
+            ),
+        ],
+    )
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return verify_password(plain_password, hashed_password)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="seconds between probes")
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    parser.add_argument("--inline-bcrypt", action="store_true", help="verify on the event loop (the old behaviour)")
+    args = parser.parse_args()
+    if args.inline_bcrypt:
+        with mock.patch.object(auth_routes, "verify_password_async", _inline_verify):
+            asyncio.run(main(args))
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,233 @@
+"""
+EduNexus School — Connection Pool Sweep
+Runs the same concurrent request mix (student list, report card, dashboard
+analytics, search) once per pool configuration and compares throughput,
+latency and time spent waiting for a connection.
+
+The engine is built from the settings at import, so each configuration runs
+in its own subprocess with DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_MODE set
+in its environment. "pgbouncer" runs the NullPool mode against
+BENCH_PGBOUNCER_URL when set, otherwise straight against Postgres (a new
+connection per checkout, the cost PgBouncer is there to absorb).
+
+    python -m benchmarks.pool_sweep --pool-sizes 5,10,20,40 --concurrency 100 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import uuid
+
+from benchmarks.common import (
+    BENCH_DATABASE_URL,
+    Stopwatch,
+    analyze,
+    async_session_factory,
+    auth_headers,
+    bulk_insert,
+    client,
+    latency_summary,
+    print_table,
+    reset_schema,
+    seed_sections,
+    seed_students,
+    user_row,
+)
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.models.academic import AcademicYear, Subject, Term
+from app.models.classroom import SubjectTeacher
+from app.models.gradebook import Assignment, AssignmentCategory, Grade
+from app.models.student import Student
+from app.models.teacher import Teacher
+from app.models.user import User, UserRole
+from app.services.grade_aggregates import rebuild_grade_aggregates
+from app.utils.metrics import POOL_CHECKOUT_WAIT
+
+settings = get_settings()
+
+SUBJECTS = ("Mathematics", "Physics", "History")
+ASSIGNMENTS_PER_SUBJECT = 10
+SEARCH_TERMS = ("smith", "jon", "ADM-00001", "garcia", "mary")
+
+
+# ── Seeding (parent) ──
+async def seed(sections: int, class_size: int) -> dict:
+    rng = random.Random(24)
+    async with async_session_factory() as db:
+        section_ids = await seed_sections(db, sections)
+        await seed_students(db, section_ids, class_size, rng)
+        admin = user_row(UserRole.ADMIN, rng)
+        teacher_users = [user_row(UserRole.TEACHER, rng) for _ in SUBJECTS]
+        await bulk_insert(db, User, [admin, *teacher_users])
+        teachers = [{"id": uuid.uuid4(), "user_id": u["id"], "employee_id": f"EMP-{i:04d}"}
+                    for i, u in enumerate(teacher_users)]
+        subjects = [{"id": uuid.uuid4(), "name": name, "code": f"SUB-{i}"} for i, name in enumerate(SUBJECTS)]
+        await bulk_insert(db, Teacher, teachers)
+        await bulk_insert(db, Subject, subjects)
+
+        year = await db.scalar(select(AcademicYear))
+        term = Term(academic_year_id=year.id, name="Term 1", start_date=year.start_date, end_date=year.end_date)
+        db.add(term)
+        await db.flush()
+
+        # Every section takes every subject, with a graded assignment set per subject
+        links, categories, assignments, grades = [], [], [], []
+        rosters = {s: [] for s in section_ids}
+        for student_id, section_id in await db.execute(select(Student.id, Student.current_section_id)):
+            rosters[section_id].append(student_id)
+        for section_id in section_ids:
+            for teacher, subject in zip(teachers, subjects):
+                link = {"id": uuid.uuid4(), "subject_id": subject["id"], "teacher_id": teacher["id"], "section_id": section_id}
+                category = {"id": uuid.uuid4(), "name": "Coursework", "weight": 100, "term_id": term.id,
+                            "subject_teacher_id": link["id"]}
+                links.append(link)
+                categories.append(category)
+                for n in range(ASSIGNMENTS_PER_SUBJECT):
+                    assignment = {"id": uuid.uuid4(), "category_id": category["id"], "title": f"A{n}", "max_score": 100}
+                    assignments.append(assignment)
+                    grades.extend({"assignment_id": assignment["id"], "student_id": s, "score": rng.randint(40, 100),
+                                   "graded_by": teacher["user_id"]} for s in rosters[section_id])
+        await bulk_insert(db, SubjectTeacher, links)
+        await bulk_insert(db, AssignmentCategory, categories)
+        await bulk_insert(db, Assignment, assignments)
+        await bulk_insert(db, Grade, grades)
+        await rebuild_grade_aggregates(db, term.id)
+        await db.commit()
+
+    return {
+        "admin_id": str(admin["id"]),
+        "term_id": str(term.id),
+        "section_ids": [str(s) for s in section_ids],
+        "student_ids": [str(s) for roster in rosters.values() for s in roster],
+    }
+
+
+# ── Request mix (worker) ──
+def request_mix(fixture: dict, rng: random.Random):
+    """An endless stream of (route label, path, params) drawn in roughly dashboard-traffic proportions."""
+    while True:
+        pick = rng.random()
+        if pick < 0.4:
+            yield "students", "/api/v1/students", {"section_id": rng.choice(fixture["section_ids"]), "per_page": 25}
+        elif pick < 0.7:
+            yield "report card", f"/api/v1/gradebook/report-card/{rng.choice(fixture['student_ids'])}", \
+                {"term_id": fixture["term_id"]}
+        elif pick < 0.85:
+            yield "search", "/api/v1/search", {"q": rng.choice(SEARCH_TERMS)}
+        else:
+            yield "analytics", "/api/v1/reports/analytics", {}
+
+
+async def run_worker(fixture: dict, concurrency: int, requests: int) -> dict:
+    headers = auth_headers(uuid.UUID(fixture["admin_id"]), UserRole.ADMIN)
+    rng = random.Random(2024)
+    mix = request_mix(fixture, rng)
+    latencies, failures, issued = [], 0, 0
+
+    async def user(http) -> None:
+        nonlocal failures, issued
+        while issued < requests:
+            issued += 1
+            _, path, params = next(mix)
+            with Stopwatch() as watch:
+                response = await http.get(path, params=params, headers=headers)
+            if response.status_code == 200:
+                latencies.append(watch.elapsed)
+            else:
+                failures += 1
+
+    async with client() as http:
+        # Warm-up: open the pool and fill the statement caches outside the measurement
+        await asyncio.gather(*(http.get(path, params=params, headers=headers)
+                               for _, path, params in (next(mix) for _ in range(concurrency))))
+        counts, waited = POOL_CHECKOUT_WAIT._series.get((), [[0], 0.0])
+        checkouts_before, waited_before = sum(counts), waited
+        with Stopwatch() as wall:
+            await asyncio.gather(*(user(http) for _ in range(concurrency)))
+        counts, waited = POOL_CHECKOUT_WAIT._series.get((), [[0], 0.0])
+
+    checkouts = sum(counts) - checkouts_before
+    return {
+        "requests": len(latencies) + failures,
+        "failures": failures,
+        "seconds": wall.elapsed,
+        "latency": latency_summary(latencies),
+        "checkouts": checkouts,
+        "pool_wait_total": waited - waited_before,
+        "pool_wait_mean_ms": (waited - waited_before) / checkouts * 1000 if checkouts else 0.0,
+    }
+
+
+# ── Sweep (parent) ──
+def run_config(label: str, env: dict, fixture: dict, args) -> list:
+    command = [sys.executable, "-W", "ignore", "-m", "benchmarks.pool_sweep", "--worker",
+               "--concurrency", str(args.concurrency), "--requests", str(args.requests)]
+    completed = subprocess.run(command, input=json.dumps(fixture), capture_output=True, text=True,
+                               env={**os.environ, **env})
+    if completed.returncode != 0:
+        print(completed.stderr, file=sys.stderr)
+        return [label, "error", "-", "-", "-", "-", "-"]
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    latency = result["latency"]
+    return [
+        label,
+        result["requests"] / result["seconds"],
+        latency["p50"],
+        latency["p99"],
+        result["pool_wait_mean_ms"],
+        result["pool_wait_total"],
+        result["failures"],
+    ]
+
+
+async def prepare(args) -> dict:
+    await reset_schema()
+    fixture = await seed(args.sections, args.class_size)
+    await analyze()
+    return fixture
+
+
+def main(args) -> None:
+    fixture = asyncio.run(prepare(args))
+    print(f"Seeded {len(fixture['section_ids'])} sections x {args.class_size} students, "
+          f"{len(SUBJECTS)} graded subjects each")
+    print(f"{args.requests} requests per configuration, {args.concurrency} concurrent clients\n")
+
+    configs = [
+        (f"queue {size}+{args.overflow}", {"DB_POOL_MODE": "queue", "DB_POOL_SIZE": str(size),
+                                           "DB_MAX_OVERFLOW": str(args.overflow)})
+        for size in args.pool_sizes
+    ]
+    if not args.skip_pgbouncer:
+        bouncer_url = os.environ.get("BENCH_PGBOUNCER_URL")
+        label = "pgbouncer (NullPool)" if bouncer_url else "NullPool, direct"
+        configs.append((label, {"DB_POOL_MODE": "pgbouncer", "BENCH_DATABASE_URL": bouncer_url or BENCH_DATABASE_URL}))
+
+    rows = []
+    for label, env in configs:
+        rows.append(run_config(label, env, fixture, args))
+        print(f"  {label}: done", file=sys.stderr)
+    print_table(["pool", "req/s", "p50 ms", "p99 ms", "wait/checkout ms", "pool wait s (total)", "failed"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-sizes", type=lambda v: [int(x) for x in v.split(",")], default=[5, 10, 20, 40])
+    parser.add_argument("--overflow", type=int, default=0, help="DB_MAX_OVERFLOW for every queue configuration")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--sections", type=int, default=50)
+    parser.add_argument("--class-size", type=int, default=35)
+    parser.add_argument("--skip-pgbouncer", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(json.load(sys.stdin), args.concurrency, args.requests))))
+    else:
+        main(args)
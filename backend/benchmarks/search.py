@@ -0,0 +1,115 @@
+"""
+EduNexus School — People Search Benchmark
+Seeds USERS people (70% students, 10% teachers, 20% guardians; 100k by
+default) and times search_people for surnames, full names, misspelt names,
+admission numbers and email fragments taken from the seeded rows, first
+with the pg_trgm indexes and then with index scans disabled (the sequential
+scans they replace).
+
+    python -m benchmarks.search --users 100000
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from typing import Dict, List
+
+from benchmarks.common import (
+    Stopwatch,
+    analyze,
+    async_session_factory,
+    bulk_insert,
+    latency_summary,
+    print_table,
+    reset_schema,
+    seed_students,
+    user_row,
+)
+from sqlalchemy import func, select, text
+
+from app.models.guardian import Guardian
+from app.models.student import Student
+from app.models.teacher import Teacher
+from app.models.user import User, UserRole
+from app.services.search import search_people
+
+TERMS_PER_KIND = 5
+
+
+def _misspell(name: str, rng: random.Random) -> str:
+    """Swap two adjacent letters, keeping the first letter and the space."""
+    swappable = [i for i in range(1, len(name) - 1) if " " not in name[i:i + 2]]
+    i = rng.choice(swappable)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+async def pick_terms() -> Dict[str, List[str]]:
+    """Search terms built from random seeded people, so every kind has real matches."""
+    rng = random.Random(1212)
+    async with async_session_factory() as db:
+        people = (await db.execute(
+            select(User.first_name, User.last_name, User.email, Student.admission_no)
+            .join(Student, Student.user_id == User.id)
+            .order_by(func.random())
+            .limit(TERMS_PER_KIND)
+        )).all()
+    return {
+        "surname": [last for _, last, _, _ in people],
+        "full name": [f"{first} {last}" for first, last, _, _ in people],
+        "misspelt name": [_misspell(f"{first} {last}", rng) for first, last, _, _ in people],
+        "admission no": [admission_no[-5:] for *_, admission_no in people],
+        "email fragment": [email.split("@")[0][-10:] for _, _, email, _ in people],
+    }
+
+
+async def seed(users: int) -> None:
+    rng = random.Random(12)
+    async with async_session_factory() as db:
+        await seed_students(db, [None], int(users * 0.7), rng)
+        teachers = [user_row(UserRole.TEACHER, rng) for _ in range(int(users * 0.1))]
+        guardians = [user_row(UserRole.PARENT, rng) for _ in range(users - int(users * 0.7) - len(teachers))]
+        await bulk_insert(db, User, teachers + guardians)
+        await bulk_insert(db, Teacher, (
+            {"id": uuid.uuid4(), "user_id": u["id"], "employee_id": f"EMP-{i:06d}"} for i, u in enumerate(teachers)
+        ))
+        await bulk_insert(db, Guardian, ({"id": uuid.uuid4(), "user_id": u["id"]} for u in guardians))
+        await db.commit()
+    await analyze()
+
+
+async def time_terms(terms_by_kind: Dict[str, List[str]], indexed: bool, repeats: int):
+    rows = []
+    for kind, terms in terms_by_kind.items():
+        timings, hits = [], 0
+        for _ in range(repeats):
+            for term in terms:
+                async with async_session_factory() as db:
+                    if not indexed:
+                        await db.execute(text("SET LOCAL enable_indexscan = off"))
+                        await db.execute(text("SET LOCAL enable_bitmapscan = off"))
+                    with Stopwatch() as watch:
+                        hits += len(await search_people(db, term))
+                    timings.append(watch.elapsed)
+        s = latency_summary(timings)
+        rows.append([kind, s["p50"], s["p95"], s["max"], hits // repeats])
+    return rows
+
+
+async def main(args) -> None:
+    await reset_schema()
+    with Stopwatch() as seeding:
+        await seed(args.users)
+    print(f"Seeded {args.users:,} people in {seeding.elapsed:.1f}s")
+
+    terms = await pick_terms()
+    for label, indexed in (("trigram indexes", True), ("sequential scans", False)):
+        print(f"\n{label}")
+        print_table(["query", "p50 ms", "p95 ms", "max ms", "hits"], await time_terms(terms, indexed, args.repeats))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
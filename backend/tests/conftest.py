@@ -0,0 +1,100 @@
+"""
+EduNexus School — Test Fixtures
+Database tests run against the Postgres database at TEST_DATABASE_URL (a
+throwaway one: tables are recreated at the start of the run and truncated
+after every test) and are skipped when it is not set. Redis is disabled and
+report jobs use the in-memory backend, so nothing else needs to be running.
+"""
+
+import asyncio
+import os
+from contextlib import contextmanager
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+# Settings are read on import, so point them at the test services first
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["REDIS_URL"] = ""
+os.environ["REPORT_JOB_BACKEND"] = "memory"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.database import Base, async_session_factory, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.utils.profiling import track_queries  # noqa: E402
+from app.utils.security import create_access_token  # noqa: E402
+from tests.factories import create_user  # noqa: E402
+
+
+async def _reset_schema(create: bool) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        if create:
+            await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Fresh tables for the run; skips the test when no database is configured."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    asyncio.run(_reset_schema(create=True))
+    yield
+    asyncio.run(_reset_schema(create=False))
+
+
+@pytest.fixture
+async def db(database):
+    """A session on the primary; every table is emptied afterwards."""
+    async with async_session_factory() as session:
+        yield session
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(db):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def admin(db):
+    user = await create_user(db, role=UserRole.ADMIN, first_name="Ada", last_name="Admin")
+    await db.commit()
+    return user
+
+
+@pytest.fixture
+def admin_headers(admin):
+    token = create_access_token({"sub": str(admin.id), "role": admin.role.value, "email": admin.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def max_queries():
+    """
+    Fail when a block runs more SQL statements than its budget:
+
+        with max_queries(4):
+            await client.get("/api/v1/students", headers=admin_headers)
+    """
+
+    @contextmanager
+    def budget(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"{stats.count} queries executed, budget is {limit}"
+
+    return budget
@@ -0,0 +1,114 @@
+"""
+EduNexus School — Test Data Factories
+Small helpers that insert valid rows with sensible defaults; pass keyword
+arguments to override columns. They flush but never commit.
+"""
+
+import uuid
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.academic import AcademicYear, Subject, Term
+from app.models.classroom import Class, Section, SubjectTeacher
+from app.models.gradebook import Assignment, AssignmentCategory
+from app.models.guardian import Guardian
+from app.models.student import Gender, Student
+from app.models.teacher import Teacher
+from app.models.user import User, UserRole
+
+
+def _suffix() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _add(db: AsyncSession, obj: Any) -> Any:
+    db.add(obj)
+    await db.flush()
+    return obj
+
+
+async def create_user(db: AsyncSession, **overrides) -> User:
+    values = {
+        "email": f"user-{_suffix()}@test.edunexus",
+        "password_hash": "not-a-real-hash",
+        "role": UserRole.STUDENT,
+        "first_name": "Test",
+        "last_name": "User",
+    }
+    return await _add(db, User(**{**values, **overrides}))
+
+
+async def create_academic_year(db: AsyncSession, **overrides) -> AcademicYear:
+    values = {
+        "name": f"Year {_suffix()}",
+        "start_date": date(2025, 6, 1),
+        "end_date": date(2026, 3, 31),
+        "is_current": True,
+    }
+    return await _add(db, AcademicYear(**{**values, **overrides}))
+
+
+async def create_section(db: AsyncSession, **overrides) -> Section:
+    """A section in a new class (and academic year unless `academic_year` is given)."""
+    year = overrides.pop("academic_year", None) or await create_academic_year(db)
+    parent_class = await _add(db, Class(name="Grade 5", grade_level=5, academic_year_id=year.id))
+    return await _add(db, Section(**{"class_id": parent_class.id, "name": "A", **overrides}))
+
+
+async def _profile_user(db: AsyncSession, role: UserRole, overrides: dict) -> User:
+    """The User behind a profile; first_name, last_name and email overrides apply to it."""
+    user_fields = {key: overrides.pop(key) for key in ("first_name", "last_name", "email") if key in overrides}
+    return await create_user(db, role=role, **user_fields)
+
+
+async def create_student(db: AsyncSession, section: Optional[Section] = None, **overrides) -> Student:
+    user = await _profile_user(db, UserRole.STUDENT, overrides)
+    values = {
+        "user_id": user.id,
+        "admission_no": f"ADM-{_suffix()}",
+        "date_of_birth": date(2015, 1, 1),
+        "gender": Gender.OTHER,
+        "enrollment_date": date(2025, 6, 1),
+        "current_section_id": section.id if section is not None else None,
+    }
+    return await _add(db, Student(**{**values, **overrides}))
+
+
+async def create_teacher(db: AsyncSession, **overrides) -> Teacher:
+    user = await _profile_user(db, UserRole.TEACHER, overrides)
+    values = {"user_id": user.id, "employee_id": f"EMP-{_suffix()}"}
+    return await _add(db, Teacher(**{**values, **overrides}))
+
+
+async def create_guardian(db: AsyncSession, **overrides) -> Guardian:
+    user = await _profile_user(db, UserRole.PARENT, overrides)
+    return await _add(db, Guardian(**{"user_id": user.id, **overrides}))
+
+
+async def create_term(db: AsyncSession, academic_year: AcademicYear, **overrides) -> Term:
+    values = {
+        "academic_year_id": academic_year.id,
+        "name": "Term 1",
+        "start_date": academic_year.start_date,
+        "end_date": academic_year.end_date,
+    }
+    return await _add(db, Term(**{**values, **overrides}))
+
+
+async def create_subject_teacher(db: AsyncSession, section: Section, teacher: Optional[Teacher] = None,
+                                 **subject_overrides) -> SubjectTeacher:
+    """A new subject taught in `section` (by a new teacher unless one is given)."""
+    teacher = teacher or await create_teacher(db)
+    subject = await _add(db, Subject(**{"name": "Mathematics", "code": f"SUB-{_suffix()}", **subject_overrides}))
+    return await _add(db, SubjectTeacher(subject_id=subject.id, teacher_id=teacher.id, section_id=section.id))
+
+
+async def create_assignment(db: AsyncSession, term: Term, subject_teacher: SubjectTeacher, **overrides) -> Assignment:
+    """An assignment in a new category weighted 100%."""
+    category = await _add(db, AssignmentCategory(
+        name="Coursework", weight=100, term_id=term.id, subject_teacher_id=subject_teacher.id,
+    ))
+    values = {"category_id": category.id, "title": f"Assignment {_suffix()}", "max_score": 100}
+    return await _add(db, Assignment(**{**values, **overrides}))
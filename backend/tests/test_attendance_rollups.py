@@ -0,0 +1,52 @@
+"""
+Marking attendance keeps the rollups in step with the raw rows, including
+when a student already has a row for the day under another section.
+"""
+
+from datetime import date
+
+from sqlalchemy import select
+
+from app.models.attendance import AttendanceSectionDaily
+from app.services.attendance import count_attendance_by_student
+from tests.factories import create_academic_year, create_section, create_student
+
+DAY = date(2025, 9, 1)
+
+
+async def _mark(client, headers, section, entries):
+    response = await client.post("/api/v1/attendance/bulk", headers=headers, json={
+        "section_id": str(section.id),
+        "date": DAY.isoformat(),
+        "entries": [{"student_id": str(student.id), "status": status} for student, status in entries],
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _section_day(db, section):
+    bucket = await db.scalar(
+        select(AttendanceSectionDaily)
+        .where(AttendanceSectionDaily.section_id == section.id, AttendanceSectionDaily.date == DAY)
+        .execution_options(populate_existing=True)
+    )
+    return {"present": bucket.present, "absent": bucket.absent}
+
+
+async def test_remarking_in_another_section_refreshes_the_owning_section(db, client, admin_headers):
+    year = await create_academic_year(db)
+    first, second = await create_section(db, academic_year=year), await create_section(db, academic_year=year)
+    moved = await create_student(db, section=first)
+    other = await create_student(db, section=second)
+    await db.commit()
+
+    await _mark(client, admin_headers, first, [(moved, "present")])
+    records = await _mark(client, admin_headers, second, [(moved, "absent"), (other, "present")])
+
+    # The existing row keeps its section, so the update lands in the first section's bucket
+    assert {r["student_id"]: r["section_id"] for r in records}[str(moved.id)] == str(first.id)
+    assert await _section_day(db, first) == {"present": 0, "absent": 1}
+    assert await _section_day(db, second) == {"present": 1, "absent": 0}
+
+    counts = await count_attendance_by_student(db, [moved.id], DAY, DAY)
+    assert counts[moved.id]["absent"] == 1 and counts[moved.id]["present"] == 0
@@ -0,0 +1,38 @@
+"""
+Principal cache: repeat requests skip the user lookup, and cached principals
+never carry the password hash.
+"""
+
+from app.utils.auth_cache import _serialize_user
+from app.utils.security import create_access_token, hash_password
+from tests.factories import create_user
+
+
+async def test_cached_principal_skips_the_user_lookup(client, admin_headers, max_queries):
+    response = await client.get("/api/v1/auth/me", headers=admin_headers)
+    assert response.status_code == 200
+
+    with max_queries(0):
+        response = await client.get("/api/v1/auth/me", headers=admin_headers)
+    assert response.status_code == 200
+
+
+async def test_cached_principal_has_no_password_hash(admin):
+    assert "password_hash" not in _serialize_user(admin)
+
+
+async def test_change_password_with_a_cached_principal(db, client):
+    user = await create_user(db, email="pat@example.com", password_hash=hash_password("old-password"))
+    await db.commit()
+    token = create_access_token({"sub": str(user.id), "role": user.role.value, "email": user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await client.get("/api/v1/auth/me", headers=headers)  # caches the principal
+    response = await client.post(
+        "/api/v1/auth/change-password", headers=headers,
+        json={"current_password": "old-password", "new_password": "new-password"},
+    )
+    assert response.status_code == 200
+
+    response = await client.post("/api/v1/auth/login", json={"email": "pat@example.com", "password": "new-password"})
+    assert response.status_code == 200
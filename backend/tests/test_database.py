@@ -0,0 +1,24 @@
+"""
+Session routing: without a replica, reads share the request's primary session.
+"""
+
+from sqlalchemy import event
+
+from app.database import engine
+
+
+async def test_read_route_checks_out_one_connection(client, admin_headers):
+    checkouts = []
+    pool = engine.sync_engine.pool
+
+    def on_checkout(*args):
+        checkouts.append(args)
+
+    event.listen(pool, "checkout", on_checkout)
+    try:
+        # Fresh token, so the principal is loaded from the database too
+        response = await client.get("/api/v1/students", headers=admin_headers)
+    finally:
+        event.remove(pool, "checkout", on_checkout)
+    assert response.status_code == 200
+    assert len(checkouts) == 1
@@ -0,0 +1,39 @@
+"""
+Query budgets for hot endpoints: the statement count must not grow with the
+number of rows returned.
+"""
+
+from tests.factories import create_section, create_student
+
+
+async def test_student_list_query_count_is_independent_of_page_size(db, client, admin_headers, max_queries):
+    section = await create_section(db)
+    for _ in range(25):
+        await create_student(db, section=section)
+    await db.commit()
+
+    # auth lookup + count + page
+    with max_queries(3):
+        response = await client.get("/api/v1/students", params={"per_page": 5}, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 5
+
+    with max_queries(3):
+        response = await client.get("/api/v1/students", params={"per_page": 25}, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 25
+
+
+async def test_dashboard_analytics(db, client, admin_headers, max_queries):
+    section = await create_section(db)
+    for _ in range(3):
+        await create_student(db, section=section)
+    await db.commit()
+
+    # auth lookup + three aggregate queries
+    with max_queries(4):
+        response = await client.get("/api/v1/reports/analytics", headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["students"]["total"] == 3
+    assert data["classes"] == {"total": 1, "sections": 1}
@@ -0,0 +1,183 @@
+"""
+EXPLAIN checks for the hot query shapes behind the composite and trigram
+indexes (migration e7b5a0c3f912 and the search indexes): each must be served
+by its index rather than a sequential scan. Sequential scans are disabled for
+the check, since the seeded tables are small enough that the planner would
+otherwise prefer them.
+"""
+
+import json
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Set
+
+import pytest
+from sqlalchemy import and_, insert, select, text
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.communication import Message
+from app.models.finance import FeeStructure, Invoice, InvoiceStatus
+from app.models.gradebook import Grade
+from app.models.student import Student, StudentStatus
+from app.models.user import User
+from app.services.attendance_rollups import _section_day_select, status_counts
+from app.services.search import _people_query, full_name_expr, name_search_condition
+from tests.factories import (
+    create_academic_year,
+    create_assignment,
+    create_section,
+    create_student,
+    create_subject_teacher,
+    create_term,
+    create_user,
+)
+
+DAYS = [date(2025, 9, 1) + timedelta(days=i) for i in range(20)]
+
+
+def _index_names(plan: Dict[str, Any]) -> Set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+async def _indexes_used(db, stmt, bitmap_only: bool = False) -> Set[str]:
+    """Index names in the plan; `bitmap_only` also rules out full scans of an unrelated btree."""
+    sql = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    if bitmap_only:
+        await db.execute(text("SET LOCAL enable_indexscan = off"))
+    raw = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return _index_names(plan[0]["Plan"])
+
+
+@pytest.fixture
+async def seeded(db) -> Dict[str, Any]:
+    rng = random.Random(42)
+    year = await create_academic_year(db)
+    term = await create_term(db, year)
+    sections = [await create_section(db, academic_year=year, name=name) for name in "ABCD"]
+    students: List[Student] = []
+    for section in sections:
+        for _ in range(20):
+            students.append(await create_student(db, section=section))
+    staff = await create_user(db, first_name="Priya", last_name="Raman")
+    subject_teacher = await create_subject_teacher(db, sections[0])
+    assignments = [await create_assignment(db, term, subject_teacher) for _ in range(5)]
+
+    await db.execute(insert(Attendance), [
+        {
+            "id": uuid.uuid4(), "student_id": s.id, "section_id": s.current_section_id, "date": day,
+            "status": rng.choice(list(AttendanceStatus)), "marked_by": staff.id,
+        }
+        for s in students for day in DAYS
+    ])
+    await db.execute(insert(Grade), [
+        {"id": uuid.uuid4(), "assignment_id": a.id, "student_id": s.id, "score": rng.randint(40, 100), "graded_by": staff.id}
+        for s in students for a in assignments
+    ])
+    await db.execute(insert(Message), [
+        {
+            "id": uuid.uuid4(), "sender_id": staff.id, "receiver_id": rng.choice(students).user_id,
+            "subject": "Reminder", "body": "Bring your lab notebook.",
+            "created_at": datetime(2025, 9, 1) + timedelta(minutes=i),
+        }
+        for i in range(500)
+    ])
+    fee = FeeStructure(name="Tuition Fee", amount=1000, academic_year_id=year.id, fee_type="tuition")
+    db.add(fee)
+    await db.flush()
+    await db.execute(insert(Invoice), [
+        {
+            "id": uuid.uuid4(), "invoice_number": f"INV-{i:05d}", "student_id": s.id, "fee_structure_id": fee.id,
+            "amount": 1000, "due_date": date(2025, 10, 1), "status": rng.choice(list(InvoiceStatus)),
+            "created_at": datetime(2025, 9, 1) + timedelta(minutes=i),
+        }
+        for i, s in enumerate(students)
+    ])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+    return {"sections": sections, "students": students, "staff": staff}
+
+
+async def test_section_attendance_for_a_day(db, seeded):
+    section = seeded["sections"][0]
+    stmt = (
+        select(Attendance, Student.admission_no)
+        .join(Student, Attendance.student_id == Student.id)
+        .where(and_(Attendance.section_id == section.id, Attendance.date == DAYS[3]))
+    )
+    assert "ix_attendance_section_id_date" in await _indexes_used(db, stmt)
+
+
+async def test_section_day_rollup(db, seeded):
+    section = seeded["sections"][1]
+    stmt = _section_day_select().where(Attendance.section_id == section.id, Attendance.date == DAYS[5])
+    assert "ix_attendance_section_id_date" in await _indexes_used(db, stmt)
+
+
+async def test_student_attendance_counts_over_a_range(db, seeded):
+    student_ids = [s.id for s in seeded["students"][:10]]
+    stmt = (
+        select(Attendance.student_id, *status_counts())
+        .where(Attendance.student_id.in_(student_ids), Attendance.date >= DAYS[0], Attendance.date <= DAYS[9])
+        .group_by(Attendance.student_id)
+    )
+    assert "ix_attendance_student_id_date_status" in await _indexes_used(db, stmt)
+
+
+async def test_grades_for_a_student(db, seeded):
+    stmt = select(Grade).where(Grade.student_id == seeded["students"][0].id)
+    assert "ix_grades_student_id_assignment_id" in await _indexes_used(db, stmt)
+
+
+async def test_inbox(db, seeded):
+    stmt = (
+        select(Message, User.first_name, User.last_name)
+        .join(User, Message.sender_id == User.id)
+        .where(Message.receiver_id == seeded["students"][0].user_id)
+        .order_by(Message.created_at.desc())
+    )
+    assert "ix_messages_receiver_id_created_at" in await _indexes_used(db, stmt)
+
+
+async def test_invoices_by_status(db, seeded):
+    stmt = (
+        select(Invoice)
+        .where(Invoice.status == InvoiceStatus.PENDING)
+        .order_by(Invoice.created_at.desc())
+        .limit(20)
+    )
+    assert "ix_invoices_status_created_at" in await _indexes_used(db, stmt)
+
+
+async def test_students_in_a_section_by_status(db, seeded):
+    stmt = select(Student).where(
+        Student.current_section_id == seeded["sections"][2].id, Student.status == StudentStatus.ACTIVE,
+    )
+    assert "ix_students_current_section_id_status" in await _indexes_used(db, stmt)
+
+
+async def test_name_search(db, seeded):
+    stmt = select(User.id).where(name_search_condition("raman"))
+    assert "ix_users_full_name_trgm" in await _indexes_used(db, stmt)
+
+
+async def test_name_similarity_search(db, seeded):
+    name = full_name_expr()
+    stmt = select(User.id).where(name.self_group().op("%")("Priya Ramen"))
+    assert "ix_users_full_name_trgm" in await _indexes_used(db, stmt)
+
+
+async def test_admission_no_search(db, seeded):
+    stmt = select(Student.id).where(Student.admission_no.ilike("%ADM-1%"))
+    assert "ix_students_admission_no_trgm" in await _indexes_used(db, stmt)
+
+
+async def test_people_search_uses_both_sides_indexes(db, seeded):
+    stmt = _people_query("student", Student, Student.admission_no, "ADM-0042")
+    used = await _indexes_used(db, stmt, bitmap_only=True)
+    assert {"ix_users_full_name_trgm", "ix_users_email_trgm", "ix_students_admission_no_trgm"} <= used
@@ -0,0 +1,72 @@
+"""
+Report cards are computed set-wise from the grade aggregates: the query
+count must not depend on how many assignments the term has.
+"""
+
+import uuid
+
+from sqlalchemy import insert
+
+from app.models.gradebook import Grade
+from app.services.grade_aggregates import rebuild_grade_aggregates
+from app.services.report_card import build_report_card
+from app.utils.profiling import track_queries
+from tests.factories import (
+    create_academic_year,
+    create_assignment,
+    create_section,
+    create_student,
+    create_subject_teacher,
+    create_term,
+)
+
+
+async def _grade_assignments(db, term, subject_teachers, student, count, score):
+    for subject_teacher in subject_teachers:
+        assignments = [await create_assignment(db, term, subject_teacher) for _ in range(count)]
+        await db.execute(insert(Grade), [
+            {"id": uuid.uuid4(), "assignment_id": a.id, "student_id": student.id, "score": score, "graded_by": student.user_id}
+            for a in assignments
+        ])
+    await rebuild_grade_aggregates(db, term.id)
+    await db.commit()
+
+
+async def test_report_card_query_count_is_constant_as_assignments_grow(db):
+    year = await create_academic_year(db)
+    term = await create_term(db, year)
+    section = await create_section(db, academic_year=year)
+    student = await create_student(db, section=section, first_name="Priya", last_name="Raman")
+    subject_teachers = [
+        await create_subject_teacher(db, section, name=name) for name in ("Mathematics", "Physics", "History")
+    ]
+
+    counts = []
+    for assignments_per_subject, score in ((1, 80), (10, 80), (40, 80)):
+        await _grade_assignments(db, term, subject_teachers, student, assignments_per_subject, score)
+        with track_queries() as stats:
+            card = await build_report_card(db, student.id, term.id)
+        counts.append(stats.count)
+
+        assert card["student_name"] == "Priya Raman"
+        assert [s["subject_name"] for s in card["subjects"]] == ["History", "Mathematics", "Physics"]
+        assert card["overall_average"] == 80
+
+    assert counts[0] == counts[1] == counts[2] == 3
+
+
+async def test_report_card_endpoint(db, client, admin_headers, max_queries):
+    year = await create_academic_year(db)
+    term = await create_term(db, year)
+    section = await create_section(db, academic_year=year)
+    student = await create_student(db, section=section)
+    subject_teachers = [await create_subject_teacher(db, section, name=name) for name in ("Mathematics", "Physics")]
+    await _grade_assignments(db, term, subject_teachers, student, 25, 90)
+
+    # auth lookup + student + term + subject totals
+    with max_queries(4):
+        response = await client.get(
+            f"/api/v1/gradebook/report-card/{student.id}", params={"term_id": str(term.id)}, headers=admin_headers,
+        )
+    assert response.status_code == 200
+    assert [s["letter_grade"] for s in response.json()["subjects"]] == ["A-", "A-"]
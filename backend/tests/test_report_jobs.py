@@ -0,0 +1,70 @@
+"""
+Report jobs: the format defaults by kind, and jobs whose worker disappears
+are requeued rather than lost or left "running".
+"""
+
+import time
+
+import pytest
+
+from app.models.user import User, UserRole
+from app.schemas.report import ReportJobCreate
+from app.services import report_jobs
+from app.services.report_jobs import MemoryJobBackend, validate_job_request
+
+
+@pytest.mark.parametrize("kind, expected", [
+    ("grades", "excel"),
+    ("attendance", "pdf"),
+    ("report_card", "pdf"),
+    ("student_list", "pdf"),
+])
+def test_format_defaults_by_kind(kind, expected):
+    assert ReportJobCreate(kind=kind).format == expected
+
+
+def test_grades_job_without_format_is_valid():
+    request = ReportJobCreate(kind="grades", section_id="6f1c1e1a-3c52-4a40-9a0c-0f0b2f5b2d11",
+                              term_id="0b7c1a7e-52a4-4f0e-8f37-5b1a9f3d6c20")
+    validate_job_request(request, User(role=UserRole.TEACHER))
+    assert ReportJobCreate(kind="attendance", format="excel").format == "excel"
+
+
+async def test_expired_lease_requeues_job(monkeypatch):
+    monkeypatch.setattr(report_jobs.settings, "REPORT_JOB_LEASE_SECONDS", 0)
+    backend = MemoryJobBackend()
+    await backend.push("job-1")
+
+    assert await backend.pop(timeout=1) == "job-1"
+    assert await backend.pop(timeout=0.01) is None
+    # The claiming worker never renewed or acknowledged it
+    assert await backend.requeue_expired() == ["job-1"]
+    assert await backend.pop(timeout=1) == "job-1"
+
+    await backend.ack("job-1")
+    assert await backend.requeue_expired() == []
+
+
+async def test_renewed_lease_is_not_requeued():
+    backend = MemoryJobBackend()
+    await backend.push("job-1")
+    assert await backend.pop(timeout=1) == "job-1"
+    await backend.extend("job-1")
+    assert await backend.requeue_expired() == []
+
+
+async def test_repeatedly_interrupted_job_fails(monkeypatch):
+    backend = MemoryJobBackend()
+    monkeypatch.setattr(report_jobs, "_backend", backend)
+    job = {"id": "job-1", "kind": "student_list", "params": {"kind": "student_list"}, "status": "running",
+           "attempts": report_jobs.settings.REPORT_JOB_MAX_ATTEMPTS, "created_ts": time.time()}
+    await backend.save(job)
+    await backend.push("job-1")
+    await backend.pop(timeout=1)
+
+    await report_jobs._run_job("job-1")
+
+    job = await backend.load("job-1")
+    assert job["status"] == "failed"
+    assert "interrupted" in job["error"]
+    assert await backend.requeue_expired() == []
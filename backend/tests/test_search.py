@@ -0,0 +1,42 @@
+"""
+People search against Postgres, including the pg_trgm similarity operator.
+"""
+
+from app.services.search import search_people
+from tests.factories import create_guardian, create_student, create_teacher
+
+
+async def _seed(db):
+    await create_student(db, first_name="Priya", last_name="Raman", admission_no="ADM-2025-0142")
+    await create_teacher(db, first_name="Jonathan", last_name="Miles", employee_id="EMP-7781")
+    await create_guardian(db, first_name="Meera", last_name="Raman", email="meera.raman@example.com")
+    await create_student(db, first_name="Arjun", last_name="Kapoor")
+    await db.commit()
+
+
+async def test_search_matches_names_codes_and_typos(db):
+    await _seed(db)
+
+    names = {row["name"] for row in await search_people(db, "Raman")}
+    assert names == {"Priya Raman", "Meera Raman"}
+
+    [hit] = await search_people(db, "2025-0142")
+    assert (hit["kind"], hit["code"]) == ("student", "ADM-2025-0142")
+
+    # Misspelt, so only the trigram similarity operator can match it
+    [hit] = await search_people(db, "Jonathon Miles")
+    assert (hit["kind"], hit["name"]) == ("teacher", "Jonathan Miles")
+
+
+async def test_search_kinds_filter(db):
+    await _seed(db)
+    rows = await search_people(db, "Raman", kinds=["guardian"])
+    assert [(row["kind"], row["email"]) for row in rows] == [("guardian", "meera.raman@example.com")]
+
+
+async def test_search_endpoint(db, client, admin_headers, max_queries):
+    await _seed(db)
+    with max_queries(2):
+        response = await client.get("/api/v1/search", params={"q": "Raman"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert {row["kind"] for row in response.json()} == {"student", "guardian"}